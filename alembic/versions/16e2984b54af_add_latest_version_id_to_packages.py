@@ -0,0 +1,54 @@
+"""add latest_version_id to packages
+
+Revision ID: 16e2984b54af
+Revises: c67beb3a26f1
+Create Date: 2026-10-17 11:26:40.581920
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '16e2984b54af'
+down_revision: Union[str, Sequence[str], None] = 'c67beb3a26f1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_bind().dialect.name == 'sqlite':
+        # A plain ADD COLUMN ... REFERENCES (no batch table rebuild) keeps the
+        # packages_fts triggers attached to the packages table.
+        op.execute(
+            "ALTER TABLE packages ADD COLUMN latest_version_id INTEGER "
+            "REFERENCES package_versions (id)"
+        )
+    else:
+        op.add_column('packages', sa.Column('latest_version_id', sa.Integer(), nullable=True))
+        op.create_foreign_key(
+            'fk_packages_latest_version_id', 'packages', 'package_versions',
+            ['latest_version_id'], ['id'],
+        )
+
+    # Backfill with the version get_package used to pick at query time
+    op.execute("""
+        UPDATE packages
+        SET latest_version_id = (
+            SELECT pv.id FROM package_versions pv
+            WHERE pv.package_id = packages.id
+            ORDER BY pv.published_at DESC, pv.id ASC
+            LIMIT 1
+        )
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    # SQLite >= 3.35 drops the column in place, which keeps the FTS triggers
+    if op.get_bind().dialect.name != 'sqlite':
+        op.drop_constraint('fk_packages_latest_version_id', 'packages', type_='foreignkey')
+    op.drop_column('packages', 'latest_version_id')
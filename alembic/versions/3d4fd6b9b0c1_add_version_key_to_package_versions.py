@@ -0,0 +1,79 @@
+"""add version_key to package_versions
+
+Revision ID: 3d4fd6b9b0c1
+Revises: 3dd63cc77fde
+Create Date: 2026-10-17 01:43:34.121915
+
+"""
+from typing import Sequence, Union
+
+import re
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3d4fd6b9b0c1'
+down_revision: Union[str, Sequence[str], None] = '3dd63cc77fde'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Frozen copy of app/core/versions.py as of this revision, so the backfill
+# keeps producing the same keys even if the application code changes later.
+SEMVER_TAG_PATTERN = re.compile(r'^v?(\d+)\.(\d+)(?:\.(\d+))?(-[a-zA-Z0-9.-]+)?$')
+
+
+def _version_key(tag_name):
+    match = SEMVER_TAG_PATTERN.match(tag_name or "")
+    if match is None:
+        return None
+    major, minor, patch, prerelease = match.groups()
+    numbers = ".".join(str(int(part or 0)).zfill(8) for part in (major, minor, patch))
+    return numbers + (prerelease or "~")
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'package_versions',
+        sa.Column('version_key', sa.String(), server_default='', nullable=False),
+    )
+    op.create_index(
+        'ix_package_versions_package_id_version_key', 'package_versions',
+        ['package_id', 'version_key', 'release', 'id'], unique=False,
+    )
+
+    # Backfill the key of every existing version
+    bind = op.get_bind()
+    rows = bind.execute(sa.text("SELECT id, git_tag, version FROM package_versions")).all()
+    updates = [
+        {"id": row.id, "key": _version_key(row.git_tag) or _version_key(row.version) or ""}
+        for row in rows
+    ]
+    if updates:
+        bind.execute(
+            sa.text("UPDATE package_versions SET version_key = :key WHERE id = :id"),
+            updates,
+        )
+
+    # 'latest' is now the highest version, not the most recently published one
+    op.execute("""
+        UPDATE packages
+        SET latest_version_id = (
+            SELECT pv.id FROM package_versions pv
+            WHERE pv.package_id = packages.id
+            ORDER BY pv.version_key DESC, pv.release DESC, pv.id DESC
+            LIMIT 1
+        )
+    """)
+    # The pointer may have moved: give every package a new revision so
+    # cached ETags and index consumers see the change
+    op.execute("UPDATE packages SET revision = revision + (SELECT coalesce(max(revision), 0) FROM packages)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_package_versions_package_id_version_key', table_name='package_versions')
+    op.drop_column('package_versions', 'version_key')
@@ -0,0 +1,34 @@
+"""add revision to packages
+
+Revision ID: 3dd63cc77fde
+Revises: 16e2984b54af
+Create Date: 2026-10-17 12:08:19.663052
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3dd63cc77fde'
+down_revision: Union[str, Sequence[str], None] = '16e2984b54af'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Plain ADD COLUMN (no batch rebuild) keeps the packages_fts triggers
+    op.add_column('packages', sa.Column('revision', sa.Integer(), server_default='0', nullable=False))
+    op.create_index(op.f('ix_packages_revision'), 'packages', ['revision'], unique=False)
+
+    # Existing packages get distinct revisions in creation order
+    op.execute("UPDATE packages SET revision = id")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_packages_revision'), table_name='packages')
+    op.drop_column('packages', 'revision')
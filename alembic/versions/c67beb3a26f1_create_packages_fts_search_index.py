@@ -0,0 +1,93 @@
+"""create packages_fts search index
+
+Revision ID: c67beb3a26f1
+Revises: f532700bdaa5
+Create Date: 2026-10-17 10:41:55.270311
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c67beb3a26f1'
+down_revision: Union[str, Sequence[str], None] = 'f532700bdaa5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Space separated, de-duplicated names declared in the dur.json files of a package
+METADATA_NAMES_SQL = """
+    (SELECT coalesce(group_concat(meta_name, ' '), '') FROM (
+        SELECT DISTINCT json_extract(pv.package_metadata, '$.name') AS meta_name
+        FROM package_versions pv
+        WHERE pv.package_id = {package_id} AND meta_name IS NOT NULL
+    ))
+"""
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # One FTS row per package, rowid = packages.id. The prefix indexes make
+    # 'term*' queries cheap.
+    op.execute("""
+        CREATE VIRTUAL TABLE packages_fts USING fts5(
+            name, description, metadata,
+            tokenize = 'unicode61 remove_diacritics 2',
+            prefix = '2 3'
+        )
+    """)
+
+    op.execute("""
+        CREATE TRIGGER packages_fts_after_insert AFTER INSERT ON packages BEGIN
+            INSERT INTO packages_fts (rowid, name, description, metadata)
+            VALUES (new.id, new.name, coalesce(new.description, ''), '');
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER packages_fts_after_update AFTER UPDATE OF name, description ON packages BEGIN
+            UPDATE packages_fts
+            SET name = new.name, description = coalesce(new.description, '')
+            WHERE rowid = new.id;
+        END
+    """)
+    op.execute("""
+        CREATE TRIGGER packages_fts_after_delete AFTER DELETE ON packages BEGIN
+            DELETE FROM packages_fts WHERE rowid = old.id;
+        END
+    """)
+    # Appending only unseen names keeps bulk version imports linear
+    op.execute("""
+        CREATE TRIGGER package_versions_fts_after_insert AFTER INSERT ON package_versions
+        WHEN json_extract(new.package_metadata, '$.name') IS NOT NULL BEGIN
+            UPDATE packages_fts
+            SET metadata = trim(metadata || ' ' || json_extract(new.package_metadata, '$.name'))
+            WHERE rowid = new.package_id
+              AND instr(' ' || metadata || ' ', ' ' || json_extract(new.package_metadata, '$.name') || ' ') = 0;
+        END
+    """)
+    op.execute(f"""
+        CREATE TRIGGER package_versions_fts_after_delete AFTER DELETE ON package_versions BEGIN
+            UPDATE packages_fts
+            SET metadata = {METADATA_NAMES_SQL.format(package_id='old.package_id')}
+            WHERE rowid = old.package_id;
+        END
+    """)
+
+    # Backfill existing packages
+    op.execute(f"""
+        INSERT INTO packages_fts (rowid, name, description, metadata)
+        SELECT p.id, p.name, coalesce(p.description, ''), {METADATA_NAMES_SQL.format(package_id='p.id')}
+        FROM packages p
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS package_versions_fts_after_delete")
+    op.execute("DROP TRIGGER IF EXISTS package_versions_fts_after_insert")
+    op.execute("DROP TRIGGER IF EXISTS packages_fts_after_delete")
+    op.execute("DROP TRIGGER IF EXISTS packages_fts_after_update")
+    op.execute("DROP TRIGGER IF EXISTS packages_fts_after_insert")
+    op.execute("DROP TABLE IF EXISTS packages_fts")
@@ -0,0 +1,30 @@
+"""add packages created_at, id index
+
+Revision ID: f532700bdaa5
+Revises: e5496a65c739
+Create Date: 2026-10-17 10:03:12.118734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f532700bdaa5'
+down_revision: Union[str, Sequence[str], None] = 'e5496a65c739'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    with op.batch_alter_table('packages', schema=None) as batch_op:
+        batch_op.create_index('ix_packages_created_at_id', ['created_at', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    with op.batch_alter_table('packages', schema=None) as batch_op:
+        batch_op.drop_index('ix_packages_created_at_id')
@@ -0,0 +1,101 @@
+# app/auth/hashing.py
+
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional, Tuple
+
+from fastapi.concurrency import run_in_threadpool
+
+from app.auth import security as auth_security
+from app.core.config import settings
+
+
+class HashingOverloadedException(Exception):
+    """Raised when too many password hashes are already queued."""
+    pass
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt in a dedicated, size-limited process pool.
+
+    bcrypt is CPU-bound and holds the GIL for most of its ~250 ms, so running
+    it on the default threadpool lets a login burst stall every other
+    endpoint. Worker processes sidestep the GIL, and a cap on in-flight calls
+    rejects excess work instead of queueing it without bound. Until start()
+    is called (scripts, the standalone import worker) calls fall back to the
+    threadpool.
+    """
+
+    def __init__(
+        self,
+        workers: int = settings.PASSWORD_HASH_WORKERS,
+        max_pending: int = settings.PASSWORD_HASH_MAX_PENDING,
+    ):
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+
+    def start(self) -> None:
+        # 'spawn' keeps the children free of the parent's event loop and threads
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def stop(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+            self._executor = None
+
+    async def hash(self, password: str) -> str:
+        """Hashes a plain password."""
+        return await self._run(auth_security.get_password_hash, password)
+
+    async def verify(self, plain_password: str, hashed_password: str) -> bool:
+        """Verifies a plain password against a stored hash."""
+        return await self._run(auth_security.verify_password, plain_password, hashed_password)
+
+    async def verify_and_update(
+        self, plain_password: str, hashed_password: str
+    ) -> Tuple[bool, Optional[str]]:
+        """
+        Verifies a password and, if the stored hash uses an outdated cost
+        factor, returns a fresh hash to store in its place.
+        """
+        return await self._run(
+            auth_security.verify_and_update_password, plain_password, hashed_password
+        )
+
+    async def _run(self, func: Callable, *args):
+        # Back-pressure: fail fast rather than let the backlog grow
+        if self.in_flight >= self.max_pending:
+            self.rejected += 1
+            raise HashingOverloadedException()
+
+        self.in_flight += 1
+        try:
+            if self._executor is None:
+                return await run_in_threadpool(func, *args)
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, func, *args)
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.workers if self._executor is not None else 0,
+            "in_flight": self.in_flight,
+            "queue_depth": max(0, self.in_flight - self.workers),
+            "max_pending": self.max_pending,
+            "completed": self.completed,
+            "rejected": self.rejected,
+        }
+
+
+password_hasher = PasswordHasher()
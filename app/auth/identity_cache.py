@@ -0,0 +1,63 @@
+# app/auth/identity_cache.py
+
+import time
+from typing import Optional
+
+from app.auth import security as auth_security
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.schemas.user import UserPublic
+
+# --- Verified Tokens ---
+# token string -> username, only for tokens whose signature and expiry checked
+# out. Entries never outlive the token's own 'exp' claim.
+verified_tokens: Optional[TTLCache] = (
+    TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+    if settings.AUTH_CACHE_ENABLED else None
+)
+
+# --- User Identities ---
+# username -> UserPublic (no password hash), skipping the users table lookup.
+user_identities: Optional[TTLCache] = (
+    TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS)
+    if settings.AUTH_CACHE_ENABLED else None
+)
+
+
+def verify_token_cached(token: str) -> str | None:
+    """Returns the token's username, verifying the JWT only on a cache miss."""
+    if verified_tokens is not None:
+        username = verified_tokens.get(token)
+        if username is not None:
+            return username
+
+    payload = auth_security.decode_token_payload(token)
+    if payload is None:
+        return None
+    username: str | None = payload.get("sub")
+    if username is None:
+        return None
+
+    if verified_tokens is not None:
+        expires_at = payload.get("exp")
+        ttl = expires_at - time.time() if isinstance(expires_at, (int, float)) else None
+        if ttl is None or ttl > 0:
+            verified_tokens.set(token, username, ttl_seconds=ttl)
+    return username
+
+
+def get_cached_identity(username: str) -> UserPublic | None:
+    if user_identities is None:
+        return None
+    return user_identities.get(username)
+
+
+def cache_identity(user: UserPublic) -> None:
+    if user_identities is not None:
+        user_identities.set(user.username, user)
+
+
+def invalidate_user(username: str) -> None:
+    """Forgets a user's cached identity; called by every user update or deletion in app/crud/user.py."""
+    if user_identities is not None:
+        user_identities.invalidate(username)
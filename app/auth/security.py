@@ -9,7 +9,9 @@ from app.core.config import settings
 # --- Password Hashing ---
 
 # 1. Create a PasswordContext instance for bcrypt algorithm
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+pwd_context = CryptContext(
+    schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS
+)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     """Verifies a plain password against a stored hash."""
@@ -19,6 +21,13 @@ def get_password_hash(password: str) -> str:
     """Hashes a plain password."""
     return pwd_context.hash(password)
 
+def verify_and_update_password(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verifies a plain password and returns a new hash if the stored one
+    was made with an outdated cost factor (otherwise None).
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
+
 
 # --- JSON Web Token (JWT) Management ---
 
@@ -46,22 +55,33 @@ def create_refresh_token(data: dict) -> str:
     encoded_jwt = jwt.encode(to_encode, settings.SECRET_KEY, algorithm=settings.ALGORITHM)
     return encoded_jwt
 
-def decode_token(token: str) -> str | None:
+def decode_token_payload(token: str) -> dict | None:
     """
-    Decodes a JWT token and extracts the username.
+    Verifies a JWT token's signature and expiry and returns its claims.
 
     :param token: The JWT token string to decode.
-    :return: The username (subject) if decoding is successful, otherwise None.
+    :return: The decoded payload if the token is valid, otherwise None.
     """
     try:
-        # 1. Decode the token using the secret key and algorithm
-        payload = jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
-        
-        # 2. Extract the username from the 'sub' (subject) claim
-        username: str | None = payload.get("sub")
-        if username is None:
-            return None # Subject claim missing
-        return username
+        return jwt.decode(token, settings.SECRET_KEY, algorithms=[settings.ALGORITHM])
     except JWTError:
         # Token is invalid (e.g., signature verification failed, expired token)
-        return None
\ No newline at end of file
+        return None
+
+def decode_token(token: str) -> str | None:
+    """
+    Decodes a JWT token and extracts the username.
+
+    :param token: The JWT token string to decode.
+    :return: The username (subject) if decoding is successful, otherwise None.
+    """
+    # 1. Decode the token using the secret key and algorithm
+    payload = decode_token_payload(token)
+    if payload is None:
+        return None
+
+    # 2. Extract the username from the 'sub' (subject) claim
+    username: str | None = payload.get("sub")
+    if username is None:
+        return None # Subject claim missing
+    return username
\ No newline at end of file
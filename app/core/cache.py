@@ -0,0 +1,121 @@
+# app/core/cache.py
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Iterable, Optional, Set
+
+from starlette.requests import Request
+
+from app.core.config import settings
+
+
+class TTLCache:
+    """
+    A bounded LRU cache whose entries also expire after `ttl_seconds`.
+
+    Entries can carry tags so that every entry derived from the same data
+    (e.g. one package) can be invalidated at once.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max(1, max_entries)
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[Hashable, tuple[float, Any, tuple]]" = OrderedDict()
+        self._tags: Dict[str, Set[Hashable]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value, _ = entry
+            if expires_at < time.monotonic():
+                self._remove(key)
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(
+        self, key: Hashable, value: Any, tags: Iterable[str] = (), ttl_seconds: Optional[float] = None
+    ) -> None:
+        """Stores `value`; `ttl_seconds` can only shorten the cache-wide TTL."""
+        tags = tuple(tags)
+        ttl = self.ttl_seconds if ttl_seconds is None else min(ttl_seconds, self.ttl_seconds)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + ttl, value, tags)
+            for tag in tags:
+                self._tags.setdefault(tag, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+
+    def invalidate_tag(self, tag: str) -> None:
+        with self._lock:
+            for key in list(self._tags.get(tag, ())):
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._tags.clear()
+
+    def _remove(self, key: Hashable) -> None:
+        _, _, tags = self._entries.pop(key)
+        for tag in tags:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+    def stats(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "size": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# --- Response Cache ---
+# Pre-serialised JSON bodies of the package read endpoints. In-process only:
+# with import workers in a separate process, entries expire via the TTL.
+
+PACKAGE_LIST_TAG = "package-list"
+
+def package_tag(package_name: str) -> str:
+    return f"package:{package_name}"
+
+response_cache: Optional[TTLCache] = (
+    TTLCache(settings.RESPONSE_CACHE_MAX_ENTRIES, settings.RESPONSE_CACHE_TTL_SECONDS)
+    if settings.RESPONSE_CACHE_ENABLED else None
+)
+
+def request_cache_key(request: Request) -> tuple:
+    """Cache key for a GET request: its path plus the query params in a stable order."""
+    return (request.url.path, tuple(sorted(request.query_params.multi_items())))
+
+def invalidate_package(package_name: str) -> None:
+    """Drops every cached response that may include `package_name`."""
+    if response_cache is None:
+        return
+    response_cache.invalidate_tag(PACKAGE_LIST_TAG)
+    response_cache.invalidate_tag(package_tag(package_name))
@@ -0,0 +1,301 @@
+# app/core/compression.py
+"""
+Content-negotiated response compression.
+
+The coding is picked from the request's Accept-Encoding. zstd and brotli
+are used when the `zstandard` / `brotli` packages are installed; gzip
+always is.
+
+- Only textual media types (JSON, NDJSON, text/*) are compressed, and only
+  when they are at least COMPRESSION_MIN_SIZE bytes. Responses that already
+  carry a Content-Encoding (e.g. the .gz snapshot) pass through untouched.
+- A streamed response is compressed chunk by chunk. Output is flushed every
+  COMPRESSION_STREAM_FLUSH_BYTES of input, so clients see progress without
+  the stream being split into tiny deflate blocks.
+- A compressed response gets a weak ETag (W/"..."), since its bytes differ
+  from the identity representation. A 304 keeps the route's ETag as is: the
+  middleware cannot tell whether the 200 it stands for was encoded, and
+  If-None-Match compares weakly, so either form still matches.
+- Every response whose body could have been encoded, and every 304, carries
+  Vary: Accept-Encoding, so shared caches keep the codings apart.
+- Compressed bodies of responses with a strong ETag are kept in
+  `compressed_cache`, keyed by path, query, ETag and coding. A repeated
+  response (e.g. a response-cache hit) is then not compressed again.
+"""
+import zlib
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+# Media types worth compressing; anything else (images, archives) is sent as is
+COMPRESSIBLE_MEDIA_TYPES = ("application/json", "application/x-ndjson", "application/javascript", "text/")
+
+
+class _Encoder(ABC):
+    """Incremental compressor with the same three calls for every coding."""
+
+    @abstractmethod
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    @abstractmethod
+    def flush(self) -> bytes:
+        """Emits everything buffered so far, keeping the stream open."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def finish(self) -> bytes:
+        raise NotImplementedError
+
+
+class _GzipEncoder(_Encoder):
+    def __init__(self):
+        # wbits 16 + MAX_WBITS writes a gzip header and trailer
+        self._compressor = zlib.compressobj(settings.COMPRESSION_GZIP_LEVEL, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliEncoder(_Encoder):
+    def __init__(self):
+        self._compressor = brotli.Compressor(quality=settings.COMPRESSION_BROTLI_QUALITY)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.process(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+class _ZstdEncoder(_Encoder):
+    def __init__(self):
+        self._compressor = zstandard.ZstdCompressor(level=settings.COMPRESSION_ZSTD_LEVEL).compressobj()
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def flush(self) -> bytes:
+        return self._compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+# Available codings, most preferred first when the client rates them equally
+ENCODERS: Dict[str, Callable[[], _Encoder]] = {}
+if zstandard is not None:
+    ENCODERS["zstd"] = _ZstdEncoder
+if brotli is not None:
+    ENCODERS["br"] = _BrotliEncoder
+ENCODERS["gzip"] = _GzipEncoder
+
+
+def negotiate_encoding(accept_encoding: Optional[str]) -> Optional[str]:
+    """
+    The best available coding allowed by an Accept-Encoding header, or None
+    for identity. Honours q-values, including q=0 exclusions and '*'.
+    """
+    if not accept_encoding:
+        return None
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        weight = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                weight = float(params[2:])
+            except ValueError:
+                weight = 0.0
+        weights[coding] = weight
+
+    best, best_weight = None, 0.0
+    for coding in ENCODERS:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+def compress(coding: str, body: bytes) -> bytes:
+    encoder = ENCODERS[coding]()
+    return encoder.compress(body) + encoder.finish()
+
+
+def _weak(etag: str) -> str:
+    return etag if etag.startswith("W/") else "W/" + etag
+
+
+def _add_vary(headers: MutableHeaders) -> None:
+    vary = headers.get("vary", "")
+    if "accept-encoding" not in vary.lower():
+        headers["Vary"] = f"{vary}, Accept-Encoding" if vary else "Accept-Encoding"
+
+
+class CompressionStats:
+    def __init__(self):
+        self.compressed = 0
+        self.streamed = 0
+        self.bytes_in = 0
+        self.bytes_out = 0
+
+    def record(self, bytes_in: int, bytes_out: int) -> None:
+        self.bytes_in += bytes_in
+        self.bytes_out += bytes_out
+
+    def stats(self) -> dict:
+        return {
+            "encodings": list(ENCODERS),
+            "compressed": self.compressed,
+            "streamed": self.streamed,
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": round(self.bytes_out / self.bytes_in, 3) if self.bytes_in else None,
+        }
+
+
+compression_stats = CompressionStats()
+
+compressed_cache: Optional[TTLCache] = (
+    TTLCache(settings.COMPRESSION_CACHE_MAX_ENTRIES, settings.COMPRESSION_CACHE_TTL_SECONDS)
+    if settings.COMPRESSION_CACHE_ENABLED else None
+)
+
+
+class CompressionMiddleware:
+    """Pure ASGI middleware, so streamed bodies are compressed as they are produced."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http" or scope["method"] == "HEAD":
+            await self.app(scope, receive, send)
+            return
+        coding = negotiate_encoding(Headers(scope=scope).get("accept-encoding"))
+        await _CompressionResponder(scope, coding, send).run(self.app, receive)
+
+
+class _CompressionResponder:
+    def __init__(self, scope: Scope, coding: Optional[str], send: Send):
+        self.scope = scope
+        self.coding = coding
+        self.send = send
+        self.start: Optional[Message] = None
+        # None until the first body message decides; then passthrough or compress
+        self.encoder: Optional[_Encoder] = None
+        self.passthrough = False
+        self.pending = 0
+
+    async def run(self, app: ASGIApp, receive: Receive) -> None:
+        await app(self.scope, receive, self.send_wrapper)
+
+    async def send_wrapper(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            await self._on_start(message)
+        elif message["type"] == "http.response.body" and not self.passthrough:
+            await self._on_body(message)
+        else:
+            await self.send(message)
+
+    async def _on_start(self, message: Message) -> None:
+        headers = MutableHeaders(scope=message)
+        compressible = headers.get("content-type", "").startswith(COMPRESSIBLE_MEDIA_TYPES)
+        if compressible or message["status"] == 304:
+            # Set whether or not this response ends up encoded
+            _add_vary(headers)
+
+        too_small = int(headers.get("content-length", settings.COMPRESSION_MIN_SIZE)) < settings.COMPRESSION_MIN_SIZE
+        if (
+            self.coding is None or not compressible or too_small
+            or "content-encoding" in headers or message["status"] in (204, 304)
+        ):
+            self.passthrough = True
+            await self.send(message)
+            return
+        # Hold the start until the first body chunk shows how large the response is
+        self.start = message
+
+    async def _on_body(self, message: Message) -> None:
+        body: bytes = message.get("body", b"")
+        more_body: bool = message.get("more_body", False)
+
+        if self.encoder is None:
+            headers = MutableHeaders(scope=self.start)
+            if not more_body:
+                # Complete body in one message: compress it in one go (or not at all)
+                if len(body) < settings.COMPRESSION_MIN_SIZE:
+                    self.passthrough = True
+                    await self.send(self.start)
+                    await self.send(message)
+                    return
+                compressed = self._compress_whole(body, headers.get("etag"))
+                compression_stats.compressed += 1
+                compression_stats.record(len(body), len(compressed))
+                self._set_encoding_headers(headers)
+                headers["Content-Length"] = str(len(compressed))
+                await self.send(self.start)
+                await self.send({"type": "http.response.body", "body": compressed})
+                return
+
+            # Streamed response: its length is unknown up front
+            self.encoder = ENCODERS[self.coding]()
+            compression_stats.streamed += 1
+            self._set_encoding_headers(headers)
+            del headers["Content-Length"]
+            await self.send(self.start)
+
+        out = self.encoder.compress(body)
+        self.pending += len(body)
+        if not more_body:
+            out += self.encoder.finish()
+        elif self.pending >= settings.COMPRESSION_STREAM_FLUSH_BYTES:
+            out += self.encoder.flush()
+            self.pending = 0
+        compression_stats.record(len(body), len(out))
+        if out or not more_body:
+            await self.send({"type": "http.response.body", "body": out, "more_body": more_body})
+
+    def _set_encoding_headers(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.coding
+        if "etag" in headers:
+            headers["ETag"] = _weak(headers["etag"])
+
+    def _compress_whole(self, body: bytes, etag: Optional[str]) -> bytes:
+        # Only a strong ETag identifies the exact bytes of the body
+        if compressed_cache is None or not etag or etag.startswith("W/"):
+            return compress(self.coding, body)
+        key: Tuple = (self.scope["path"], self.scope.get("query_string", b""), etag, self.coding)
+        compressed = compressed_cache.get(key)
+        if compressed is None:
+            compressed = compress(self.coding, body)
+            compressed_cache.set(key, compressed)
+        return compressed
@@ -1,4 +1,5 @@
 import os
+from typing import Optional
 from pydantic_settings import BaseSettings
 from pathlib import Path
 
@@ -8,11 +9,86 @@ TEMPLATES_DIR = BASE_DIR / "templates"
 
 class Settings(BaseSettings):
     DATABASE_URL: str 
+    # SQLite performance profile ("default" or "production", see app/database/database.py)
+    DATABASE_PROFILE: str = "default"
+    DATABASE_POOL_SIZE: int = 5
+    DATABASE_MAX_OVERFLOW: int = 10
+    DATABASE_POOL_TIMEOUT_SECONDS: float = 30.0
     SECRET_KEY: str
     GITHUB_ACCESS_TOKEN: str
+    # Shared secret for verifying GitHub webhook deliveries (webhooks are off when unset)
+    GITHUB_WEBHOOK_SECRET: Optional[str] = None
     ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7  
+    # bcrypt cost factor; stored hashes with a different cost are rehashed on login
+    BCRYPT_ROUNDS: int = 12
+    # Dedicated process pool for password hashing, and how many calls may wait on it
+    PASSWORD_HASH_WORKERS: int = 2
+    PASSWORD_HASH_MAX_PENDING: int = 32
+    # In-process cache of verified tokens and user identities
+    AUTH_CACHE_ENABLED: bool = True
+    AUTH_CACHE_MAX_ENTRIES: int = 10000
+    AUTH_CACHE_TTL_SECONDS: float = 60.0
+    # Max number of tags processed concurrently during version discovery
+    GITHUB_MAX_CONCURRENCY: int = 8
+    # Central GitHub request scheduler: extra tokens (comma-separated) rotated by
+    # remaining quota, global in-flight cap, throttling and retry/backoff policy
+    GITHUB_ACCESS_TOKENS: str = ""
+    GITHUB_MAX_IN_FLIGHT: int = 16
+    GITHUB_RATE_LIMIT_LOW_WATER: int = 500
+    GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS: float = 60.0
+    GITHUB_MAX_RETRIES: int = 4
+    GITHUB_BACKOFF_BASE_SECONDS: float = 0.5
+    GITHUB_BACKOFF_MAX_SECONDS: float = 30.0
+    # Shared outbound HTTP client (connection pool, keep-alive, timeouts)
+    HTTP2_ENABLED: bool = True
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY_SECONDS: float = 30.0
+    HTTP_CONNECT_TIMEOUT_SECONDS: float = 5.0
+    HTTP_TIMEOUT_SECONDS: float = 15.0
+    # Persistent conditional-request cache for GitHub API responses
+    GITHUB_CACHE_ENABLED: bool = True
+    GITHUB_CACHE_PATH: str = ".cache/github.sqlite3"
+    GITHUB_CACHE_MAX_ENTRIES: int = 50_000
+    GITHUB_CACHE_MAX_AGE_SECONDS: float = 30 * 24 * 3600.0
+    # In-process cache of package read responses
+    RESPONSE_CACHE_ENABLED: bool = True
+    RESPONSE_CACHE_MAX_ENTRIES: int = 1024
+    RESPONSE_CACHE_TTL_SECONDS: float = 60.0
+    # Cache-Control headers of the package read endpoints
+    CACHE_CONTROL_PACKAGE_LIST: str = "public, max-age=30"
+    CACHE_CONTROL_PACKAGE_DETAIL: str = "public, max-age=60"
+    # Response compression (zstd / brotli when installed, gzip always)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+    COMPRESSION_STREAM_FLUSH_BYTES: int = 64 * 1024
+    # Compressed bodies of responses with a strong ETag, reused instead of recompressing
+    COMPRESSION_CACHE_ENABLED: bool = True
+    COMPRESSION_CACHE_MAX_ENTRIES: int = 1024
+    COMPRESSION_CACHE_TTL_SECONDS: float = 300.0
+    # Compressed NDJSON snapshot of the catalogue, updated after each import
+    INDEX_SNAPSHOT_ENABLED: bool = True
+    INDEX_SNAPSHOT_PATH: str = ".cache/index.ndjson.gz"
+    INDEX_SNAPSHOT_MAX_APPENDS: int = 100
+    # Compact in-memory catalogue serving the package read paths, persisted to a snapshot file
+    CATALOGUE_INDEX_ENABLED: bool = False
+    CATALOGUE_INDEX_PATH: str = ".cache/catalogue.idx"
+    CATALOGUE_INDEX_SYNC_INTERVAL_SECONDS: float = 1.0
+    # Background package import workers
+    IMPORT_WORKERS: int = 2
+    IMPORT_WORKERS_IN_PROCESS: bool = True
+    IMPORT_POLL_INTERVAL_SECONDS: float = 2.0
+    # A running job whose worker stopped renewing it for this long is re-queued
+    IMPORT_JOB_LEASE_SECONDS: float = 60.0
+    # How often every package is queued for an incremental refresh (0 disables)
+    PACKAGE_REFRESH_INTERVAL_SECONDS: float = 6 * 60 * 60
+    # Internal statistics at /api/v1/metrics (token budgets, cache sizes); off unless needed
+    METRICS_ENABLED: bool = False
     class Config: 
         env_file=".env"
         env_file_encoding ="utf-8"
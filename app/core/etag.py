@@ -0,0 +1,34 @@
+# app/core/etag.py
+import hashlib
+from typing import Iterable, Optional
+
+from fastapi import Request, Response, status
+
+
+def make_etag(*parts: object) -> str:
+    """Builds a strong ETag from values that change whenever the representation does."""
+    return '"' + "-".join(str(part) for part in parts) + '"'
+
+
+def make_digest_etag(items: Iterable[object]) -> str:
+    """Builds a strong ETag from a (possibly long) sequence of values."""
+    digest = hashlib.sha1()
+    for item in items:
+        digest.update(str(item).encode())
+        digest.update(b"\0")
+    return f'"{digest.hexdigest()}"'
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """True if the request's If-None-Match header covers `etag`."""
+    header: Optional[str] = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = [candidate.strip() for candidate in header.split(",")]
+    # If-None-Match uses weak comparison, so W/"x" matches "x"
+    return "*" in candidates or any(candidate.removeprefix("W/") == etag for candidate in candidates)
+
+
+def not_modified(headers: dict) -> Response:
+    """A bodyless 304 carrying the validators and caching headers of the full response."""
+    return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
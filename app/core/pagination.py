@@ -0,0 +1,37 @@
+# app/core/pagination.py
+import base64
+import json
+from typing import Any, Tuple
+
+# Response header carrying the cursor of the next page, absent on the last page
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursorException(Exception):
+    pass
+
+
+def encode_cursor(*values: Any) -> str:
+    """Packs the sort key of the last row of a page into an opaque, URL-safe token."""
+    raw = json.dumps(list(values), separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(token: str, *types: type) -> Tuple[Any, ...]:
+    """
+    Unpacks a token produced by `encode_cursor`, expecting one value of each
+    of `types`. A token that decodes to other types would only fail later,
+    inside the query.
+    """
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise InvalidCursorException("Malformed pagination cursor.")
+    if not isinstance(values, list) or len(values) != len(types):
+        raise InvalidCursorException("Malformed pagination cursor.")
+    for value, expected in zip(values, types):
+        # JSON true/false decode to bool, which isinstance() accepts as int
+        if not isinstance(value, expected) or isinstance(value, bool):
+            raise InvalidCursorException("Malformed pagination cursor.")
+    return tuple(values)
@@ -7,9 +7,29 @@ class Routes:
         register = "/register"
         me = "/me"
         refresh = "/token/refresh"
-        change_password = "/change-password"
 
     class Packages: 
         root = "/api/v1/packages"
         default ="/"
+        search = "/search"
         get_by_name = "/{package_name}"
+        refresh = "/{package_name}/refresh"
+        versions = "/{package_name}/versions"
+        job = "/jobs/{job_id}"
+
+    class Hooks:
+        root = "/api/v1/hooks"
+        github = "/github"
+
+    class Resolve:
+        root = "/api/v1/resolve"
+        default = "/"
+
+    class Index:
+        root = "/api/v1/index"
+        default = "/"
+        snapshot = "/snapshot"
+
+    class Metrics:
+        root = "/api/v1/metrics"
+        default = "/"
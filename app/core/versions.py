@@ -0,0 +1,97 @@
+# app/core/versions.py
+"""
+Sortable semantic-version keys.
+
+A key is computed once per version from its tag and stored in
+`package_versions.version_key`, so ordering ("latest") and range filters
+(`>=1.2,<2`) become plain string comparisons the database can index.
+
+    v1.2.3      -> 00000001.00000002.00000003~
+    1.2.3-rc1   -> 00000001.00000002.00000003-rc1
+
+Numeric parts are zero-padded so they compare numerically as text. A
+release ends with '~', which sorts after the '-' of any pre-release of the
+same version, so 1.2.3-rc1 < 1.2.3. Pre-release labels compare as text
+(rc10 < rc2). Tags outside the grammar get the empty key, which sorts
+before everything else. Such versions have no place in the ordering, so
+they never satisfy a range constraint: '' < '2.0' holds, but is meaningless.
+"""
+import operator
+import re
+from typing import List, Optional, Tuple
+
+# Same grammar as VCSProviderBase.is_valid_version_tag: 1.0, 1.2.3, v1.2.3, 1.2.3-rc1
+SEMVER_TAG_PATTERN = re.compile(r'^v?(\d+)\.(\d+)(?:\.(\d+))?(-[a-zA-Z0-9.-]+)?$')
+
+VERSION_PART_WIDTH = 8
+RELEASE_SUFFIX = "~"
+
+CONSTRAINT_PATTERN = re.compile(r'^\s*(>=|<=|==|!=|>|<|=)?\s*(\S+)\s*$')
+# A bare major version is allowed as a bound: '<2' means '<2.0'
+MAJOR_ONLY_PATTERN = re.compile(r'^v?\d+$')
+# The same comparisons work on keys in Python and on the key column in SQL
+CONSTRAINT_OPERATORS = {
+    ">=": operator.ge,
+    ">": operator.gt,
+    "<=": operator.le,
+    "<": operator.lt,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
+
+
+class InvalidVersionConstraintException(Exception):
+    pass
+
+
+def version_key(tag_name: str) -> Optional[str]:
+    """Returns the sortable key of a semver-like tag, or None if it does not parse."""
+    match = SEMVER_TAG_PATTERN.match(tag_name)
+    if match is None:
+        return None
+    major, minor, patch, prerelease = match.groups()
+    numbers = ".".join(
+        str(int(part or 0)).zfill(VERSION_PART_WIDTH) for part in (major, minor, patch)
+    )
+    return numbers + (prerelease or RELEASE_SUFFIX)
+
+
+def version_key_for(git_tag: str, version: str) -> str:
+    """Key of a stored version: from its tag, else its dur.json version, else ''."""
+    return version_key(git_tag) or version_key(version) or ""
+
+
+def _bound_key(bound: str) -> Optional[str]:
+    if MAJOR_ONLY_PATTERN.match(bound):
+        bound += ".0"
+    return version_key(bound)
+
+
+def parse_constraint(spec: str) -> List[Tuple[str, str]]:
+    """
+    Parses a comma-separated constraint such as '>=1.2,<2' into
+    (operator, version key) pairs. A bare version means '=='.
+    """
+    clauses = []
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        match = CONSTRAINT_PATTERN.match(part)
+        key = _bound_key(match.group(2)) if match else None
+        if key is None:
+            raise InvalidVersionConstraintException(f"Invalid version constraint: '{part.strip()}'.")
+        op = match.group(1) or "=="
+        clauses.append(("==" if op == "=" else op, key))
+    if not clauses:
+        raise InvalidVersionConstraintException("Empty version constraint.")
+    return clauses
+
+
+def satisfies(key: str, clauses: List[Tuple[str, str]]) -> bool:
+    """
+    True if a version key meets every (operator, key) clause. A version
+    without a key (unparseable tag) only meets the empty constraint.
+    """
+    if not key:
+        return not clauses
+    return all(CONSTRAINT_OPERATORS[op](key, bound) for op, bound in clauses)
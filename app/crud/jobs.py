@@ -0,0 +1,247 @@
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import or_, select, update
+from sqlalchemy.dialects.sqlite import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.packages import PackageBase
+from app.database.models.jobs import (
+    ImportJob, JOB_PENDING, JOB_RUNNING, JOB_SUCCEEDED, JOB_FAILED, ACTIVE_JOB_STATUSES,
+    JOB_KIND_IMPORT, JOB_KIND_REFRESH, JOB_KIND_TAG,
+)
+from app.database.models.packages import Package
+
+async def create_import_job(db: AsyncSession, package_in: PackageBase, user_id: int) -> ImportJob:
+    """
+    Persist a pending import job for a package submission.
+
+    Args:
+        db (AsyncSession): Async SQLAlchemy session.
+        package_in (PackageBase): The submitted package data.
+        user_id (int): ID of the user submitting the package.
+
+    Returns:
+        ImportJob: The newly created job.
+    """
+    db_job = ImportJob(
+        kind=JOB_KIND_IMPORT,
+        status=JOB_PENDING,
+        repo_url=str(package_in.repo_url),
+        payload=package_in.model_dump(mode="json"),
+        created_by=user_id,
+    )
+    db.add(db_job)
+    await db.commit()
+    await db.refresh(db_job)
+    return db_job
+
+
+async def create_refresh_job(db: AsyncSession, package: Package, user_id: int) -> ImportJob:
+    """
+    Persist a pending refresh job that imports the package's new tags.
+
+    Args:
+        db (AsyncSession): Async SQLAlchemy session.
+        package (Package): The package to refresh.
+        user_id (int): ID of the user (or, when scheduled, the package owner) requesting it.
+
+    Returns:
+        ImportJob: The newly created job.
+    """
+    db_job = ImportJob(
+        kind=JOB_KIND_REFRESH,
+        status=JOB_PENDING,
+        repo_url=package.repo_url,
+        payload={"name": package.name},
+        created_by=user_id,
+        package_id=package.id,
+    )
+    db.add(db_job)
+    await db.commit()
+    await db.refresh(db_job)
+    return db_job
+
+
+async def enqueue_tag_job(db: AsyncSession, package: Package, tag: str) -> ImportJob:
+    """
+    Queues the import of a single tag of an existing package.
+
+    Only one job per repository can be active. A pending job for another tag
+    is widened into a refresh, which picks up both tags; a running job is
+    returned as is and the scheduled refresh catches the tag later.
+
+    Args:
+        db (AsyncSession): Async SQLAlchemy session.
+        package (Package): The package the tag belongs to.
+        tag (str): The tag name.
+
+    Returns:
+        ImportJob: The job that will import the tag.
+    """
+    job = await get_active_job_for_repo(db, package.repo_url)
+    if job is None:
+        job = ImportJob(
+            kind=JOB_KIND_TAG,
+            status=JOB_PENDING,
+            repo_url=package.repo_url,
+            payload={"name": package.name, "tag": tag},
+            created_by=package.created_by,
+            package_id=package.id,
+        )
+        db.add(job)
+    elif job.status == JOB_PENDING and job.kind == JOB_KIND_TAG and job.payload.get("tag") != tag:
+        job.kind = JOB_KIND_REFRESH
+        job.payload = {"name": package.name}
+    else:
+        return job
+
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def get_job(db: AsyncSession, job_id: int) -> ImportJob | None:
+    result = await db.execute(select(ImportJob).where(ImportJob.id == job_id))
+    return result.scalars().first()
+
+
+async def get_active_job_for_repo(db: AsyncSession, repo_url: str) -> ImportJob | None:
+    """Returns the pending or running job for `repo_url`, if any."""
+    result = await db.execute(
+        select(ImportJob)
+        .where(ImportJob.repo_url == repo_url, ImportJob.status.in_(ACTIVE_JOB_STATUSES))
+    )
+    return result.scalars().first()
+
+
+async def claim_next_job(db: AsyncSession, worker_id: str) -> ImportJob | None:
+    """
+    Atomically moves the oldest pending job to 'running', leased to
+    `worker_id`, and returns it.
+    The conditional UPDATE makes concurrent workers skip jobs already taken.
+    """
+    while True:
+        result = await db.execute(
+            select(ImportJob)
+            .where(ImportJob.status == JOB_PENDING)
+            .order_by(ImportJob.id)
+            .limit(1)
+        )
+        job = result.scalars().first()
+        if job is None:
+            return None
+
+        now = datetime.now(timezone.utc)
+        claimed = await db.execute(
+            update(ImportJob)
+            .where(ImportJob.id == job.id, ImportJob.status == JOB_PENDING)
+            .values(
+                status=JOB_RUNNING,
+                started_at=now,
+                attempts=ImportJob.attempts + 1,
+                claimed_by=worker_id,
+                heartbeat_at=now,
+            )
+        )
+        await db.commit()
+        if claimed.rowcount:
+            await db.refresh(job)
+            return job
+
+
+async def update_job_progress(db: AsyncSession, job_id: int, tags_discovered: int, versions_found: int) -> None:
+    await db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id)
+        .values(tags_discovered=tags_discovered, versions_found=versions_found)
+    )
+    await db.commit()
+
+
+async def finish_job(
+    db: AsyncSession,
+    job: ImportJob,
+    *,
+    package_id: int | None = None,
+    error: str | None = None,
+    tags_discovered: int | None = None,
+    versions_found: int | None = None,
+) -> ImportJob:
+    """Marks a job as succeeded (with its package) or failed (with an error message)."""
+    if tags_discovered is not None:
+        job.tags_discovered = tags_discovered
+    if versions_found is not None:
+        job.versions_found = versions_found
+    job.status = JOB_FAILED if error else JOB_SUCCEEDED
+    if package_id is not None:
+        job.package_id = package_id
+    job.error = error
+    job.finished_at = datetime.now(timezone.utc)
+    await db.commit()
+    await db.refresh(job)
+    return job
+
+
+async def renew_job_lease(db: AsyncSession, job_id: int, worker_id: str) -> bool:
+    """
+    Extends the lease of a running job held by `worker_id`.
+    Returns False if the job was finished or requeued in the meantime.
+    """
+    result = await db.execute(
+        update(ImportJob)
+        .where(ImportJob.id == job_id, ImportJob.status == JOB_RUNNING, ImportJob.claimed_by == worker_id)
+        .values(heartbeat_at=datetime.now(timezone.utc))
+    )
+    await db.commit()
+    return bool(result.rowcount)
+
+
+async def requeue_expired_jobs(db: AsyncSession, lease_seconds: float) -> int:
+    """
+    Puts running jobs whose lease expired back in the queue: their worker
+    died or was restarted. Jobs still renewed by a live worker, in this or
+    any other process, are left alone.
+    """
+    expired_before = datetime.now(timezone.utc) - timedelta(seconds=lease_seconds)
+    result = await db.execute(
+        update(ImportJob)
+        .where(
+            ImportJob.status == JOB_RUNNING,
+            or_(ImportJob.heartbeat_at.is_(None), ImportJob.heartbeat_at < expired_before),
+        )
+        .values(status=JOB_PENDING, claimed_by=None, heartbeat_at=None)
+        # SQLite returns naive datetimes, which Python cannot compare in-session
+        .execution_options(synchronize_session="fetch")
+    )
+    await db.commit()
+    return result.rowcount
+
+
+async def enqueue_refresh_jobs(db: AsyncSession) -> int:
+    """
+    Queues a refresh job for every package without a pending or running job.
+    Returns the number of jobs created.
+
+    A job for the same repository may be enqueued between the SELECT and the
+    INSERT (a submission or a webhook); ON CONFLICT DO NOTHING skips just that
+    row, via the one-active-job-per-repository index, instead of failing the batch.
+    """
+    active = select(ImportJob.repo_url).where(ImportJob.status.in_(ACTIVE_JOB_STATUSES))
+    result = await db.execute(
+        select(Package.id, Package.name, Package.repo_url, Package.created_by)
+        .where(Package.repo_url.not_in(active))
+    )
+    rows = [
+        {
+            "kind": JOB_KIND_REFRESH,
+            "status": JOB_PENDING,
+            "repo_url": row.repo_url,
+            "payload": {"name": row.name},
+            "created_by": row.created_by,
+            "package_id": row.id,
+        }
+        for row in result
+    ]
+    if not rows:
+        return 0
+    inserted = await db.execute(insert(ImportJob.__table__).on_conflict_do_nothing(), rows)
+    await db.commit()
+    return inserted.rowcount
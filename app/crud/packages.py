@@ -1,13 +1,32 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import func, insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.schemas.packages import PackageBase  
 from app.database.models.packages import Package, PackageVersion
+from app.core.cache import invalidate_package
+from app.core.versions import version_key_for
+from app.services.catalogue_index import catalogue_index
 
-def create_package(db:Session, package: PackageBase, user_id: int )->Package: 
+def _invalidate(package_name: str) -> None:
+    """Drops cached responses for the package and marks the catalogue index for a resync."""
+    invalidate_package(package_name)
+    if catalogue_index is not None:
+        catalogue_index.mark_stale()
+
+
+def next_revision():
+    """
+    SQL expression for the next catalogue revision. It is evaluated inside the
+    writing statement, so SQLite's write lock keeps revisions unique.
+    """
+    return select(func.coalesce(func.max(Package.revision), 0) + 1).scalar_subquery()
+
+
+async def create_package(db: AsyncSession, package: PackageBase, user_id: int )->Package: 
     """
      Create a new package in the database.
 
     Args:
-        db (Session): SQLAlchemy session.
+        db (AsyncSession): Async SQLAlchemy session.
         package (schema.package.PackageBase): Pydantic schema with package input data.
         user_id (int): ID of the user creating the package.
 
@@ -17,19 +36,71 @@ def create_package(db:Session, package: PackageBase, user_id: int )->Package:
     db_package = Package(name=package.name, description= package.description, repo_url= str(package.repo_url), 
                          license = package.license, 
                          homepage= str(package.homepage),
-                         created_by = user_id 
+                         created_by = user_id,
+                         revision = next_revision(),
                          )
     db.add(db_package)
-    db.commit()
-    db.refresh(db_package)
+    await db.commit()
+    _invalidate(db_package.name)
+    await db.refresh(db_package)
     return db_package
 
 
-def create_with_versions(
-    db: Session, *, package_in: PackageBase, versions_data: list, user_id: int
+def latest_version_id(package_id: int):
+    """
+    SQL expression for the id of a package's highest version by semver key
+    (then release), independent of the order tags were imported in.
+    """
+    return (
+        select(PackageVersion.id)
+        .where(PackageVersion.package_id == package_id)
+        .order_by(
+            PackageVersion.version_key.desc(),
+            PackageVersion.release.desc(),
+            PackageVersion.id.desc(),
+        )
+        .limit(1)
+        .scalar_subquery()
+    )
+
+
+def _version_rows(versions_data: list) -> list[dict]:
+    """
+    Flattens parsed versions into plain column dicts, serialising each
+    metadata model exactly once.
+    """
+    return [
+        {
+            "version": version_info.metadata.version,
+            "release": version_info.metadata.release,
+            "source_url": str(version_info.metadata.source),
+            "git_tag": version_info.git_tag,
+            "version_key": version_key_for(version_info.git_tag, version_info.metadata.version),
+            "package_metadata": version_info.metadata.model_dump(mode='json'),
+        }
+        for version_info in versions_data
+    ]
+
+
+async def _bulk_insert_versions(db: AsyncSession, package_id: int, rows: list[dict]) -> None:
+    """
+    Inserts version rows with a single executemany, bypassing the unit of
+    work. No RETURNING: SQLite cannot batch an ordered RETURNING, which
+    would turn this back into one statement per row.
+    """
+    for row in rows:
+        row["package_id"] = package_id
+    await db.execute(insert(PackageVersion), rows)
+
+
+async def create_with_versions(
+    db: AsyncSession, *, package_in: PackageBase, versions_data: list, user_id: int
 ) -> Package:
     """
-    Creates a Package and all its associated PackageVersion records in a single transaction.
+    Creates a Package and all its associated PackageVersion records in a single transaction,
+    pointing `latest_version` at the highest version by semver key.
+
+    Versions go in through one batched INSERT rather than one ORM object each.
     """
     # Use .model_dump() to get a dictionary
     package_data = package_in.model_dump()
@@ -40,20 +111,63 @@ def create_with_versions(
         package_data['homepage'] = str(package_data['homepage'])
 
     # The rest of your logic can now work with the dictionary as expected
-    db_package = Package(**package_data, created_by=user_id)
+    db_package = Package(**package_data, created_by=user_id, revision=next_revision())
     db.add(db_package)
 
-    for version_info in versions_data:
-        db_version = PackageVersion(
-            package=db_package,
-            version=version_info.metadata.version,
-            release=version_info.metadata.release,
-            source_url=str(version_info.metadata.source),
-            git_tag=version_info.git_tag,
-            package_metadata=version_info.metadata.model_dump(mode='json')
-        )
-        db.add(db_version)
+    # The package id is needed for the version rows
+    await db.flush()
+
+    rows = _version_rows(versions_data)
+    if rows:
+        await _bulk_insert_versions(db, db_package.id, rows)
+        db_package.latest_version_id = latest_version_id(db_package.id)
+
+    await db.commit()
+    _invalidate(db_package.name)
+    await db.refresh(db_package)
+    return db_package
+
+
+async def get_version_keys(db: AsyncSession, package_id: int) -> tuple[set[str], set[tuple[str, int]]]:
+    """
+    Returns the git tags and (version, release) pairs already stored for a
+    package, used to import only what is new.
+    """
+    result = await db.execute(
+        select(PackageVersion.git_tag, PackageVersion.version, PackageVersion.release)
+        .where(PackageVersion.package_id == package_id)
+    )
+    tags: set[str] = set()
+    versions: set[tuple[str, int]] = set()
+    for git_tag, version, release in result:
+        tags.add(git_tag)
+        versions.add((version, release))
+    return tags, versions
+
+
+async def add_versions(db: AsyncSession, *, package: Package, versions_data: list) -> int:
+    """
+    Appends newly discovered versions to an existing package in a single
+    transaction, re-pointing `latest_version` at the highest version and
+    bumping the package revision. Versions whose (version, release) is already
+    stored are skipped. Returns the number of versions inserted.
+    """
+    _, stored = await get_version_keys(db, package.id)
+    rows = []
+    for row in _version_rows(versions_data):
+        key = (row["version"], row["release"])
+        if key not in stored:
+            stored.add(key)
+            rows.append(row)
+    if not rows:
+        return 0
 
-    db.commit()
-    db.refresh(db_package)
-    return db_package
\ No newline at end of file
+    await _bulk_insert_versions(db, package.id, rows)
+    await db.execute(
+        update(Package)
+        .where(Package.id == package.id)
+        .values(revision=next_revision(), latest_version_id=latest_version_id(package.id))
+    )
+    await db.commit()
+    _invalidate(package.name)
+    return len(rows)
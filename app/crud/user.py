@@ -1,39 +1,72 @@
 # app/crud/user.py
 
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from app.database.models.user import User
 from app.schemas.user import UserCreate
-from app.auth.security import get_password_hash
+from app.auth.hashing import password_hasher
+from app.auth.identity_cache import invalidate_user
 
-def get_user_by_username(db: Session, username: str) -> User | None:
+async def get_user_by_username(db: AsyncSession, username: str) -> User | None:
     """
     Retrieve a single user from the database by their username.
 
-    :param db: The SQLAlchemy database session.
+    :param db: The async SQLAlchemy database session.
     :param username: The username to search for.
     :return: The User object if found, otherwise None.
     """
-    return db.query(User).filter(User.username == username).first()
+    result = await db.execute(select(User).where(User.username == username))
+    return result.scalars().first()
 
-def create_user(db: Session, user: UserCreate) -> User:
+async def create_user(db: AsyncSession, user: UserCreate) -> User:
     """
     Create a new user in the database.
 
-    :param db: The SQLAlchemy database session.
+    :param db: The async SQLAlchemy database session.
     :param user: The user creation data (username and password) from the API request.
     :return: The newly created User object.
     """
     # 1. Hash the user's plain text password before storing it.
-    hashed_password = get_password_hash(user.password)
+    #    bcrypt is CPU-bound, so it runs on the password hashing pool.
+    hashed_password = await password_hasher.hash(user.password)
     
     # 2. Create the new User database model instance.
     db_user = User(username=user.username, hashed_password=hashed_password)
     
     # 3. Add the new user instance to the session and commit to the database.
     db.add(db_user)
-    db.commit()
+    await db.commit()
     
     # 4. Refresh the instance to get data generated by the database (like id, created_at).
-    db.refresh(db_user)
+    await db.refresh(db_user)
     
-    return db_user
\ No newline at end of file
+    return db_user
+
+async def update_password_hash(db: AsyncSession, user: User, hashed_password: str) -> User:
+    """
+    Store a rehashed password (same password, current cost factor).
+
+    :param db: The async SQLAlchemy database session.
+    :param user: The User object to update.
+    :param hashed_password: The new hash for the user's existing password.
+    :return: The updated User object.
+    """
+    user.hashed_password = hashed_password
+    await db.commit()
+
+    # Any write to a user drops its cached identity, so the next request re-reads it
+    invalidate_user(user.username)
+    return user
+
+async def delete_user(db: AsyncSession, user: User) -> None:
+    """
+    Delete a user.
+
+    :param db: The async SQLAlchemy database session.
+    :param user: The User object to delete.
+    """
+    await db.delete(user)
+    await db.commit()
+
+    # Tokens of a deleted user must stop authenticating right away
+    invalidate_user(user.username)
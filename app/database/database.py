@@ -1,18 +1,78 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker, declarative_base
 from app.core.config import settings
 
+# PRAGMAs applied to every new SQLite connection, per DATABASE_PROFILE.
+# "production" lets readers proceed while an import is writing (WAL) and
+# waits on locks instead of failing with "database is locked".
+SQLITE_PROFILES = {
+    "default": {},
+    "production": {
+        "journal_mode": "WAL",
+        "synchronous": "NORMAL",
+        "busy_timeout": 5000,           # milliseconds
+        "cache_size": -64000,           # negative = KiB, i.e. ~64 MB
+        "mmap_size": 268435456,         # 256 MB
+        "temp_store": "MEMORY",
+    },
+}
+
+if settings.DATABASE_PROFILE not in SQLITE_PROFILES:
+    raise ValueError(
+        f"Unknown DATABASE_PROFILE '{settings.DATABASE_PROFILE}'. "
+        f"Expected one of: {', '.join(SQLITE_PROFILES)}"
+    )
+
+SQLITE_PRAGMAS = SQLITE_PROFILES[settings.DATABASE_PROFILE]
+
+def _async_database_url(url: str) -> str:
+    """Maps the configured SQLite URL onto the aiosqlite async driver."""
+    parsed = make_url(url)
+    if parsed.drivername == "sqlite":
+        parsed = parsed.set(drivername="sqlite+aiosqlite")
+    return parsed.render_as_string(hide_password=False)
+
+def _apply_sqlite_pragmas(engine: Engine, pragmas: dict = SQLITE_PRAGMAS) -> None:
+    """Runs `pragmas` (by default the active profile's) on every connection the engine opens."""
+    if not pragmas:
+        return
+
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name}={value}")
+        cursor.close()
+
+_pool_options = {
+    "pool_size": settings.DATABASE_POOL_SIZE,
+    "max_overflow": settings.DATABASE_MAX_OVERFLOW,
+    "pool_timeout": settings.DATABASE_POOL_TIMEOUT_SECONDS,
+}
+
+# Synchronous engine, kept for Alembic migrations and scripts
 engine = create_engine(
-        settings.DATABASE_URL, connect_args={"check_same_thread": False}
+        settings.DATABASE_URL, connect_args={"check_same_thread": False}, **_pool_options
 )
+_apply_sqlite_pragmas(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Asynchronous engine used by the API and the import workers
+async_engine = create_async_engine(
+        _async_database_url(settings.DATABASE_URL), connect_args={"check_same_thread": False},
+        **_pool_options
+)
+_apply_sqlite_pragmas(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+        async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
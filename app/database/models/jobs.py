@@ -0,0 +1,54 @@
+from sqlalchemy import JSON, Column, Integer, String, DateTime, ForeignKey, Index, func, text
+from app.database.database import Base
+
+# Job lifecycle states
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+ACTIVE_JOB_STATUSES = (JOB_PENDING, JOB_RUNNING)
+
+# Job kinds: first import of a repository, picking up all of its new tags,
+# or importing the single tag announced by a webhook
+JOB_KIND_IMPORT = "import"
+JOB_KIND_REFRESH = "refresh"
+JOB_KIND_TAG = "tag"
+
+class ImportJob(Base):
+    __tablename__ = "import_jobs"
+
+    id = Column(Integer, primary_key=True, index=True, autoincrement=True)
+    kind = Column(String, nullable=False, default=JOB_KIND_IMPORT)
+    status = Column(String, nullable=False, default=JOB_PENDING, index=True)
+
+    repo_url = Column(String, nullable=False, index=True)
+    # The submitted package data, replayed by the worker once discovery finishes
+    payload = Column(JSON, nullable=False)
+
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=False)
+    package_id = Column(Integer, ForeignKey("packages.id"), nullable=True)
+
+    # Progress reported while the worker walks the repository tags
+    tags_discovered = Column(Integer, nullable=False, default=0)
+    versions_found = Column(Integer, nullable=False, default=0)
+    attempts = Column(Integer, nullable=False, default=0)
+    error = Column(String, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    started_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Lease of a running job: the worker holding it renews `heartbeat_at`, and
+    # a job whose heartbeat is older than IMPORT_JOB_LEASE_SECONDS is re-queued
+    claimed_by = Column(String, nullable=True)
+    heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        # At most one pending/running job per repository
+        Index(
+            "ix_import_jobs_active_repo_url",
+            "repo_url",
+            unique=True,
+            sqlite_where=text("status IN ('pending', 'running')"),
+        ),
+    )
@@ -1,5 +1,5 @@
 import datetime
-from sqlalchemy import JSON, Column, Integer, String, DateTime, ForeignKey, UniqueConstraint, func
+from sqlalchemy import JSON, Column, Integer, String, DateTime, ForeignKey, Index, UniqueConstraint, func
 from sqlalchemy.orm import relationship
 from app.database.database import Base
 
@@ -18,8 +18,29 @@ class Package(Base):
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
 
+    # Catalogue-wide, monotonically increasing change counter: every write to a
+    # package (or its versions) moves it to max(revision) + 1. Used for ETags.
+    revision = Column(Integer, nullable=False, default=0, server_default="0", index=True)
+
+    # Denormalised pointer to the newest version, maintained on every version insert
+    latest_version_id = Column(
+        Integer,
+        ForeignKey("package_versions.id", use_alter=True, name="fk_packages_latest_version_id"),
+        nullable=True,
+    )
+
     creator = relationship("User", back_populates="packages") 
-    versions = relationship("PackageVersion", back_populates="package", cascade="all, delete-orphan")
+    versions = relationship(
+        "PackageVersion", back_populates="package", cascade="all, delete-orphan",
+        foreign_keys="PackageVersion.package_id",
+    )
+    # post_update breaks the packages <-> package_versions insert cycle
+    latest_version = relationship("PackageVersion", foreign_keys=[latest_version_id], post_update=True)
+
+    __table_args__ = (
+        # Backs keyset pagination of the listing (newest first)
+        Index('ix_packages_created_at_id', 'created_at', 'id'),
+    )
      
 class PackageVersion(Base):
     __tablename__ = "package_versions"
@@ -35,13 +56,18 @@ class PackageVersion(Base):
 
     # The tag from the recipe repository
     git_tag = Column(String, nullable=False)
+
+    # Sortable semver key derived from the tag (see app/core/versions.py)
+    version_key = Column(String, nullable=False, default="", server_default="")
     
     published_at = Column(DateTime, default= datetime.datetime.now(datetime.timezone.utc))
 
     package_id = Column(Integer, ForeignKey("packages.id"), nullable=False, index=True)
 
-    package = relationship("Package", back_populates="versions")
+    package = relationship("Package", back_populates="versions", foreign_keys=[package_id])
 
     __table_args__ = (
         UniqueConstraint('package_id', 'version', 'release', name='_package_version_release_uc'),
+        # Backs semver ordering, range filters and keyset pagination of a package's versions
+        Index('ix_package_versions_package_id_version_key', 'package_id', 'version_key', 'release', 'id'),
     )
\ No newline at end of file
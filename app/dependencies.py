@@ -1,29 +1,31 @@
 # app/dependencies.py
 
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+
+import httpx
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from jose import jwt
 
-from app.database.database import SessionLocal
+from app.database.database import AsyncSessionLocal
 from app.auth import security as auth_security
+from app.auth import identity_cache
 from app.crud import user as crud_user
 from app.schemas.token import TokenData
-from app.database.models.user import User
+from app.schemas.user import UserPublic
 from app.core.config import settings
+from app.workers.imports import ImportWorkerPool
 
 # --- Dependency 1: Database Session ---
 
-def get_db():
+async def get_db():
     """
-    Dependency function to get a database session.
+    Dependency function to get an async database session.
     Yields a session for use in a request, then ensures it's closed.
     """
-    db = SessionLocal()
-    try:
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
 
 # --- Dependency 2: Authentication ---
 
@@ -32,13 +34,16 @@ def get_db():
 # This must match the path to your login endpoint: prefix + login_route = "/api/auth/login"
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme), 
-    db: Session = Depends(get_db)
-) -> User:
+    db: AsyncSession = Depends(get_db)
+) -> UserPublic:
     """
     Decodes the access token to get the current user.
     This function acts as a dependency to protect routes.
+
+    Verified tokens and user identities are cached briefly in process, so
+    hot tokens skip both JWT verification and the database round trip.
     """
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -46,16 +51,38 @@ def get_current_user(
         headers={"WWW-Authenticate": "Bearer"},
     )
 
-    # 1. Decode the token using the security utility function.
-    username = auth_security.decode_token(token)
+    # 1. Decode the token (or reuse a cached verification).
+    username = identity_cache.verify_token_cached(token)
     if username is None:
         raise credentials_exception
 
-    # 2. Retrieve the user from the database using the CRUD function.
-    user = crud_user.get_user_by_username(db, username=username)
+    # 2. Reuse the cached identity, or retrieve the user from the database.
+    user = identity_cache.get_cached_identity(username)
     if user is None:
-        # User not found in database (e.g., deleted after token was issued)
-        raise credentials_exception
-    
-    # 3. Return the authenticated user object.
-    return user
\ No newline at end of file
+        db_user = await crud_user.get_user_by_username(db, username=username)
+        if db_user is None:
+            # User not found in database (e.g., deleted after token was issued)
+            raise credentials_exception
+        user = UserPublic.model_validate(db_user)
+        identity_cache.cache_identity(user)
+
+    # 3. Return the authenticated user's public identity.
+    return user
+
+# --- Dependency 3: Shared HTTP Client ---
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    """
+    Returns the application-lifetime HTTP client created on startup
+    (see the lifespan handler in app/main.py).
+    """
+    return request.app.state.http_client
+
+# --- Dependency 4: Import Workers ---
+
+def get_import_workers(request: Request) -> Optional[ImportWorkerPool]:
+    """
+    Returns the in-process import worker pool, or None when the workers
+    run in a separate process.
+    """
+    return request.app.state.import_workers
@@ -1,14 +1,64 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from app.core.config import STATIC_DIR, TEMPLATES_DIR
 from fastapi.middleware.cors import CORSMiddleware
+from app.core.compression import CompressionMiddleware
 from app.routes.auth import base
 from app.routes.packages import packages
-app = FastAPI()
+from app.routes.metrics import base as metrics
+from app.routes.index import base as index
+from app.routes.hooks import base as hooks
+from app.routes.resolve import base as resolve
+from app.core.config import settings
+from app.database.database import SQLITE_PRAGMAS, AsyncSessionLocal
+from app.auth.hashing import password_hasher
+from app.services.catalogue_index import catalogue_index
+from app.services.http import create_http_client
+from app.workers.imports import ImportWorkerPool
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    print(f"Database profile: {settings.DATABASE_PROFILE} {SQLITE_PRAGMAS or ''}".rstrip())
+
+    # One pooled HTTP client for every outbound VCS call, reused across requests
+    app.state.http_client = create_http_client()
+
+    # bcrypt runs in its own processes so logins cannot starve the request path
+    password_hasher.start()
+
+    # Warm the catalogue index from its snapshot, then catch up with the database
+    if catalogue_index is not None:
+        catalogue_index.load()
+        async with AsyncSessionLocal() as db:
+            await catalogue_index.sync(db)
+        catalogue_index.save()
+
+    # Package imports run on background workers, unless they live in their own process
+    app.state.import_workers = None
+    if settings.IMPORT_WORKERS_IN_PROCESS:
+        app.state.import_workers = ImportWorkerPool(app.state.http_client)
+        await app.state.import_workers.start()
+    try:
+        yield
+    finally:
+        if app.state.import_workers is not None:
+            await app.state.import_workers.stop()
+        await app.state.http_client.aclose()
+        password_hasher.stop()
+        if catalogue_index is not None:
+            catalogue_index.save()
+
+app = FastAPI(lifespan=lifespan)
 
 app.include_router(base.router)
 app.include_router(packages.router)
+app.include_router(index.router)
+app.include_router(hooks.router)
+app.include_router(resolve.router)
+app.include_router(metrics.router)
 origins = [
     "http://localhost:3000",  # Your Next.js development server URL
     # "https://your-nextjs-app.com", 
@@ -22,6 +72,10 @@ app.add_middleware(
     allow_headers=["*"],          # Allow all headers
 )
 
+# gzip / brotli / zstd, negotiated per request from Accept-Encoding
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware)
+
 
 app.mount("/static", StaticFiles(directory=STATIC_DIR), name="static")
 templates = Jinja2Templates(directory=TEMPLATES_DIR)
@@ -2,13 +2,14 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app import dependencies as deps
 from app.crud import user as crud_user
 from app.schemas import user as user_schema
 from app.schemas import token as token_schema
 from app.auth import security as auth_security
+from app.auth.hashing import HashingOverloadedException, password_hasher
 from app.core.routes_version1 import Routes # Your route configuration class
 
 router = APIRouter(
@@ -16,15 +17,23 @@ router = APIRouter(
     tags=["Authentication"]
 )
 
+def _hashing_overloaded() -> HTTPException:
+    # The password hashing pool is saturated; ask the client to back off
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many concurrent authentication requests, retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
 # --- Registration Endpoint ---
 @router.post(
     Routes.Auth.register,
     response_model=user_schema.UserPublic,
     status_code=status.HTTP_201_CREATED
 )
-def register_user(
+async def register_user(
     user_in: user_schema.UserCreate, 
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Create a new user account.
@@ -32,7 +41,7 @@ def register_user(
     - Hashes password before storing.
     """
     # 1. Check if user already exists
-    existing_user = crud_user.get_user_by_username(db, username=user_in.username)
+    existing_user = await crud_user.get_user_by_username(db, username=user_in.username)
     if existing_user:
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
@@ -40,28 +49,44 @@ def register_user(
         )
     
     # 2. Create new user
-    user = crud_user.create_user(db=db, user=user_in)
+    try:
+        user = await crud_user.create_user(db=db, user=user_in)
+    except HashingOverloadedException:
+        raise _hashing_overloaded()
     return user
 
 # --- Login Endpoint ---
 @router.post(Routes.Auth.login, response_model=token_schema.Token)
-def login_for_access_token(
+async def login_for_access_token(
     login: user_schema.LoginRequest, 
-    db: Session = Depends(deps.get_db)
+    db: AsyncSession = Depends(deps.get_db)
 ):
     """
     Authenticate user and return access and refresh tokens.
     """
     # 1. Authenticate user
-    user = crud_user.get_user_by_username(db, username=login.username)
-    if not user or not auth_security.verify_password(login.password, user.hashed_password):
+    user = await crud_user.get_user_by_username(db, username=login.username)
+    verified, new_hash = False, None
+    if user:
+        # bcrypt verification is CPU-bound, so it runs on the password hashing pool
+        try:
+            verified, new_hash = await password_hasher.verify_and_update(
+                login.password, user.hashed_password
+            )
+        except HashingOverloadedException:
+            raise _hashing_overloaded()
+    if not verified:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect username or password",
             headers={"WWW-Authenticate": "Bearer"},
         )
     
-    # 2. Create tokens
+    # 2. Transparently upgrade hashes made with an outdated cost factor
+    if new_hash:
+        await crud_user.update_password_hash(db, user=user, hashed_password=new_hash)
+
+    # 3. Create tokens
     token_data = {"sub": user.username}
     access_token = auth_security.create_access_token(data=token_data)
     refresh_token = auth_security.create_refresh_token(data=token_data)
@@ -81,7 +106,7 @@ def read_users_me(current_user: user_schema.UserPublic = Depends(deps.get_curren
     """
     return current_user
 
-    # --- Refresh Token Endpoint ---
+# --- Refresh Token Endpoint ---
 @router.post(Routes.Auth.refresh, response_model=token_schema.Token)
 def refresh_access_token(
     current_user: user_schema.UserPublic = Depends(deps.get_current_user),
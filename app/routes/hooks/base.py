@@ -0,0 +1,95 @@
+# app/routes/hooks/base.py
+
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from sqlalchemy import select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import dependencies as deps
+from app.core.config import settings
+from app.core.routes_version1 import Routes
+from app.crud import jobs as crud_jobs
+from app.database.models.packages import Package
+from app.schemas.jobs import ImportJobOut
+from app.services.webhooks import EVENT_HEADER, SIGNATURE_HEADER, parse_tag_event, verify_signature
+from app.workers.imports import ImportWorkerPool
+
+router = APIRouter(
+    prefix=Routes.Hooks.root,
+    tags=["Hooks"]
+)
+
+@router.post(
+    Routes.Hooks.github,
+    response_model=ImportJobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    responses={
+        status.HTTP_204_NO_CONTENT: {"description": "Not a new tag of a registered package; ignored"},
+        status.HTTP_401_UNAUTHORIZED: {"description": "Missing or invalid signature"},
+        status.HTTP_503_SERVICE_UNAVAILABLE: {"description": "Webhooks are not configured"},
+    },
+)
+async def github_webhook(
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
+    import_workers: Optional[ImportWorkerPool] = Depends(deps.get_import_workers),
+):
+    """
+    Receives GitHub `create` and `push` deliveries signed with
+    GITHUB_WEBHOOK_SECRET. A new tag on a registered repository queues a
+    single-tag import job; everything else is acknowledged with 204.
+    Redeliveries are harmless: versions already stored are skipped.
+    """
+    if not settings.GITHUB_WEBHOOK_SECRET:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="GitHub webhooks are not configured.",
+        )
+
+    # The signature covers the exact bytes GitHub sent
+    body = await request.body()
+    if not verify_signature(settings.GITHUB_WEBHOOK_SECRET, body, request.headers.get(SIGNATURE_HEADER)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid webhook signature.",
+        )
+
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        # GitHub always delivers an object; anything else is not a webhook payload
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid JSON payload.")
+
+    event = parse_tag_event(request.headers.get(EVENT_HEADER), payload)
+    if event is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    repo_url = event.repo_url.rstrip("/")
+    package = await db.scalar(
+        select(Package).where(Package.repo_url.in_([repo_url, f"{repo_url}.git", f"{repo_url}/"]))
+    )
+    if package is None:
+        return Response(status_code=status.HTTP_204_NO_CONTENT)
+
+    # The rollback below expires `package`; reading it afterwards would need a lazy load
+    package_repo_url = package.repo_url
+    try:
+        job = await crud_jobs.enqueue_tag_job(db, package=package, tag=event.tag)
+    except IntegrityError:
+        # Another delivery enqueued a job for this repository concurrently
+        await db.rollback()
+        job = await crud_jobs.get_active_job_for_repo(db, package_repo_url)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An unexpected server error occurred.",
+            )
+
+    if import_workers is not None:
+        import_workers.notify()
+    return job
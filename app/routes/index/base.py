@@ -0,0 +1,114 @@
+# app/routes/index/base.py
+
+import asyncio
+
+from fastapi import APIRouter, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+
+from app.core.routes_version1 import Routes
+from app.database.database import AsyncSessionLocal
+from app.services.index_export import current_revision, encode_record, index_snapshot, iter_index_records
+
+router = APIRouter(
+    prefix=Routes.Index.root,
+    tags=["Index"]
+)
+
+# Highest revision contained in the response; pass it back as `since` next time
+REVISION_HEADER = "X-Catalogue-Revision"
+
+# Bytes read from the snapshot file per chunk of the download
+SNAPSHOT_CHUNK_SIZE = 64 * 1024
+
+@router.get(
+    Routes.Index.default,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "description": "One JSON object per line: a package with all its versions.",
+            "content": {"application/x-ndjson": {}},
+        },
+    },
+)
+async def stream_index(
+    since: int = Query(0, ge=0, description="Only packages changed after this catalogue revision"),
+):
+    """
+    ### Stream the whole catalogue as NDJSON 📚
+
+    Every line is a package with its versions and `dur.json` metadata, in
+    the order the packages last changed. Use the `X-Catalogue-Revision`
+    header (or the highest `revision` seen) as `since` to fetch only
+    packages changed afterwards.
+    """
+    # The session must outlive this handler, so the stream owns it
+    async with AsyncSessionLocal() as db:
+        revision = await current_revision(db)
+
+    async def body():
+        async with AsyncSessionLocal() as db:
+            async for record in iter_index_records(db, since=since):
+                if record["revision"] <= revision:
+                    yield encode_record(record)
+
+    return StreamingResponse(
+        body(),
+        media_type="application/x-ndjson",
+        headers={REVISION_HEADER: str(revision)},
+    )
+
+
+@router.get(
+    Routes.Index.snapshot,
+    response_class=StreamingResponse,
+    responses={
+        status.HTTP_200_OK: {
+            "description": "The gzip-compressed NDJSON snapshot.",
+            "content": {"application/gzip": {}},
+        },
+        status.HTTP_404_NOT_FOUND: {"description": "Snapshots are disabled"},
+    },
+)
+async def download_snapshot():
+    """
+    ### Download the compressed catalogue snapshot 🗜️
+
+    A gzip file of the same NDJSON lines as the streaming index, refreshed
+    after every import. It may contain several lines for one package; the
+    last one wins.
+    """
+    if index_snapshot is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Index snapshots are disabled.",
+        )
+
+    # State first: a snapshot replaced in between only makes the header understate
+    state = index_snapshot.read_state()
+    if state is None:
+        state = await index_snapshot.update()
+
+    # The open file stays the same even if an update replaces the snapshot
+    f, size = await asyncio.to_thread(index_snapshot.open)
+
+    async def body():
+        try:
+            remaining = size
+            while remaining > 0:
+                chunk = await asyncio.to_thread(f.read, min(SNAPSHOT_CHUNK_SIZE, remaining))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+                yield chunk
+        finally:
+            f.close()
+
+    return StreamingResponse(
+        body(),
+        media_type="application/gzip",
+        headers={
+            "Content-Length": str(size),
+            "Content-Disposition": 'attachment; filename="index.ndjson.gz"',
+            REVISION_HEADER: str(state["revision"]),
+        },
+    )
@@ -0,0 +1,48 @@
+# app/routes/metrics/base.py
+
+from typing import Optional
+
+from fastapi import APIRouter, HTTPException, status
+
+from app.auth import identity_cache
+from app.auth.hashing import password_hasher
+from app.core.cache import TTLCache, response_cache
+from app.core.compression import compressed_cache, compression_stats
+from app.core.config import settings
+from app.core.routes_version1 import Routes
+from app.services.catalogue_index import catalogue_index
+from app.services.github_cache import github_cache
+from app.services.github_scheduler import github_scheduler
+
+router = APIRouter(
+    prefix=Routes.Metrics.root,
+    tags=["Metrics"]
+)
+
+@router.get(
+    Routes.Metrics.default,
+    responses={status.HTTP_404_NOT_FOUND: {"description": "Metrics are disabled"}},
+)
+async def read_metrics():
+    """Reports in-process cache, pool and scheduler statistics, with null for disabled components."""
+    if not settings.METRICS_ENABLED:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Metrics are disabled.",
+        )
+
+    return {
+        "response_cache": _stats(response_cache),
+        "auth_token_cache": _stats(identity_cache.verified_tokens),
+        "auth_identity_cache": _stats(identity_cache.user_identities),
+        "password_hasher": password_hasher.stats(),
+        "github_cache": github_cache.stats() if github_cache is not None else None,
+        "github_scheduler": github_scheduler.stats(),
+        "compression": compression_stats.stats(),
+        "compressed_cache": _stats(compressed_cache),
+        "catalogue_index": catalogue_index.stats() if catalogue_index is not None else None,
+    }
+
+
+def _stats(cache: Optional[TTLCache]) -> Optional[dict]:
+    return cache.stats() if cache is not None else None
@@ -1,3 +0,0 @@
-
-from . import create
-from . import list_packages
@@ -1,21 +1,28 @@
 # routes/packages/create.py
 
-from app.routes.packages.packages import router
+from typing import Optional
 from app.core.routes_version1 import Routes
-from app.schemas.packages import PackageOut, PackageBase
-from fastapi import APIRouter, HTTPException, Request, Depends, status
+from app.schemas.packages import PackageBase
+from app.schemas.jobs import ImportJobOut
+import httpx
+from fastapi import APIRouter, HTTPException, Depends, status
 from app.schemas import user as user_schema
-from sqlalchemy.orm import Session
-from app.crud.packages import create_package as create, create_with_versions
-from sqlite3 import IntegrityError
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
 from app import dependencies as deps
+from app.crud import jobs as crud_jobs
+from app.database.models.packages import Package
+from app.services.catalogue_index import catalogue_index
 from app.services.factory import get_vcs_provider
-from app.services.providers import InvalidRepoException
+from app.workers.imports import ImportWorkerPool
+
+router = APIRouter()
 
 @router.post(
     Routes.Packages.default, 
-    response_model=PackageOut, 
-    status_code=status.HTTP_201_CREATED,
+    response_model=ImportJobOut, 
+    status_code=status.HTTP_202_ACCEPTED,
     responses={
         status.HTTP_409_CONFLICT: {
             "description": "Conflict Error",
@@ -38,53 +45,51 @@ from app.services.providers import InvalidRepoException
 async def create_package_route(
     data: PackageBase,
     current_user: user_schema.UserPublic = Depends(deps.get_current_user),
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_db),
+    http_client: httpx.AsyncClient = Depends(deps.get_http_client),
+    import_workers: Optional[ImportWorkerPool] = Depends(deps.get_import_workers),
 ):
     """
-    Create a new package by discovering all valid versions from its recipe repository.
-    ...
-    """
-    provider = get_vcs_provider(repo_url=data.repo_url)
-
-    try:
-        print(f"Discovering versions for {data.repo_url}...")
-        valid_versions = await provider.discover_and_parse_versions()
+    Submit a new package for import.
 
-        if not valid_versions:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No valid versions with a 'dur.json' file were found in the repository."
-            )
-        
-        print(f"Found {len(valid_versions)} valid versions to import.")
-        
-        new_package = create_with_versions(
-            db=db,
-            package_in=data,
-            versions_data=valid_versions,
-            user_id=current_user.id
-        )
-        return new_package
+    Version discovery runs on a background worker; the response is the import
+    job, whose progress can be followed at `GET /api/v1/packages/jobs/{job_id}`.
+    Submitting a repository that is already being imported returns the
+    existing job.
+    """
+    # Fail fast on unsupported providers or malformed repository URLs
+    get_vcs_provider(repo_url=data.repo_url, client=http_client)
 
-    except InvalidRepoException as e:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST, 
-            detail=str(e)
+    repo_url = str(data.repo_url)
+    if catalogue_index is not None:
+        await catalogue_index.sync(db)
+        existing = catalogue_index.exists(data.name, repo_url)
+    else:
+        existing = await db.scalar(
+            select(Package.id)
+            .where((Package.name == data.name) | (Package.repo_url == repo_url))
+            .limit(1)
         )
-    except IntegrityError:
-        db.rollback()
+    if existing:
         raise HTTPException(
             status_code=status.HTTP_409_CONFLICT,
             detail="Package with this name or repo_url already exists.",
         )
 
-    except HTTPException as e:
-        raise e
-    # -----------------------
-    except Exception as e:
-        db.rollback()
-        print(f"An unexpected error occurred: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected server error occurred.",
-        )
\ No newline at end of file
+    try:
+        job = await crud_jobs.get_active_job_for_repo(db, repo_url)
+        if job is None:
+            job = await crud_jobs.create_import_job(db, package_in=data, user_id=current_user.id)
+    except IntegrityError:
+        # Another request enqueued the same repository concurrently
+        await db.rollback()
+        job = await crud_jobs.get_active_job_for_repo(db, repo_url)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An unexpected server error occurred.",
+            )
+
+    if import_workers is not None:
+        import_workers.notify()
+    return job
@@ -0,0 +1,36 @@
+# routes/packages/jobs.py
+
+from app import dependencies as deps
+from app.core.routes_version1 import Routes
+from fastapi import APIRouter, HTTPException, Depends, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.crud import jobs as crud_jobs
+from app.schemas.jobs import ImportJobOut
+
+router = APIRouter()
+
+@router.get(
+    Routes.Packages.job,
+    response_model=ImportJobOut,
+    summary="Get the status of a package import job",
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Job not found"},
+    },
+)
+async def get_import_job(
+    job_id: int,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    ### Follow a package import ⏳
+
+    Reports the job status (`pending`, `running`, `succeeded`, `failed`),
+    discovery progress and, once finished, the created package id or error.
+    """
+    job = await crud_jobs.get_job(db, job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Import job '{job_id}' not found.",
+        )
+    return job
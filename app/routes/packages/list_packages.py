@@ -1,16 +1,57 @@
 # routes/packages/list_packages.py
 
-from typing import List
-from app.routes.packages.packages import router
+from typing import List, Optional
 from app import dependencies as deps
 from app.core.routes_version1 import Routes # Your route configuration class
-from fastapi import APIRouter, HTTPException, Query, Request, Depends, status
-from app.schemas import user as user_schema
-from app.schemas.package_version import PackageDetailOut
+from fastapi import APIRouter, HTTPException, Query, Request, Response, Depends, status
+from app.schemas.package_version import PackageDetailOut, PackageVersionOut
 
 from app.schemas.packages import PackageOut # Import the output schema
-from sqlalchemy.orm import Session
+from sqlalchemy import String, select, tuple_, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
 from app.database.models.packages import Package, PackageVersion
+from app.core.pagination import NEXT_CURSOR_HEADER, InvalidCursorException, decode_cursor, encode_cursor
+from app.core.cache import PACKAGE_LIST_TAG, package_tag, request_cache_key, response_cache
+from app.core.config import settings
+from app.core.etag import etag_matches, make_digest_etag, make_etag, not_modified
+from app.core.serialization import PACKAGE_FIELDS, VERSION_FIELDS, dumps, row_dict, schema_columns
+from app.services.catalogue_index import catalogue_index
+
+router = APIRouter()
+
+LATEST_PREFIX = "latest_"
+
+def _json_response(request: Request, body: bytes, headers: dict) -> Response:
+    """Sends `body`, or a 304 when the client already holds this ETag."""
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+async def _page_keys(db: AsyncSession, limit: int, skip: int, cursor: Optional[tuple]) -> list:
+    """Selects only the page's keys: enough for the ETag and the cursor."""
+    # created_at is compared as the raw stored text so the cursor matches
+    # exactly what SQLite indexed, independent of datetime formatting.
+    created_at_raw = type_coerce(Package.created_at, String)
+
+    query = select(Package.id, Package.revision, created_at_raw.label("created_at_raw"))
+    if cursor is not None:
+        query = query.where(tuple_(created_at_raw, Package.id) < tuple_(*cursor))
+
+    try:
+        result = await db.execute(
+            query
+            .order_by(Package.created_at.desc(), Package.id.desc())
+            .offset(skip)
+            .limit(limit)
+        )
+        return result.all()
+    except Exception as e:
+        print(f"Error fetching packages: {e}")
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="An unexpected error occurred while retrieving packages.",
+        )
 
 @router.get(
     Routes.Packages.default,
@@ -18,6 +59,7 @@ from app.database.models.packages import Package, PackageVersion
     summary="List all packages",
     response_description="A list of all registered packages.",
     responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Malformed pagination cursor"},
         status.HTTP_500_INTERNAL_SERVER_ERROR: {
             "description": "An unexpected error occurred on the server.",
             "content": {
@@ -29,32 +71,75 @@ from app.database.models.packages import Package, PackageVersion
     },
 )
 async def list_packages(
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
     skip: int = Query(0, ge=0, description="Number of records to skip"),
     limit: int = Query(25, ge=1, le=100, description="Max number of records to return"),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
 ):
     """
     ### List available packages with pagination 📦
 
     Retrieves a list of packages from the system, sorted from newest to oldest.
 
-    - Supports **pagination** using `skip` and `limit` query parameters.
+    - Supports **cursor pagination**: pass the `X-Next-Cursor` response header
+      of one page as `after` to fetch the next one. Each page costs the same
+      no matter how deep it is.
+    - `skip` is still supported for compatibility, but deep offsets are slow.
+    - Responses carry an `ETag`; send it back in `If-None-Match` to get a
+      `304 Not Modified` when the page is unchanged.
     """
-    try:
-        packages = (
-            db.query(Package)
-            .order_by(Package.created_at.desc())
-            .offset(skip)
-            .limit(limit)
-            .all()
-        )
-        return packages
-    except Exception as e:
-        print(f"Error fetching packages: {e}")
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="An unexpected error occurred while retrieving packages.",
-        )
+    cache_key = request_cache_key(request)
+    if response_cache is not None:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return _json_response(request, *cached)
+
+    cursor = None
+    if after is not None:
+        try:
+            cursor = decode_cursor(after, str, int)
+        except InvalidCursorException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    slots = None
+    if catalogue_index is not None:
+        # The page's keys come straight from the in-memory index
+        await catalogue_index.sync(db)
+        slots = catalogue_index.page(limit, skip, cursor)
+        rows = catalogue_index.keys(slots)
+    else:
+        rows = await _page_keys(db, limit, skip, cursor)
+
+    headers = {
+        "ETag": make_digest_etag((row.id, row.revision) for row in rows),
+        "Cache-Control": settings.CACHE_CONTROL_PACKAGE_LIST,
+    }
+    if len(rows) == limit:
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(rows[-1].created_at_raw, rows[-1].id)
+
+    # Unchanged page: answer before loading or serialising any package
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers)
+
+    if slots is not None:
+        packages = [catalogue_index.package(slot) for slot in slots]
+    else:
+        ids = [row.id for row in rows]
+        packages_by_id = {}
+        if ids:
+            # Plain rows of the response's columns, not ORM entities
+            result = await db.execute(
+                select(*schema_columns(PackageOut, Package)).where(Package.id.in_(ids))
+            )
+            packages_by_id = {row.id: row_dict(row, PACKAGE_FIELDS) for row in result}
+        packages = [packages_by_id[package_id] for package_id in ids if package_id in packages_by_id]
+
+    # Serialise once; cache hits then skip both the query and the encoding
+    body = dumps(packages)
+    if response_cache is not None:
+        response_cache.set(cache_key, (body, headers), tags=(PACKAGE_LIST_TAG,))
+    return _json_response(request, body, headers)
 
 
 
@@ -68,28 +153,70 @@ async def list_packages(
 )
 async def get_package(
     package_name: str,
-    db: Session = Depends(deps.get_db),
+    request: Request,
+    db: AsyncSession = Depends(deps.get_db),
 ):
     """
     ### Retrieve a single package by its unique name 🔎
 
     Fetches the complete details for a specific package, including the
     metadata for its most recently published version.
+
+    The `ETag` changes whenever the package or its versions do; send it back
+    in `If-None-Match` to get a `304 Not Modified`.
     """
-    package = db.query(Package).filter(Package.name == package_name).first()
+    cache_key = request_cache_key(request)
+    if response_cache is not None:
+        cached = response_cache.get(cache_key)
+        if cached is not None:
+            return _json_response(request, *cached)
 
-    if not package:
+    # Cheap key lookup first: enough to answer 404 or 304
+    slot = None
+    if catalogue_index is not None:
+        await catalogue_index.sync(db)
+        slot = catalogue_index.lookup(package_name)
+        key = catalogue_index.keys([slot])[0] if slot is not None else None
+    else:
+        key = (
+            await db.execute(
+                select(Package.id, Package.revision).where(Package.name == package_name)
+            )
+        ).first()
+
+    if not key:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Package '{package_name}' not found.",
         )
 
-    latest_version = (
-        db.query(PackageVersion)
-        .filter(PackageVersion.package_id == package.id)
-        .order_by(PackageVersion.published_at.desc())
-        .first()
-    )
-    package.latest_version = latest_version
+    headers = {
+        "ETag": make_etag(key.id, key.revision),
+        "Cache-Control": settings.CACHE_CONTROL_PACKAGE_DETAIL,
+    }
+    if etag_matches(request, headers["ETag"]):
+        return not_modified(headers)
+
+    if slot is not None:
+        package = catalogue_index.package_detail(slot)
+    else:
+        # Package and its latest version in a single joined query
+        latest = aliased(PackageVersion)
+        row = (
+            await db.execute(
+                select(
+                    *schema_columns(PackageOut, Package),
+                    *schema_columns(PackageVersionOut, latest, prefix=LATEST_PREFIX),
+                )
+                .outerjoin(latest, latest.id == Package.latest_version_id)
+                .where(Package.id == key.id)
+            )
+        ).one()
+        package = row_dict(row, PACKAGE_FIELDS)
+        latest_version = row_dict(row, VERSION_FIELDS, start=len(PACKAGE_FIELDS))
+        package["latest_version"] = latest_version if latest_version["version"] is not None else None
 
-    return package
\ No newline at end of file
+    body = dumps(package)
+    if response_cache is not None:
+        response_cache.set(cache_key, (body, headers), tags=(package_tag(package_name),))
+    return _json_response(request, body, headers)
\ No newline at end of file
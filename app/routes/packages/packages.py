@@ -1,7 +1,17 @@
 from fastapi import APIRouter
 from app.core.routes_version1 import Routes
+from app.routes.packages import create, jobs, list_packages, refresh, search, versions
 
 router = APIRouter(
     prefix=Routes.Packages.root,
     tags=['packages'],
-)
\ No newline at end of file
+)
+
+# Routes match in the order they are included: every fixed path (e.g.
+# '/search') must come before list_packages' catch-all '/{package_name}'
+router.include_router(create.router)
+router.include_router(jobs.router)
+router.include_router(refresh.router)
+router.include_router(versions.router)
+router.include_router(search.router)
+router.include_router(list_packages.router)
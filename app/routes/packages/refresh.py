@@ -0,0 +1,67 @@
+# routes/packages/refresh.py
+
+from typing import Optional
+from app.core.routes_version1 import Routes
+from app.schemas.jobs import ImportJobOut
+from fastapi import APIRouter, HTTPException, Depends, status
+from app.schemas import user as user_schema
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.exc import IntegrityError
+from app import dependencies as deps
+from app.crud import jobs as crud_jobs
+from app.database.models.packages import Package
+from app.workers.imports import ImportWorkerPool
+
+router = APIRouter()
+
+@router.post(
+    Routes.Packages.refresh,
+    response_model=ImportJobOut,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Import a package's new tags",
+    responses={
+        status.HTTP_404_NOT_FOUND: {"description": "Package not found"},
+    },
+)
+async def refresh_package(
+    package_name: str,
+    current_user: user_schema.UserPublic = Depends(deps.get_current_user),
+    db: AsyncSession = Depends(deps.get_db),
+    import_workers: Optional[ImportWorkerPool] = Depends(deps.get_import_workers),
+):
+    """
+    ### Pick up new releases 🔄
+
+    Queues a refresh job that lists the repository tags, probes only the ones
+    not imported yet and adds their versions in a single transaction. The
+    response is the job; follow it at `GET /api/v1/packages/jobs/{job_id}`.
+    If the repository already has a pending or running job, that job is
+    returned instead.
+    """
+    package = await db.scalar(select(Package).where(Package.name == package_name))
+    if not package:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Package '{package_name}' not found.",
+        )
+
+    # The rollback below expires `package`; reading it afterwards would need a lazy load
+    repo_url = package.repo_url
+    try:
+        job = await crud_jobs.get_active_job_for_repo(db, repo_url)
+        if job is None:
+            job = await crud_jobs.create_refresh_job(db, package=package, user_id=current_user.id)
+    except IntegrityError:
+        # Another refresh of the same repository was queued concurrently
+        await db.rollback()
+        job = await crud_jobs.get_active_job_for_repo(db, repo_url)
+        if job is None:
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail="An unexpected server error occurred.",
+            )
+
+    if import_workers is not None:
+        import_workers.notify()
+    return job
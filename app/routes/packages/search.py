@@ -0,0 +1,74 @@
+# routes/packages/search.py
+
+import re
+from typing import List
+from app import dependencies as deps
+from app.core.routes_version1 import Routes
+from fastapi import APIRouter, HTTPException, Query, Depends, status
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.schemas.packages import PackageOut
+from app.core.serialization import PACKAGE_FIELDS, json_response, row_dict
+
+router = APIRouter()
+
+# bm25 column weights: name, description, dur.json metadata.
+# Columns in PackageOut field order, so rows map straight onto it
+SEARCH_QUERY = text(
+    """
+    SELECT packages.name, packages.description, packages.repo_url, packages.license,
+           packages.homepage, packages.id, packages.created_by
+    FROM packages_fts
+    JOIN packages ON packages.id = packages_fts.rowid
+    WHERE packages_fts MATCH :match
+    ORDER BY bm25(packages_fts, 10.0, 3.0, 1.0)
+    LIMIT :limit OFFSET :skip
+    """
+)
+
+SEARCH_TERM_PATTERN = re.compile(r"\w+", re.UNICODE)
+
+
+def build_match_expression(q: str) -> str | None:
+    """
+    Turns free text into an FTS5 MATCH expression where every term must match
+    as a prefix, e.g. 'json pars' -> '"json"* "pars"*'. Quoting each term
+    keeps FTS5 operators in user input from being interpreted.
+    """
+    terms = SEARCH_TERM_PATTERN.findall(q)
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+@router.get(
+    Routes.Packages.search,
+    response_model=List[PackageOut],
+    summary="Search packages",
+    response_description="Packages matching the query, best match first.",
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "The query contains no searchable terms"},
+    },
+)
+async def search_packages(
+    q: str = Query(..., min_length=1, max_length=200, description="Search terms, matched as prefixes"),
+    db: AsyncSession = Depends(deps.get_db),
+    skip: int = Query(0, ge=0, description="Number of records to skip"),
+    limit: int = Query(25, ge=1, le=100, description="Max number of records to return"),
+):
+    """
+    ### Full-text search over the registry 🔍
+
+    Matches package names, descriptions and the names declared in their
+    `dur.json` files. Every term is matched as a prefix and results are
+    ranked with bm25, weighting name matches highest.
+    """
+    match = build_match_expression(q)
+    if match is None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Search query must contain at least one letter or digit.",
+        )
+
+    result = await db.execute(SEARCH_QUERY, {"match": match, "limit": limit, "skip": skip})
+    return json_response([row_dict(row, PACKAGE_FIELDS) for row in result])
@@ -0,0 +1,102 @@
+# routes/packages/versions.py
+
+from typing import List, Optional
+from app import dependencies as deps
+from app.core.routes_version1 import Routes
+from fastapi import APIRouter, HTTPException, Query, Depends, status
+from app.schemas.package_version import PackageVersionOut
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database.models.packages import Package, PackageVersion
+from app.core.config import settings
+from app.core.pagination import NEXT_CURSOR_HEADER, InvalidCursorException, decode_cursor, encode_cursor
+from app.core.serialization import VERSION_FIELDS, json_response, row_dict, schema_columns
+from app.core.versions import CONSTRAINT_OPERATORS, InvalidVersionConstraintException, parse_constraint
+from app.services.catalogue_index import catalogue_index
+
+router = APIRouter()
+
+@router.get(
+    Routes.Packages.versions,
+    response_model=List[PackageVersionOut],
+    summary="List the versions of a package",
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Malformed cursor or version constraint"},
+        status.HTTP_404_NOT_FOUND: {"description": "Package not found"},
+    },
+)
+async def list_package_versions(
+    package_name: str,
+    db: AsyncSession = Depends(deps.get_db),
+    limit: int = Query(25, ge=1, le=100, description="Max number of versions to return"),
+    after: Optional[str] = Query(None, description="Cursor from the previous page's X-Next-Cursor header"),
+    constraint: Optional[str] = Query(
+        None, description="Comma-separated version range, e.g. '>=1.2,<2'", examples=[">=1.2,<2"]
+    ),
+):
+    """
+    ### List a package's versions, highest first 🏷️
+
+    Versions are ordered by semantic version (then release), using the
+    sortable key stored with each version, so the order does not depend on
+    when a tag was imported.
+
+    - `constraint` filters by version range: `>=`, `>`, `<=`, `<`, `==`,
+      `!=`, comma-separated (all must hold). Pre-releases sort before their
+      release, so `<2` still includes `2.0.0-rc1`.
+    - Pagination is keyset-based: pass the `X-Next-Cursor` response header
+      as `after` to fetch the next page.
+    """
+    if catalogue_index is not None:
+        await catalogue_index.sync(db)
+        slot = catalogue_index.lookup(package_name)
+        package_id = catalogue_index.id[slot] if slot is not None else None
+    else:
+        package_id = await db.scalar(select(Package.id).where(Package.name == package_name))
+    if package_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Package '{package_name}' not found.",
+        )
+
+    sort_key = tuple_(PackageVersion.version_key, PackageVersion.release, PackageVersion.id)
+    # Plain rows of the response's columns plus the cursor's, not ORM entities
+    query = (
+        select(*schema_columns(PackageVersionOut, PackageVersion), PackageVersion.version_key, PackageVersion.id)
+        .where(PackageVersion.package_id == package_id)
+    )
+
+    # Range filters are plain comparisons on the indexed key
+    if constraint:
+        try:
+            clauses = parse_constraint(constraint)
+        except InvalidVersionConstraintException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        # Unparseable versions have the empty key, below every bound; they match no range
+        query = query.where(PackageVersion.version_key != "")
+        for op, key in clauses:
+            query = query.where(CONSTRAINT_OPERATORS[op](PackageVersion.version_key, key))
+
+    if after is not None:
+        try:
+            cursor = decode_cursor(after, str, int, int)
+        except InvalidCursorException as e:
+            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+        query = query.where(sort_key < tuple_(*cursor))
+
+    result = await db.execute(
+        query
+        .order_by(
+            PackageVersion.version_key.desc(),
+            PackageVersion.release.desc(),
+            PackageVersion.id.desc(),
+        )
+        .limit(limit)
+    )
+    rows = result.all()
+
+    headers = {"Cache-Control": settings.CACHE_CONTROL_PACKAGE_DETAIL}
+    if len(rows) == limit:
+        last = rows[-1]
+        headers[NEXT_CURSOR_HEADER] = encode_cursor(last.version_key, last.release, last.id)
+    return json_response([row_dict(row, VERSION_FIELDS) for row in rows], headers)
@@ -0,0 +1,72 @@
+# app/routes/resolve/base.py
+
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import dependencies as deps
+from app.core.routes_version1 import Routes
+from app.core.versions import InvalidVersionConstraintException
+from app.schemas.resolve import InstallPlan, ResolvedPackage, ResolveRequest
+from app.services.resolver import (
+    ResolutionException, UnknownPackageException, dependency_index, parse_requirement_constraint,
+)
+
+router = APIRouter(
+    prefix=Routes.Resolve.root,
+    tags=["Resolve"]
+)
+
+@router.post(
+    Routes.Resolve.default,
+    response_model=InstallPlan,
+    responses={
+        status.HTTP_400_BAD_REQUEST: {"description": "Malformed version constraint"},
+        status.HTTP_404_NOT_FOUND: {"description": "A required package does not exist"},
+        status.HTTP_409_CONFLICT: {"description": "The requirements cannot be satisfied together"},
+    },
+)
+async def resolve(
+    data: ResolveRequest,
+    db: AsyncSession = Depends(deps.get_db),
+):
+    """
+    ### Resolve an install plan 🧩
+
+    Takes a list of requirements (`name` plus an optional `constraint` such
+    as `>=1.2,<2`) and returns one version of every package needed,
+    following the `dependencies` declared in each version's dur.json. The
+    highest version satisfying all constraints is preferred, and the plan
+    is in install order: dependencies before the packages that need them.
+    """
+    try:
+        requirements = [
+            (requirement.name, parse_requirement_constraint(requirement.constraint))
+            for requirement in data.requirements
+        ]
+    except InvalidVersionConstraintException as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    # Pick up packages written since the last resolve (a single cheap query when nothing changed)
+    await dependency_index.sync(db)
+
+    try:
+        # CPU-bound search: off the event loop, so other requests keep flowing
+        plan = await asyncio.to_thread(dependency_index.resolve, requirements)
+    except UnknownPackageException as e:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except ResolutionException as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+
+    return InstallPlan(install=[
+        ResolvedPackage(
+            name=candidate.name,
+            version=candidate.version,
+            release=candidate.release,
+            git_tag=candidate.git_tag,
+            source_url=candidate.source_url,
+            dependencies={d.name: d.constraint for d in candidate.dependencies},
+        )
+        for candidate in plan
+    ])
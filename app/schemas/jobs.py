@@ -0,0 +1,22 @@
+# app/schemas/jobs.py
+
+from pydantic import BaseModel, ConfigDict
+from typing import Optional
+import datetime
+
+# --- Import Job Schema ---
+# Returned by the package submission endpoint (202) and the job status endpoint.
+class ImportJobOut(BaseModel):
+    id: int
+    kind: str
+    status: str
+    repo_url: str
+    package_id: Optional[int] = None
+    tags_discovered: int
+    versions_found: int
+    error: Optional[str] = None
+    created_at: datetime.datetime
+    started_at: Optional[datetime.datetime] = None
+    finished_at: Optional[datetime.datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
@@ -0,0 +1,27 @@
+# app/schemas/resolve.py
+
+from pydantic import BaseModel, Field
+from typing import Dict, List, Optional
+
+# --- Resolve Request ---
+class Requirement(BaseModel):
+    name: str
+    # Version range such as '>=1.2,<2'; empty or '*' accepts any version
+    constraint: Optional[str] = None
+
+class ResolveRequest(BaseModel):
+    requirements: List[Requirement] = Field(..., min_length=1)
+
+# --- Install Plan ---
+class ResolvedPackage(BaseModel):
+    name: str
+    version: str
+    release: int
+    git_tag: str
+    source_url: str
+    # Declared dependencies of this version: name -> constraint
+    dependencies: Dict[str, str] = {}
+
+class InstallPlan(BaseModel):
+    # Dependencies come before the packages that need them
+    install: List[ResolvedPackage]
@@ -28,4 +28,4 @@ class UserPublic(UserBase):
 
 class LoginRequest(BaseModel):
     username: str
-    password: str
\ No newline at end of file
+    password: str
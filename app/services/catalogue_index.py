@@ -0,0 +1,351 @@
+# app/services/catalogue_index.py
+"""
+Compact in-memory copy of the catalogue for the hot read paths: the package
+listing, package detail, and name / repo_url lookups.
+
+The data is stored by column instead of as one ORM object per package.
+- Integer columns (`id`, `revision`, `created_by`, ...) are `array('q')`.
+- Text columns are plain lists of strings.
+- Names and licenses are interned, so repeated values share one object.
+- A package is a "slot", i.e. a position in those columns.
+- `name -> slot` and `repo_url -> slot` dicts answer lookups.
+- `order` holds slots sorted by (created_at, id), the listing's keyset order,
+  so a page is a bisect plus a slice.
+
+`sync()` works like `DependencyIndex.sync`: it reloads only the packages whose
+`Package.revision` moved. It runs at most every
+CATALOGUE_INDEX_SYNC_INTERVAL_SECONDS, or immediately after a write in this
+process (`mark_stale`). Packages are never deleted, so upserts are enough.
+
+The index is persisted to a snapshot file.
+- Integer columns are raw array bytes, loaded back with one `frombytes` each.
+- Text columns are JSON arrays.
+- The header identifies the database by a SHA-256 of DATABASE_URL, so the
+  file never holds its credentials.
+- A cold start reads the snapshot into fresh columns (the index must stay
+  mutable for upserts, so nothing is served from the file itself) and then
+  catches up from the database with the same incremental sync.
+"""
+import asyncio
+import bisect
+import datetime
+import hashlib
+import json
+import os
+import struct
+import sys
+import time
+from array import array
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import String, func, select, type_coerce
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.database.models.packages import Package, PackageVersion
+
+SNAPSHOT_MAGIC = b"DURCIX01"
+# Magic, then the length of the JSON header that follows it
+SNAPSHOT_PREAMBLE = struct.Struct("<8sQ")
+
+INT_COLUMNS = ("id", "revision", "created_by", "latest_release")
+STR_COLUMNS = (
+    "name", "description", "repo_url", "license", "homepage", "created_at",
+    "latest_version", "latest_source_url", "latest_git_tag", "latest_published_at",
+)
+# Values repeated across packages, shared through sys.intern
+INTERNED_COLUMNS = ("name", "license", "latest_version", "latest_git_tag")
+# Past this many new packages in one sync, re-sort `order` once instead of inserting each
+ORDER_RESORT_THRESHOLD = 64
+
+
+class PackageKey(NamedTuple):
+    """What the listing needs before any body is built: ETag inputs and the cursor."""
+    id: int
+    revision: int
+    created_at_raw: str
+
+
+def _parse_datetime(value: Optional[str]) -> Optional[datetime.datetime]:
+    # Stored text as SQLite holds it, e.g. '2025-01-02 03:04:05.000006'
+    return None if value is None else datetime.datetime.fromisoformat(value)
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return None if value is None else sys.intern(value)
+
+
+def _database_digest() -> str:
+    """Identifies the database a snapshot was taken from without storing its URL."""
+    return hashlib.sha256(settings.DATABASE_URL.encode()).hexdigest()
+
+
+class CatalogueIndex:
+    """Column-oriented package catalogue, kept in step with the database."""
+
+    __slots__ = (
+        "path", "synced_revision", "synced_at", "stale", "by_name", "by_repo_url", "order",
+        "_lock", "_loop", "_saved_revision",
+    ) + INT_COLUMNS + STR_COLUMNS
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._reset()
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._saved_revision = 0
+
+    def _reset(self) -> None:
+        for column in INT_COLUMNS:
+            setattr(self, column, array("q"))
+        for column in STR_COLUMNS:
+            setattr(self, column, [])
+        self.by_name: Dict[str, int] = {}
+        self.by_repo_url: Dict[str, int] = {}
+        self.order = array("q")
+        self.synced_revision = 0
+        self.synced_at = 0.0
+        self.stale = True
+
+    def __len__(self) -> int:
+        return len(self.id)
+
+    # --- Reads ---
+
+    def lookup(self, name: str) -> Optional[int]:
+        """Slot of the package called `name`, or None."""
+        return self.by_name.get(name)
+
+    def exists(self, name: str, repo_url: str) -> bool:
+        return name in self.by_name or repo_url in self.by_repo_url
+
+    def package(self, slot: int) -> dict:
+        """The fields of PackageOut for one slot, in schema order."""
+        return {
+            "name": self.name[slot],
+            "description": self.description[slot],
+            "repo_url": self.repo_url[slot],
+            "license": self.license[slot],
+            "homepage": self.homepage[slot],
+            "id": self.id[slot],
+            "created_by": self.created_by[slot],
+        }
+
+    def package_detail(self, slot: int) -> dict:
+        """The fields of PackageDetailOut for one slot."""
+        detail = self.package(slot)
+        detail["latest_version"] = None
+        if self.latest_version[slot] is not None:
+            detail["latest_version"] = {
+                "version": self.latest_version[slot],
+                "release": self.latest_release[slot],
+                "source_url": self.latest_source_url[slot],
+                "git_tag": self.latest_git_tag[slot],
+                "published_at": _parse_datetime(self.latest_published_at[slot]),
+            }
+        return detail
+
+    def _order_key(self, slot: int) -> Tuple[str, int]:
+        return (self.created_at[slot], self.id[slot])
+
+    def page(self, limit: int, skip: int = 0, after: Optional[Tuple[str, int]] = None) -> List[int]:
+        """
+        Slots of one listing page, newest first: the same rows as
+        `ORDER BY created_at DESC, id DESC` with the keyset cursor `after`
+        and `OFFSET skip`.
+        """
+        end = len(self.order)
+        if after is not None:
+            end = bisect.bisect_left(self.order, tuple(after), key=self._order_key)
+        end -= skip
+        if end <= 0:
+            return []
+        start = max(0, end - limit)
+        return self.order[start:end][::-1].tolist()
+
+    def keys(self, slots: List[int]) -> List[PackageKey]:
+        return [PackageKey(self.id[slot], self.revision[slot], self.created_at[slot]) for slot in slots]
+
+    # --- Writes ---
+
+    def _upsert(self, row) -> Optional[int]:
+        """Writes one package's columns; returns its slot if it is new."""
+        slot = self.by_repo_url.get(row.repo_url)
+        if slot is None:
+            slot = self.by_name.get(row.name)
+        values = {
+            "id": row.id,
+            "revision": row.revision,
+            "created_by": row.created_by,
+            "latest_release": row.latest_release if row.latest_release is not None else 0,
+            "name": sys.intern(row.name),
+            "description": row.description,
+            "repo_url": row.repo_url,
+            "license": _intern(row.license),
+            "homepage": row.homepage,
+            "created_at": row.created_at,
+            "latest_version": _intern(row.latest_version),
+            "latest_source_url": row.latest_source_url,
+            "latest_git_tag": _intern(row.latest_git_tag),
+            "latest_published_at": row.latest_published_at,
+        }
+        if slot is None:
+            slot = len(self.id)
+            for column, value in values.items():
+                getattr(self, column).append(value)
+            new = slot
+        else:
+            for column, value in values.items():
+                getattr(self, column)[slot] = value
+            new = None
+        self.by_name[values["name"]] = slot
+        self.by_repo_url[row.repo_url] = slot
+        return new
+
+    def mark_stale(self) -> None:
+        """Makes the next read sync, e.g. right after a write in this process."""
+        self.stale = True
+
+    def _get_lock(self) -> asyncio.Lock:
+        # asyncio primitives are bound to one loop; rebuild if the loop changed
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Loads the packages changed since the last sync, unless synced very recently."""
+        if not self.stale and time.monotonic() - self.synced_at < settings.CATALOGUE_INDEX_SYNC_INTERVAL_SECONDS:
+            return
+        async with self._get_lock():
+            if not self.stale and time.monotonic() - self.synced_at < settings.CATALOGUE_INDEX_SYNC_INTERVAL_SECONDS:
+                return
+            self.stale = False
+            latest = await db.scalar(select(func.coalesce(func.max(Package.revision), 0)))
+            if latest < self.synced_revision:
+                # The database went backwards (restored or recreated): start over
+                self._reset()
+                self.stale = False
+            if latest > self.synced_revision:
+                await self._load(db, self.synced_revision, latest)
+                self.synced_revision = latest
+            self.synced_at = time.monotonic()
+
+    async def _load(self, db: AsyncSession, since: int, until: int) -> None:
+        latest = aliased(PackageVersion)
+        result = await db.stream(
+            select(
+                Package.id, Package.name, Package.description, Package.repo_url,
+                Package.license, Package.homepage, Package.created_by, Package.revision,
+                # Raw stored text, exactly what the listing cursor compares against
+                type_coerce(Package.created_at, String).label("created_at"),
+                latest.version.label("latest_version"),
+                latest.release.label("latest_release"),
+                latest.source_url.label("latest_source_url"),
+                latest.git_tag.label("latest_git_tag"),
+                type_coerce(latest.published_at, String).label("latest_published_at"),
+            )
+            .outerjoin(latest, latest.id == Package.latest_version_id)
+            .where(Package.revision > since, Package.revision <= until)
+            .execution_options(yield_per=1000)
+        )
+        added = []
+        async for row in result:
+            slot = self._upsert(row)
+            if slot is not None:
+                added.append(slot)
+
+        # created_at never changes, so only new packages move in `order`
+        if len(added) > ORDER_RESORT_THRESHOLD:
+            self.order.extend(added)
+            self.order = array("q", sorted(self.order, key=self._order_key))
+        else:
+            for slot in added:
+                bisect.insort(self.order, slot, key=self._order_key)
+
+    # --- Snapshot ---
+
+    def save(self) -> None:
+        """Writes the snapshot atomically, if anything changed since the last save."""
+        if self.synced_revision == self._saved_revision and self.path.exists():
+            return
+        chunks: List[bytes] = []
+        columns = []
+        offset = 0
+        for column in INT_COLUMNS + ("order",):
+            chunks.append(getattr(self, column).tobytes())
+            columns.append({"name": column, "kind": "int", "offset": offset, "size": len(chunks[-1])})
+            offset += len(chunks[-1])
+        for column in STR_COLUMNS:
+            chunks.append(json.dumps(getattr(self, column), separators=(",", ":")).encode())
+            columns.append({"name": column, "kind": "str", "offset": offset, "size": len(chunks[-1])})
+            offset += len(chunks[-1])
+        header = json.dumps({
+            "revision": self.synced_revision,
+            "count": len(self),
+            "byteorder": sys.byteorder,
+            "database_sha256": _database_digest(),
+            "columns": columns,
+        }).encode()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp, "wb") as out:
+            out.write(SNAPSHOT_PREAMBLE.pack(SNAPSHOT_MAGIC, len(header)))
+            out.write(header)
+            for chunk in chunks:
+                out.write(chunk)
+        os.replace(tmp, self.path)
+        self._saved_revision = self.synced_revision
+
+    def load(self) -> bool:
+        """Replaces the index with the snapshot on disk. False if there is no usable one."""
+        try:
+            with open(self.path, "rb") as f:
+                # Slices of a memoryview, so each column is copied only into its array or list
+                data = memoryview(f.read())
+            magic, header_size = SNAPSHOT_PREAMBLE.unpack_from(data, 0)
+            if magic != SNAPSHOT_MAGIC:
+                return False
+            base = SNAPSHOT_PREAMBLE.size + header_size
+            header = json.loads(bytes(data[SNAPSHOT_PREAMBLE.size:base]))
+            if header["database_sha256"] != _database_digest():
+                return False
+
+            self._reset()
+            for column in header["columns"]:
+                start = base + column["offset"]
+                chunk = data[start:start + column["size"]]
+                if column["kind"] == "int":
+                    values = array("q")
+                    values.frombytes(chunk)
+                    if header["byteorder"] != sys.byteorder:
+                        values.byteswap()
+                else:
+                    values = json.loads(bytes(chunk))
+                    if column["name"] in INTERNED_COLUMNS:
+                        values = [_intern(value) for value in values]
+                setattr(self, column["name"], values)
+        except (OSError, ValueError, KeyError, struct.error):
+            self._reset()
+            return False
+
+        self.by_name = {name: slot for slot, name in enumerate(self.name)}
+        self.by_repo_url = {repo_url: slot for slot, repo_url in enumerate(self.repo_url)}
+        self.synced_revision = self._saved_revision = header["revision"]
+        return True
+
+    def stats(self) -> dict:
+        return {
+            "packages": len(self),
+            "revision": self.synced_revision,
+            "seconds_since_sync": round(time.monotonic() - self.synced_at, 3) if self.synced_at else None,
+        }
+
+
+catalogue_index: Optional[CatalogueIndex] = (
+    CatalogueIndex(settings.CATALOGUE_INDEX_PATH) if settings.CATALOGUE_INDEX_ENABLED else None
+)
@@ -1,21 +1,22 @@
 # app/services/factory.py
+import httpx
 from fastapi import HTTPException, status
 from pydantic import HttpUrl
 
 from .providers import VCSProviderBase, InvalidRepoException
 from .github import GithubService
 
-def get_vcs_provider(repo_url: HttpUrl) -> VCSProviderBase:
+def get_vcs_provider(repo_url: HttpUrl, client: httpx.AsyncClient) -> VCSProviderBase:
     """
     Factory function that returns the correct VCS provider instance
-    based on the repository URL.
+    based on the repository URL, bound to the shared HTTP client.
     """
     try:
         if "github.com" in str(repo_url):
-            return GithubService(repo_url=repo_url)
+            return GithubService(repo_url=repo_url, client=client)
         # In the future, you'd add:
         # elif "gitlab.com" in str(repo_url):
-        #     return GitlabService(repo_url=repo_url)
+        #     return GitlabService(repo_url=repo_url, client=client)
         else:
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
@@ -1,16 +1,23 @@
 # app/services/github.py
+import asyncio
 import json
 import httpx
 import re
-from typing import List
+from typing import AsyncIterator, Callable, Dict, List, Optional, Set, Tuple
 from pydantic import BaseModel, HttpUrl, ValidationError
 from app.core.config import settings # We'll add the GitHub token here next
-from .providers import VCSProviderBase, VersionInfo, InvalidRepoException
+from .providers import VCSProviderBase, VersionInfo, TagInfo, InvalidRepoException
+from .github_cache import CachedResponse, github_cache
+from .github_scheduler import RateLimitExceededException, github_scheduler
 
 # The GitHub API endpoint
 GITHUB_API_BASE_URL = "https://api.github.com"
 GITHUB_RAW_BASE_URL = "https://raw.githubusercontent.com"
 
+COMMIT_SHA_PATTERN = re.compile(r"^[0-9a-f]{40}$")
+# Largest page size the GitHub REST API accepts
+GITHUB_TAGS_PER_PAGE = 100
+
 
 # In app/services/providers.py
 class PackageMetadata(BaseModel):
@@ -18,6 +25,8 @@ class PackageMetadata(BaseModel):
     version: str
     release: int
     source: HttpUrl
+    # Runtime dependencies: package name -> version constraint ('>=1.2,<2', '' for any)
+    dependencies: Dict[str, str] = {}
 
 
 
@@ -35,115 +44,210 @@ class GithubService(VCSProviderBase):
             raise InvalidRepoException("Invalid GitHub repository URL format.")
         self.owner, self.repo_name = match.groups()
 
-    async def get_versions(self) -> List[VersionInfo]:
+    async def _get(self, url: str, headers: Optional[dict] = None, immutable: bool = False) -> httpx.Response:
+        """
+        Performs a GET through the persistent response cache.
+
+        Immutable URLs (addressed by a commit SHA) are answered from the cache
+        without touching the network; everything else is revalidated with
+        If-None-Match / If-Modified-Since. Network requests go through the
+        rate-limit-aware scheduler, which also supplies the access token.
+        """
+        request = self.client.build_request("GET", url, headers=headers)
+        if github_cache is None:
+            return await github_scheduler.send(self.client, request)
+
+        cached = await github_cache.get(url)
+        if cached is not None and cached.immutable:
+            return self._response_from_cache(cached, request)
+
+        if cached is not None:
+            if cached.etag:
+                request.headers["If-None-Match"] = cached.etag
+            if cached.last_modified:
+                request.headers["If-Modified-Since"] = cached.last_modified
+
+        response = await github_scheduler.send(self.client, request)
+        if response.status_code == 304 and cached is not None:
+            await github_cache.revalidated(url)
+            return self._response_from_cache(cached, request)
+
+        await github_cache.store(url, response, immutable)
+        return response
+
+    @staticmethod
+    def _response_from_cache(cached: CachedResponse, request: httpx.Request) -> httpx.Response:
+        headers = {}
+        if cached.etag:
+            headers["ETag"] = cached.etag
+        if cached.last_modified:
+            headers["Last-Modified"] = cached.last_modified
+        if cached.link:
+            headers["Link"] = cached.link
+        return httpx.Response(cached.status_code, content=cached.body, headers=headers, request=request)
+
+    @staticmethod
+    def _is_commit_sha(ref: str) -> bool:
+        return COMMIT_SHA_PATTERN.match(ref) is not None
+
+    def _api_headers(self) -> dict:
+        # Authorization is added per request by the scheduler's token pool
+        return {"Accept": "application/vnd.github.v3+json"}
+
+    async def iter_tags(self) -> AsyncIterator[TagInfo]:
+        """
+        Streams the repository tags page by page, following the `Link: next`
+        header so repositories with thousands of tags are fully enumerated
+        while only one page is held in memory at a time.
+        """
         if not self.owner or not self.repo_name:
             raise InvalidRepoException("Repo URL not parsed correctly.")
 
-        tags_url = f"{GITHUB_API_BASE_URL}/repos/{self.owner}/{self.repo_name}/tags"
-        headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "Authorization": f"token {settings.GITHUB_ACCESS_TOKEN}"
-        }
-
-        async with httpx.AsyncClient() as client:
+        next_url: Optional[str] = (
+            f"{GITHUB_API_BASE_URL}/repos/{self.owner}/{self.repo_name}/tags"
+            f"?per_page={GITHUB_TAGS_PER_PAGE}"
+        )
+        while next_url:
             try:
-                response = await client.get(tags_url, headers=headers)
+                response = await self._get(next_url, headers=self._api_headers())
                 response.raise_for_status() # Raises HTTPError for 4xx/5xx responses
             except httpx.HTTPStatusError as e:
                 if e.response.status_code == 404:
-                    raise InvalidRepoException("Repository not found on GitHub.")
+                    raise InvalidRepoException("Repository not found or access denied.")
                 else:
                     raise InvalidRepoException(f"GitHub API Error: {e.response.text}")
             except httpx.RequestError as e:
                 raise InvalidRepoException(f"Failed to connect to GitHub: {e}")
 
-        tags_data = response.json()
+            for tag in response.json():
+                tag_name = tag.get("name")
+                if tag_name:
+                    yield TagInfo(name=tag_name, commit_sha=tag.get("commit", {}).get("sha"))
+
+            next_url = response.links.get("next", {}).get("url")
+
+    async def get_versions(self) -> List[VersionInfo]:
         valid_versions: List[VersionInfo] = []
-        for tag in tags_data:
-            tag_name = tag.get("name")
-            if tag_name and self.is_valid_version_tag(tag_name):
-                valid_versions.append(VersionInfo(version_string=tag_name, git_tag=tag_name))
+        async for tag in self.iter_tags():
+            if self.is_valid_version_tag(tag.name):
+                valid_versions.append(VersionInfo(version_string=tag.name, git_tag=tag.name))
 
         return valid_versions
 
-    async def _get_tree_for_tag(self, tag_name: str, client: httpx.AsyncClient) -> List[str]:
-        """Helper method to fetch the file list for a specific tag."""
-        tree_url = f"{GITHUB_API_BASE_URL}/repos/{self.owner}/{self.repo_name}/git/trees/{tag_name}?recursive=1"
-        headers = {
-            "Accept": "application/vnd.github.v3+json",
-            "Authorization": f"token {settings.GITHUB_ACCESS_TOKEN}"
-        }
-        try:
-            response = await client.get(tree_url, headers=headers)
-            response.raise_for_status()
-            tree_data = response.json().get("tree", [])
-            return [item["path"] for item in tree_data]
-        except httpx.HTTPStatusError as e:
-            # If a tag doesn't have a valid tree (rare), we'll get a 404 or 409
-            print(f"Warning: Could not fetch tree for tag {tag_name}. Status: {e.response.status_code}")
-            return []
-
-    async def discover_and_parse_versions(self) -> List[ParsedVersion]:
+    async def discover_and_parse_versions(
+        self,
+        on_progress: Optional[Callable[[int, int], None]] = None,
+        skip_tags: Optional[Set[str]] = None,
+    ) -> List[ParsedVersion]:
         """
-        Efficiently discovers all tags, checks for 'dur.json' using the Git
-        Trees API, and then fetches and parses the file for valid versions.
+        Efficiently discovers all tags and probes each one for a root 'dur.json'
+        with a single raw-file request, parsing the file for valid versions.
+        Probing starts while later tag pages are still being fetched.
+
+        :param on_progress: Optional callback invoked with (tags processed,
+            versions found) after each tag, used to report import progress.
+        :param skip_tags: Tag names that are already imported; they are
+            neither probed nor counted, so a refresh only pays for new tags.
         """
-        if not self.owner or not self.repo_name:
-            raise InvalidRepoException("Repo URL not parsed correctly.")
+        # 1. Bound the number of tags in flight so a repo with thousands of
+        #    tags neither floods GitHub nor piles up pending tasks.
+        semaphore = asyncio.Semaphore(max(1, settings.GITHUB_MAX_CONCURRENCY))
+        results: List[Tuple[int, ParsedVersion]] = []
+        pending: Set[asyncio.Task] = set()
+
+        processed = 0
 
-        # 1. First, get all the tags for the repository
-        tags_url = f"{GITHUB_API_BASE_URL}/repos/{self.owner}/{self.repo_name}/tags"
-        headers = { "Authorization": f"token {settings.GITHUB_ACCESS_TOKEN}" }
-        
-        async with httpx.AsyncClient() as client:
+        async def process(index: int, tag: TagInfo) -> None:
+            nonlocal processed
             try:
-                response = await client.get(tags_url, headers=headers)
-                response.raise_for_status()
-                tags_data = response.json()
-            except httpx.HTTPStatusError:
-                raise InvalidRepoException("Repository not found or access denied.")
-
-            # 2. Now, efficiently process each tag
-            parsed_versions: List[ParsedVersion] = []
-            for tag in tags_data:
-                tag_name = tag.get("name")
-                if not tag_name:
-                    continue
+                result = await self._parse_tag(index, tag)
+                if result is not None:
+                    results.append(result)
+                processed += 1
+                if on_progress is not None:
+                    on_progress(processed, len(results))
+            finally:
+                semaphore.release()
 
-                # 3. Efficiently check if 'dur.json' exists using the Trees API
-                file_tree = await self._get_tree_for_tag(tag_name, client)
-                if "dur.json" not in file_tree:
-                    print(f"Skipping tag {tag_name}: dur.json not found in tree.")
-                    continue
-                
-                # 4. Only if it exists, fetch its content
-                try:
-                    content = await self.get_raw_file_content(tag_name, "dur.json")
-                    metadata_dict = json.loads(content)
-                    metadata = PackageMetadata(**metadata_dict)
-                    
-                    parsed_versions.append(
-                        ParsedVersion(git_tag=tag_name, metadata=metadata)
-                    )
-                    print(f"Successfully parsed dur.json for tag {tag_name}")
-                except (json.JSONDecodeError, ValidationError, InvalidRepoException) as e:
-                    print(f"Warning: Could not parse dur.json for tag {tag_name}. Reason: {e}")
+        try:
+            # 2. Consume tags as pages arrive
+            index = 0
+            async for tag in self.iter_tags():
+                if skip_tags and tag.name in skip_tags:
                     continue
+                await semaphore.acquire()
+                pending.add(asyncio.create_task(process(index, tag)))
+                index += 1
+
+                # Reap finished probes so unexpected errors surface early
+                done = {task for task in pending if task.done()}
+                pending -= done
+                for task in done:
+                    task.result()
+
+            await asyncio.gather(*pending)
+        except BaseException:
+            for task in pending:
+                task.cancel()
+            raise
+
+        # 5. Restore the original tag order returned by GitHub
+        results.sort(key=lambda item: item[0])
+        return [parsed for _, parsed in results]
+
+    async def _parse_tag(
+        self,
+        index: int,
+        tag: TagInfo,
+    ) -> Optional[Tuple[int, ParsedVersion]]:
+        """Checks a single tag for 'dur.json' and parses it, keeping its position."""
+        # 3. Probe for 'dur.json' directly instead of listing the whole tree;
+        #    a 404 simply means this tag is not a release.
+        try:
+            content = await self._fetch_raw_file(tag.ref, "dur.json")
+            if content is None:
+                print(f"Skipping tag {tag.name}: dur.json not found.")
+                return None
+
+            # 4. Parse the file we already have in hand
+            metadata_dict = json.loads(content)
+            metadata = PackageMetadata(**metadata_dict)
+        except RateLimitExceededException:
+            # Not a property of the tag: abort the import instead of skipping it
+            raise
+        except (json.JSONDecodeError, ValidationError, InvalidRepoException) as e:
+            print(f"Warning: Could not parse dur.json for tag {tag.name}. Reason: {e}")
+            return None
+
+        print(f"Successfully parsed dur.json for tag {tag.name}")
+        return index, ParsedVersion(git_tag=tag.name, metadata=metadata)
+
+    async def get_version_at_tag(self, tag: str) -> ParsedVersion:
+        """Fetches and parses 'dur.json' at a single tag, e.g. one announced by a webhook."""
+        content = await self.get_raw_file_content(tag, "dur.json")
+        try:
+            metadata = PackageMetadata(**json.loads(content))
+        except (json.JSONDecodeError, ValidationError) as e:
+            raise InvalidRepoException(f"Invalid dur.json at tag '{tag}': {e}")
+        return ParsedVersion(git_tag=tag, metadata=metadata)
 
-        return parsed_versions
+    async def _fetch_raw_file(self, ref: str, file_path: str) -> Optional[str]:
+        """Returns a file's raw content at `ref`, or None if it does not exist there."""
+        raw_url = f"{GITHUB_RAW_BASE_URL}/{self.owner}/{self.repo_name}/{ref}/{file_path}"
 
-    async def get_raw_file_content(self, tag: str, file_path: str) -> str:
-        """Fetches the raw content of a file from the repo at a specific tag."""
-        raw_url = f"{GITHUB_RAW_BASE_URL}/{self.owner}/{self.repo_name}/{tag}/{file_path}"
+        try:
+            response = await self._get(raw_url, immutable=self._is_commit_sha(ref))
+            if response.status_code == 404:
+                return None
+            response.raise_for_status() # Raise error for other 4xx/5xx
+            return response.text
+        except httpx.HTTPStatusError as e:
+            raise InvalidRepoException(f"GitHub API Error: {e.response.text}")
 
-        async with httpx.AsyncClient() as client:
-            try:
-                response = await client.get(raw_url)
-                response.raise_for_status() # Raise error for 4xx/5xx
-                return response.text
-            except httpx.HTTPStatusError as e:
-                if e.response.status_code == 404:
-                # Be specific: did the tag not exist or the file? For simplicity, we'll generalize.
-                    raise InvalidRepoException(f"File '{file_path}' not found at tag '{tag}'.")
-                else:
-                    raise InvalidRepoException(f"GitHub API Error: {e.response.text}")
\ No newline at end of file
+    async def get_raw_file_content(self, tag: str, file_path: str) -> str:
+        """Fetches the raw content of a file from the repo at a specific tag or commit SHA."""
+        content = await self._fetch_raw_file(tag, file_path)
+        if content is None:
+            # Be specific: did the tag not exist or the file? For simplicity, we'll generalize.
+            raise InvalidRepoException(f"File '{file_path}' not found at tag '{tag}'.")
+        return content
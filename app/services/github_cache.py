@@ -0,0 +1,168 @@
+# app/services/github_cache.py
+import asyncio
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+import httpx
+
+from app.core.config import settings
+
+# Writes between two prunes of old and surplus entries
+PRUNE_INTERVAL_WRITES = 100
+
+
+class CachedResponse(NamedTuple):
+    status_code: int
+    body: bytes
+    etag: Optional[str]
+    last_modified: Optional[str]
+    immutable: bool
+    # Pagination 'Link' header, needed to keep walking cached tag pages
+    link: Optional[str] = None
+
+
+class GithubResponseCache:
+    """
+    Persistent per-URL cache of GitHub responses.
+
+    Mutable resources (e.g. the tag list) are stored together with their
+    ETag / Last-Modified validators and revalidated with a conditional request;
+    a '304 Not Modified' does not count against the GitHub rate limit.
+    Resources addressed by a commit SHA never change, so they are marked
+    immutable and served straight from the cache without any request.
+
+    Entries older than `max_age_seconds` are dropped, and past `max_entries`
+    the least recently stored or revalidated ones go first. Pruning runs on
+    open and then every PRUNE_INTERVAL_WRITES writes.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        max_entries: int = settings.GITHUB_CACHE_MAX_ENTRIES,
+        max_age_seconds: float = settings.GITHUB_CACHE_MAX_AGE_SECONDS,
+    ):
+        self.path = path
+        self.max_entries = max(1, max_entries)
+        self.max_age_seconds = max_age_seconds
+        self._conn: Optional[sqlite3.Connection] = None
+        self._lock = threading.Lock()
+        self._writes = 0
+        self.hits = 0
+        self.revalidations = 0
+        self.misses = 0
+        self.pruned = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(self.path, check_same_thread=False)
+            self._conn.execute(
+                """
+                CREATE TABLE IF NOT EXISTS responses (
+                    url TEXT PRIMARY KEY,
+                    status_code INTEGER NOT NULL,
+                    body BLOB NOT NULL,
+                    etag TEXT,
+                    last_modified TEXT,
+                    immutable INTEGER NOT NULL DEFAULT 0,
+                    link TEXT,
+                    stored_at REAL NOT NULL
+                )
+                """
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+            self._prune(self._conn)
+            self._conn.commit()
+        return self._conn
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        expired = conn.execute(
+            "DELETE FROM responses WHERE stored_at < ?", (time.time() - self.max_age_seconds,)
+        ).rowcount
+        surplus = conn.execute(
+            "DELETE FROM responses WHERE url IN"
+            " (SELECT url FROM responses ORDER BY stored_at DESC LIMIT -1 OFFSET ?)",
+            (self.max_entries,),
+        ).rowcount
+        self.pruned += expired + surplus
+
+    def _get(self, url: str) -> Optional[CachedResponse]:
+        with self._lock:
+            row = self._connect().execute(
+                "SELECT status_code, body, etag, last_modified, immutable, link FROM responses WHERE url = ?",
+                (url,),
+            ).fetchone()
+        if row is None:
+            return None
+        return CachedResponse(row[0], bytes(row[1]), row[2], row[3], bool(row[4]), row[5])
+
+    def _set(self, url: str, entry: CachedResponse) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO responses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, entry.status_code, entry.body, entry.etag,
+                 entry.last_modified, int(entry.immutable), entry.link, time.time()),
+            )
+            self._writes += 1
+            if self._writes % PRUNE_INTERVAL_WRITES == 0:
+                self._prune(conn)
+            conn.commit()
+
+    def _touch(self, url: str) -> None:
+        with self._lock:
+            conn = self._connect()
+            conn.execute("UPDATE responses SET stored_at = ? WHERE url = ?", (time.time(), url))
+            conn.commit()
+
+    async def get(self, url: str) -> Optional[CachedResponse]:
+        """The entry for `url`, if any. An immutable entry is served as is, so it counts as a hit."""
+        entry = await asyncio.to_thread(self._get, url)
+        if entry is not None and entry.immutable:
+            self.hits += 1
+        return entry
+
+    async def set(self, url: str, entry: CachedResponse) -> None:
+        await asyncio.to_thread(self._set, url, entry)
+
+    async def revalidated(self, url: str) -> None:
+        """Records a '304 Not Modified' for `url`'s entry, which also keeps it from ageing out."""
+        self.revalidations += 1
+        await asyncio.to_thread(self._touch, url)
+
+    async def store(self, url: str, response: httpx.Response, immutable: bool) -> None:
+        """Records a response fetched in full, keeping it if it can be revalidated or never changes."""
+        self.misses += 1
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        # A missing file at a fixed commit stays missing, so 404s are cacheable too.
+        cacheable = (
+            (response.status_code == 200 and (immutable or etag or last_modified))
+            or (response.status_code == 404 and immutable)
+        )
+        if cacheable:
+            await self.set(
+                url,
+                CachedResponse(
+                    response.status_code, response.content, etag, last_modified, immutable,
+                    response.headers.get("Link"),
+                ),
+            )
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidations,
+            "misses": self.misses,
+            "pruned": self.pruned,
+            "max_entries": self.max_entries,
+        }
+
+
+github_cache: Optional[GithubResponseCache] = (
+    GithubResponseCache(settings.GITHUB_CACHE_PATH) if settings.GITHUB_CACHE_ENABLED else None
+)
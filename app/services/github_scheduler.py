@@ -0,0 +1,238 @@
+# app/services/github_scheduler.py
+import asyncio
+import math
+import random
+import time
+from typing import List, Optional
+
+import httpx
+
+from app.core.config import settings
+from .providers import InvalidRepoException
+
+# Requests to this host count against the REST API budget and carry a token
+GITHUB_API_HOST = "api.github.com"
+RETRYABLE_STATUS_CODES = {500, 502, 503, 504}
+
+
+class RateLimitExceededException(InvalidRepoException):
+    """Raised when every token is out of budget for longer than we are willing to wait."""
+    pass
+
+
+class TokenBudget:
+    """Last known REST API budget of one access token."""
+
+    def __init__(self, token: str):
+        self.token = token
+        self.limit: Optional[int] = None
+        # Unknown until the first response; treated as plenty
+        self.remaining: Optional[int] = None
+        self.reset_at = 0.0
+
+    def available(self, now: float) -> bool:
+        return self.remaining is None or self.remaining > 0 or now >= self.reset_at
+
+    def effective_remaining(self, now: float) -> float:
+        if self.remaining is None or now >= self.reset_at:
+            return math.inf
+        return self.remaining
+
+    def update(self, response: httpx.Response) -> None:
+        headers = response.headers
+        try:
+            if "X-RateLimit-Remaining" in headers:
+                self.remaining = int(headers["X-RateLimit-Remaining"])
+            if "X-RateLimit-Limit" in headers:
+                self.limit = int(headers["X-RateLimit-Limit"])
+            if "X-RateLimit-Reset" in headers:
+                self.reset_at = float(headers["X-RateLimit-Reset"])
+        except ValueError:
+            pass
+
+
+class GithubRequestScheduler:
+    """
+    Central gate for every outbound GitHub request.
+
+    - API requests are signed with whichever configured token has the most
+      remaining budget, as reported by the X-RateLimit-* headers.
+    - The number of requests in flight shrinks as the best remaining budget
+      drops below GITHUB_RATE_LIMIT_LOW_WATER, so a bulk import slows down
+      instead of exhausting the quota.
+    - 5xx responses, transport errors and secondary rate limits are retried
+      with jittered exponential backoff, honouring Retry-After.
+    - When every token is exhausted, requests wait for the earliest reset if
+      it is near enough, and otherwise fail with RateLimitExceededException.
+    """
+
+    def __init__(self, tokens: List[str]):
+        self.budgets = [TokenBudget(token) for token in tokens]
+        self.in_flight = 0
+        self.queued = 0
+        self.retries = 0
+        self.rate_limited = 0
+        self._condition: Optional[asyncio.Condition] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        # asyncio primitives are bound to one loop; rebuild if the loop changed
+        loop = asyncio.get_running_loop()
+        if self._condition is None or self._loop is not loop:
+            self._condition = asyncio.Condition()
+            self._loop = loop
+        return self._condition
+
+    def concurrency_limit(self) -> int:
+        """Requests allowed in flight, scaled down with the best remaining budget."""
+        maximum = max(1, settings.GITHUB_MAX_IN_FLIGHT)
+        low_water = settings.GITHUB_RATE_LIMIT_LOW_WATER
+        remaining = self._best_remaining()
+        if low_water <= 0 or remaining >= low_water:
+            return maximum
+        return max(1, math.ceil(maximum * remaining / low_water))
+
+    def _best_remaining(self) -> float:
+        if not self.budgets:
+            return math.inf
+        now = time.time()
+        return max(budget.effective_remaining(now) for budget in self.budgets)
+
+    def _pick_budget(self) -> Optional[TokenBudget]:
+        """The token with the most remaining quota, or None if all are exhausted."""
+        now = time.time()
+        available = [budget for budget in self.budgets if budget.available(now)]
+        if not available:
+            return None
+        return max(available, key=lambda budget: budget.effective_remaining(now))
+
+    async def _wait_for_budget(self) -> TokenBudget:
+        budget = self._pick_budget()
+        if budget is not None:
+            return budget
+
+        # Every token is spent: wait for the earliest reset, within reason
+        wait = min(b.reset_at for b in self.budgets) - time.time()
+        if wait > settings.GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS:
+            raise RateLimitExceededException(
+                f"GitHub rate limit exhausted; it resets in {int(wait)} seconds."
+            )
+        await asyncio.sleep(max(0.0, wait))
+        return self._pick_budget() or self.budgets[0]
+
+    async def send(self, client: httpx.AsyncClient, request: httpx.Request) -> httpx.Response:
+        """Sends `request` through the throttle, with token rotation and retries."""
+        condition = self._get_condition()
+        async with condition:
+            self.queued += 1
+            try:
+                await condition.wait_for(lambda: self.in_flight < self.concurrency_limit())
+            finally:
+                self.queued -= 1
+            self.in_flight += 1
+        try:
+            return await self._send_with_retries(client, request)
+        finally:
+            async with condition:
+                self.in_flight -= 1
+                condition.notify_all()
+
+    async def _send_with_retries(self, client: httpx.AsyncClient, request: httpx.Request) -> httpx.Response:
+        authenticated = request.url.host == GITHUB_API_HOST and bool(self.budgets)
+        attempt = 0
+        while True:
+            budget = None
+            if authenticated:
+                budget = await self._wait_for_budget()
+                request.headers["Authorization"] = f"token {budget.token}"
+
+            try:
+                response = await client.send(request)
+            except httpx.TransportError:
+                if attempt >= settings.GITHUB_MAX_RETRIES:
+                    raise
+                await self._backoff(attempt, None)
+                attempt += 1
+                continue
+
+            if budget is not None:
+                budget.update(response)
+
+            if response.status_code in (403, 429) and self._is_rate_limited(response):
+                self.rate_limited += 1
+                if attempt >= settings.GITHUB_MAX_RETRIES:
+                    return response
+                # Primary limit on this token: rotate to another one right away.
+                # A missing or stale reset time leaves the spent token
+                # "available", so only rotate if a different one is picked.
+                next_budget = self._pick_budget() if budget is not None and budget.remaining == 0 else None
+                if next_budget is not None and next_budget is not budget:
+                    await response.aclose()
+                    attempt += 1
+                    continue
+                await response.aclose()
+                await self._backoff(attempt, response)
+                attempt += 1
+                continue
+
+            if response.status_code in RETRYABLE_STATUS_CODES and attempt < settings.GITHUB_MAX_RETRIES:
+                await response.aclose()
+                await self._backoff(attempt, response)
+                attempt += 1
+                continue
+
+            return response
+
+    @staticmethod
+    def _is_rate_limited(response: httpx.Response) -> bool:
+        if response.status_code == 429 or "Retry-After" in response.headers:
+            return True
+        if response.headers.get("X-RateLimit-Remaining") == "0":
+            return True
+        # Secondary (abuse) limits are a 403 whose message says so
+        return b"rate limit" in response.content.lower()
+
+    async def _backoff(self, attempt: int, response: Optional[httpx.Response]) -> None:
+        self.retries += 1
+        delay = None
+        if response is not None and "Retry-After" in response.headers:
+            try:
+                delay = float(response.headers["Retry-After"])
+            except ValueError:
+                delay = None
+        if delay is None:
+            # Full jitter: uniform in [0, base * 2^attempt], capped
+            cap = min(
+                settings.GITHUB_BACKOFF_MAX_SECONDS,
+                settings.GITHUB_BACKOFF_BASE_SECONDS * (2 ** attempt),
+            )
+            delay = random.uniform(0, cap)
+        await asyncio.sleep(min(delay, settings.GITHUB_RATE_LIMIT_MAX_WAIT_SECONDS))
+
+    def stats(self) -> dict:
+        now = time.time()
+        return {
+            "tokens": [
+                {
+                    "remaining": budget.remaining,
+                    "limit": budget.limit,
+                    "resets_in_seconds": max(0, int(budget.reset_at - now)) if budget.reset_at else None,
+                }
+                for budget in self.budgets
+            ],
+            "concurrency_limit": self.concurrency_limit(),
+            "in_flight": self.in_flight,
+            "queued": self.queued,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+        }
+
+
+def _configured_tokens() -> List[str]:
+    tokens = [settings.GITHUB_ACCESS_TOKEN]
+    tokens += [token.strip() for token in settings.GITHUB_ACCESS_TOKENS.split(",")]
+    # Keep order, drop blanks and duplicates
+    return [token for token in dict.fromkeys(tokens) if token]
+
+
+github_scheduler = GithubRequestScheduler(_configured_tokens())
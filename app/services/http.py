@@ -0,0 +1,31 @@
+# app/services/http.py
+import importlib.util
+
+import httpx
+
+from app.core.config import settings
+
+
+def create_http_client() -> httpx.AsyncClient:
+    """
+    Builds the application-wide, connection-pooled HTTP client used by all
+    VCS providers. It is created once on startup and closed on shutdown.
+    """
+    limits = httpx.Limits(
+        max_connections=settings.HTTP_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY_SECONDS,
+    )
+    timeout = httpx.Timeout(
+        settings.HTTP_TIMEOUT_SECONDS,
+        connect=settings.HTTP_CONNECT_TIMEOUT_SECONDS,
+    )
+    # HTTP/2 needs the optional 'h2' package; fall back to HTTP/1.1 without it.
+    http2 = settings.HTTP2_ENABLED and importlib.util.find_spec("h2") is not None
+
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=limits,
+        timeout=timeout,
+        follow_redirects=True,
+    )
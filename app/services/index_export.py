@@ -0,0 +1,213 @@
+# app/services/index_export.py
+"""
+Bulk export of the catalogue as NDJSON: one line per package with all of
+its versions and their dur.json metadata.
+
+Records are produced from a single server-side cursor over packages joined
+to their versions, so memory stays flat regardless of catalogue size.
+Records are ordered by `Package.revision`; a client that remembers the
+highest revision it has seen can later ask only for what changed since.
+"""
+import asyncio
+import gzip
+import json
+import os
+import shutil
+from contextlib import asynccontextmanager
+from pathlib import Path
+from typing import AsyncIterator, BinaryIO, List, Optional, Tuple
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.database.database import AsyncSessionLocal
+from app.database.models.packages import Package, PackageVersion
+
+# Rows fetched per round-trip from the server-side cursor
+INDEX_STREAM_BATCH_SIZE = 1000
+
+# Encoded records handed to the compressing thread at a time
+SNAPSHOT_WRITE_BATCH_SIZE = 1000
+
+# How often a process waiting for another one's snapshot update retries the file lock
+SNAPSHOT_LOCK_POLL_SECONDS = 0.05
+
+
+async def current_revision(db: AsyncSession) -> int:
+    """The highest catalogue revision, i.e. the state an export reflects."""
+    return await db.scalar(select(func.coalesce(func.max(Package.revision), 0)))
+
+
+async def iter_index_records(db: AsyncSession, since: int = 0) -> AsyncIterator[dict]:
+    """Yields one record per package changed after revision `since`, oldest change first."""
+    query = (
+        select(
+            Package.id, Package.name, Package.description, Package.repo_url,
+            Package.license, Package.homepage, Package.revision, Package.latest_version_id,
+            PackageVersion.id.label("version_id"), PackageVersion.version, PackageVersion.release,
+            PackageVersion.source_url, PackageVersion.git_tag, PackageVersion.published_at,
+            PackageVersion.package_metadata,
+        )
+        .outerjoin(PackageVersion, PackageVersion.package_id == Package.id)
+        .where(Package.revision > since)
+        .order_by(Package.revision, PackageVersion.id)
+        .execution_options(yield_per=INDEX_STREAM_BATCH_SIZE)
+    )
+
+    record: Optional[dict] = None
+    result = await db.stream(query)
+    async for row in result:
+        if record is None or record["id"] != row.id:
+            if record is not None:
+                yield record
+            record = {
+                "id": row.id,
+                "name": row.name,
+                "description": row.description,
+                "repo_url": row.repo_url,
+                "license": row.license,
+                "homepage": row.homepage,
+                "revision": row.revision,
+                "latest_version": None,
+                "versions": [],
+            }
+        if row.version_id is None:
+            continue
+        record["versions"].append({
+            "version": row.version,
+            "release": row.release,
+            "source_url": row.source_url,
+            "git_tag": row.git_tag,
+            "published_at": row.published_at.isoformat() if row.published_at else None,
+            "metadata": row.package_metadata,
+        })
+        if row.version_id == row.latest_version_id:
+            record["latest_version"] = row.version
+
+    if record is not None:
+        yield record
+
+
+def encode_record(record: dict) -> bytes:
+    return json.dumps(record, separators=(",", ":")).encode() + b"\n"
+
+
+class IndexSnapshot:
+    """
+    A gzip-compressed NDJSON snapshot of the whole catalogue on disk.
+
+    After each import only the packages changed since the snapshot's revision
+    are appended, as an extra gzip member (gzip readers decompress all members
+    in sequence). A package may therefore appear more than once; the last line
+    for a package wins. The file is rebuilt from scratch after
+    INDEX_SNAPSHOT_MAX_APPENDS incremental updates to drop superseded lines.
+
+    Both rebuilds and appends write a temporary file that then replaces the
+    snapshot, so a download that already opened the file keeps reading a
+    complete one. Compression and file I/O run on a worker thread.
+
+    Updates are serialised by an asyncio lock within a process and by an
+    flock() on a sibling ".lock" file across processes, so API and worker
+    processes sharing the snapshot cannot interleave appends. Without fcntl
+    (Windows) only the in-process lock applies, and the snapshot must then be
+    updated by a single process.
+    """
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self.state_path = self.path.with_name(self.path.name + ".json")
+        self.lock_path = self.path.with_name(self.path.name + ".lock")
+        self._lock = asyncio.Lock()
+
+    @asynccontextmanager
+    async def _exclusive(self) -> AsyncIterator[None]:
+        """Holds the in-process lock and, where available, the cross-process file lock."""
+        async with self._lock:
+            if fcntl is None:
+                yield
+                return
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd = os.open(self.lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                # Non-blocking attempts, so waiting never stalls the event loop
+                while True:
+                    try:
+                        fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                        break
+                    except BlockingIOError:
+                        await asyncio.sleep(SNAPSHOT_LOCK_POLL_SECONDS)
+                yield
+            finally:
+                # Closing the descriptor releases the lock
+                os.close(fd)
+
+    def read_state(self) -> Optional[dict]:
+        if not self.path.exists() or not self.state_path.exists():
+            return None
+        try:
+            return json.loads(self.state_path.read_text())
+        except ValueError:
+            return None
+
+    def _write_state(self, revision: int, appends: int) -> None:
+        tmp = self.state_path.with_name(self.state_path.name + ".tmp")
+        tmp.write_text(json.dumps({"revision": revision, "appends": appends}))
+        os.replace(tmp, self.state_path)
+
+    def open(self) -> Tuple[BinaryIO, int]:
+        """The snapshot as an open file and its size, fixed even if the file is replaced meanwhile."""
+        f = open(self.path, "rb")
+        return f, os.fstat(f.fileno()).st_size
+
+    async def update(self) -> dict:
+        """Brings the snapshot up to date, rebuilding or appending as needed."""
+        async with self._exclusive():
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            state = self.read_state()
+            async with AsyncSessionLocal() as db:
+                revision = await current_revision(db)
+                if state is None or state["appends"] >= settings.INDEX_SNAPSHOT_MAX_APPENDS:
+                    await self._rebuild(db, revision)
+                    state = {"revision": revision, "appends": 0}
+                elif revision > state["revision"]:
+                    await self._append(db, state["revision"], revision)
+                    state = {"revision": revision, "appends": state["appends"] + 1}
+            self._write_state(**state)
+            return state
+
+    async def _rebuild(self, db: AsyncSession, revision: int) -> None:
+        await self._write(db, since=0, revision=revision, mode="wb")
+
+    async def _append(self, db: AsyncSession, since: int, revision: int) -> None:
+        await self._write(db, since=since, revision=revision, mode="ab")
+
+    async def _write(self, db: AsyncSession, since: int, revision: int, mode: str) -> None:
+        """Writes the records changed in (since, revision] into a copy of the snapshot, then swaps it in."""
+        tmp = self.path.with_name(self.path.name + ".tmp")
+        if mode == "ab":
+            await asyncio.to_thread(shutil.copyfile, self.path, tmp)
+        out = await asyncio.to_thread(gzip.open, tmp, mode)
+        try:
+            batch: List[bytes] = []
+            async for record in iter_index_records(db, since=since):
+                if record["revision"] <= revision:
+                    batch.append(encode_record(record))
+                if len(batch) >= SNAPSHOT_WRITE_BATCH_SIZE:
+                    await asyncio.to_thread(out.write, b"".join(batch))
+                    batch = []
+            if batch:
+                await asyncio.to_thread(out.write, b"".join(batch))
+        finally:
+            await asyncio.to_thread(out.close)
+        os.replace(tmp, self.path)
+
+
+index_snapshot: Optional[IndexSnapshot] = (
+    IndexSnapshot(settings.INDEX_SNAPSHOT_PATH) if settings.INDEX_SNAPSHOT_ENABLED else None
+)
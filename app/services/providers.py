@@ -1,14 +1,25 @@
 # app/services/providers.py
-import re
+import httpx
 from abc import ABC, abstractmethod
-from typing import List, Optional
+from typing import AsyncIterator, List, Optional
 from pydantic import BaseModel, HttpUrl
+from app.core.versions import SEMVER_TAG_PATTERN
 
 # A Pydantic model to standardize the version data we get back from any provider
 class VersionInfo(BaseModel):
     version_string: str
     git_tag: str
 
+# A single tag as enumerated from the provider, pinned to its commit when known
+class TagInfo(BaseModel):
+    name: str
+    commit_sha: Optional[str] = None
+
+    @property
+    def ref(self) -> str:
+        """The most specific ref for this tag: its commit SHA, falling back to the name."""
+        return self.commit_sha or self.name
+
 # Custom exception for clarity
 class InvalidRepoException(Exception):
     pass
@@ -17,8 +28,10 @@ class InvalidRepoException(Exception):
 class VCSProviderBase(ABC):
     """Abstract base class for a Version Control System provider."""
 
-    def __init__(self, repo_url: HttpUrl):
+    def __init__(self, repo_url: HttpUrl, client: httpx.AsyncClient):
         self.repo_url = repo_url
+        # Shared, application-lifetime HTTP client (see app/services/http.py)
+        self.client = client
         self.owner: Optional[str] = None
         self.repo_name: Optional[str] = None
         self._parse_url()
@@ -28,6 +41,14 @@ class VCSProviderBase(ABC):
         """Parses the repo_url to extract owner and repo name."""
         raise NotImplementedError
 
+    @abstractmethod
+    def iter_tags(self) -> AsyncIterator[TagInfo]:
+        """
+        Yields every tag of the repository, following pagination and yielding
+        each page as soon as it arrives so callers can start work early.
+        """
+        raise NotImplementedError
+
     @abstractmethod
     async def get_versions(self) -> List[VersionInfo]:
         """Fetches tags from the repository and returns them as a list of VersionInfo."""
@@ -39,6 +60,6 @@ class VCSProviderBase(ABC):
         A simple check for semantic-like versioning (e.g., v1.0.0, 1.0, 2.3.4-alpha).
         You can make this more strict if needed.
         """
-        # This regex matches patterns like: 1.0, 1.2.3, v1.2.3, 1.2.3-rc1
-        semver_pattern = re.compile(r'^v?(\d+)(\.\d+){1,2}(-[a-zA-Z0-9.-]+)?$')
-        return semver_pattern.match(tag_name) is not None
\ No newline at end of file
+        # This regex matches patterns like: 1.0, 1.2.3, v1.2.3, 1.2.3-rc1.
+        # It is shared with the sortable version keys (app/core/versions.py).
+        return SEMVER_TAG_PATTERN.match(tag_name) is not None
\ No newline at end of file
@@ -0,0 +1,314 @@
+# app/services/resolver.py
+"""
+Server-side dependency resolution over the `dependencies` declared in each
+version's dur.json (`PackageVersion.package_metadata`).
+
+`DependencyIndex` keeps every package's candidate versions and their parsed
+dependency constraints in memory. It is loaded once and then kept current
+incrementally: each resolve first asks for the catalogue's highest
+`Package.revision` and reloads only the packages written since, so imports,
+refreshes and webhook tags from any process are picked up.
+
+Resolving is CPU-bound, so callers run `resolve` on a worker thread. A sync
+publishes its changes as a new mapping in a single assignment, so a
+resolve in flight keeps working on the catalogue it started with.
+"""
+import asyncio
+import time
+from collections import defaultdict
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.versions import InvalidVersionConstraintException, parse_constraint, satisfies
+from app.database.models.packages import Package, PackageVersion
+
+# Upper bound on dead ends explored before a resolution is abandoned
+MAX_BACKTRACKS = 10_000
+# Wall-clock limit of one resolution, however few backtracks it needs
+RESOLVE_TIME_BUDGET_SECONDS = 2.0
+
+Clauses = Tuple[Tuple[str, str], ...]
+
+
+class ResolutionException(Exception):
+    """The requirements cannot be satisfied (unknown package, conflict or cycle)."""
+    pass
+
+
+class UnknownPackageException(ResolutionException):
+    pass
+
+
+class Dependency(NamedTuple):
+    name: str
+    constraint: str
+    # Parsed clauses; None when the declared constraint does not parse
+    clauses: Optional[Clauses]
+
+
+class _Decision(NamedTuple):
+    name: str
+    candidates: List["Candidate"]
+    index: int
+    # Undo log length, cursor and pending length before this decision
+    log_length: int
+    cursor: int
+    pending_length: int
+
+
+class Candidate(NamedTuple):
+    name: str
+    version: str
+    release: int
+    version_key: str
+    git_tag: str
+    source_url: str
+    dependencies: Tuple[Dependency, ...]
+
+
+def parse_requirement_constraint(constraint: Optional[str]) -> Clauses:
+    """Clauses of a constraint string; empty (any version) for '' / '*' / None."""
+    if not constraint or constraint.strip() in ("", "*"):
+        return ()
+    return tuple(parse_constraint(constraint))
+
+
+def _parse_dependencies(metadata: Optional[dict]) -> Tuple[Dependency, ...]:
+    declared = (metadata or {}).get("dependencies") or {}
+    if not isinstance(declared, dict):
+        return ()
+    dependencies = []
+    for name, constraint in declared.items():
+        constraint = constraint if isinstance(constraint, str) else ""
+        try:
+            clauses = parse_requirement_constraint(constraint)
+        except InvalidVersionConstraintException:
+            clauses = None
+        dependencies.append(Dependency(name, constraint, clauses))
+    return tuple(dependencies)
+
+
+class DependencyIndex:
+    """In-memory package -> candidate versions map, highest version first."""
+
+    def __init__(self):
+        # Replaced, never mutated, once published
+        self.packages: Dict[str, List[Candidate]] = {}
+        self.revision = 0
+        self._lock: Optional[asyncio.Lock] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def _get_lock(self) -> asyncio.Lock:
+        # asyncio primitives are bound to one loop; rebuild if the loop changed
+        loop = asyncio.get_running_loop()
+        if self._lock is None or self._loop is not loop:
+            self._lock = asyncio.Lock()
+            self._loop = loop
+        return self._lock
+
+    async def sync(self, db: AsyncSession) -> None:
+        """Loads the packages changed since the last sync (all of them the first time)."""
+        latest = await db.scalar(select(func.coalesce(func.max(Package.revision), 0)))
+        if latest <= self.revision:
+            return
+        # Concurrent resolves wait for one load instead of each running it
+        async with self._get_lock():
+            if latest > self.revision:
+                await self._load(db, latest)
+
+    async def _load(self, db: AsyncSession, latest: int) -> None:
+        result = await db.stream(
+            select(
+                Package.name, PackageVersion.version, PackageVersion.release,
+                PackageVersion.version_key, PackageVersion.git_tag,
+                PackageVersion.source_url, PackageVersion.package_metadata,
+            )
+            .outerjoin(PackageVersion, PackageVersion.package_id == Package.id)
+            .where(Package.revision > self.revision, Package.revision <= latest)
+            .execution_options(yield_per=1000)
+        )
+        changed: Dict[str, List[Candidate]] = defaultdict(list)
+        async for row in result:
+            candidates = changed[row.name]
+            if row.version is not None:
+                candidates.append(Candidate(
+                    row.name, row.version, row.release, row.version_key, row.git_tag,
+                    row.source_url, _parse_dependencies(row.package_metadata),
+                ))
+        packages = dict(self.packages)
+        for name, candidates in changed.items():
+            candidates.sort(key=lambda c: (c.version_key, c.release), reverse=True)
+            packages[name] = candidates
+        self.packages = packages
+        self.revision = latest
+
+    def resolve(self, requirements: List[Tuple[str, Clauses]]) -> List[Candidate]:
+        """
+        Picks one version per package so that every requirement and every
+        declared dependency holds, preferring the highest versions, and
+        returns them in install order (dependencies first).
+        """
+        # One consistent catalogue for the whole resolution
+        packages = self.packages
+        chosen = self._select(packages, requirements)
+        roots = [name for name, _ in requirements]
+        return self._install_order(roots, chosen)
+
+    def _select(
+        self, packages: Dict[str, List[Candidate]], requirements: List[Tuple[str, Clauses]],
+    ) -> Dict[str, Candidate]:
+        """
+        Backtracking search. Packages are decided in the order they are first
+        required; each takes the highest version that satisfies every
+        constraint placed on it and whose own dependencies agree with what is
+        already decided. A dead end undoes the most recent decision and tries
+        that package's next-best version.
+        """
+        # name -> {source: clauses}; the root requirements have source None
+        constraints: Dict[str, Dict[Optional[str], Clauses]] = defaultdict(dict)
+        for name, clauses in requirements:
+            if name not in packages:
+                raise UnknownPackageException(f"Unknown package '{name}'.")
+            constraints[name][None] = constraints[name].get(None, ()) + tuple(clauses)
+
+        chosen: Dict[str, Candidate] = {}
+        pending: List[str] = [name for name, _ in requirements]
+        # Undo log of (package, source) pairs: source None marks a decision
+        log: List[Tuple[str, Optional[str]]] = []
+        decisions: List[_Decision] = []
+        first_failure: Optional[ResolutionException] = None
+        cursor = 0
+        backtracks = 0
+        deadline = time.monotonic() + RESOLVE_TIME_BUDGET_SECONDS
+
+        def decide(name: str, candidate: Candidate) -> None:
+            chosen[name] = candidate
+            log.append((name, None))
+            for dependency in candidate.dependencies:
+                constraints[dependency.name][name] = dependency.clauses
+                log.append((dependency.name, name))
+                pending.append(dependency.name)
+
+        while True:
+            while cursor < len(pending) and pending[cursor] in chosen:
+                cursor += 1
+            if cursor == len(pending):
+                return chosen
+
+            if time.monotonic() > deadline:
+                raise ResolutionException(
+                    f"Resolution gave up after {RESOLVE_TIME_BUDGET_SECONDS:g} seconds."
+                )
+            name = pending[cursor]
+            candidates, failure = self._candidates(packages, name, constraints[name], chosen)
+            if candidates:
+                decisions.append(_Decision(name, candidates, 0, len(log), cursor, len(pending)))
+                decide(name, candidates[0])
+                continue
+
+            first_failure = first_failure or failure
+            backtracks += 1
+            if backtracks > MAX_BACKTRACKS:
+                raise first_failure
+            # Dead end: move the most recent decision that still has options
+            while decisions:
+                decision = decisions[-1]
+                while len(log) > decision.log_length:
+                    package, source = log.pop()
+                    if source is None:
+                        del chosen[package]
+                    else:
+                        del constraints[package][source]
+                del pending[decision.pending_length:]
+                cursor = decision.cursor
+                if decision.index + 1 < len(decision.candidates):
+                    decisions[-1] = decision._replace(index=decision.index + 1)
+                    decide(decision.name, decision.candidates[decision.index + 1])
+                    break
+                decisions.pop()
+            else:
+                raise first_failure
+
+    def _candidates(
+        self,
+        packages: Dict[str, List[Candidate]],
+        name: str,
+        constraints: Dict[Optional[str], Clauses],
+        chosen: Dict[str, Candidate],
+    ) -> Tuple[List[Candidate], Optional[ResolutionException]]:
+        """
+        Versions of `name` allowed by its constraints whose dependencies are
+        consistent with the packages already chosen, best first. When there
+        are none, also returns the reason.
+        """
+        if name not in packages:
+            required_by = ", ".join(sorted(s for s in constraints if s))
+            return [], UnknownPackageException(f"Unknown package '{name}' (required by {required_by}).")
+
+        allowed = [
+            candidate for candidate in packages[name]
+            if all(satisfies(candidate.version_key, clauses) for clauses in constraints.values())
+        ]
+        if not allowed:
+            sources = sorted("the request" if s is None else s for s in constraints)
+            return [], ResolutionException(
+                f"No version of '{name}' satisfies all constraints (from {', '.join(sources)})."
+            )
+
+        viable = []
+        failure = None
+        for candidate in allowed:
+            for dependency in candidate.dependencies:
+                if dependency.clauses is None:
+                    failure = failure or ResolutionException(
+                        f"{name} {candidate.version} declares an invalid constraint "
+                        f"'{dependency.constraint}' for '{dependency.name}'."
+                    )
+                    break
+                picked = chosen.get(dependency.name)
+                if picked is not None and not satisfies(picked.version_key, dependency.clauses):
+                    failure = failure or ResolutionException(
+                        f"{name} {candidate.version} requires {dependency.name} "
+                        f"'{dependency.constraint}', but {picked.version} is selected."
+                    )
+                    break
+            else:
+                viable.append(candidate)
+        return viable, (None if viable else failure)
+
+    @staticmethod
+    def _install_order(roots: List[str], chosen: Dict[str, Candidate]) -> List[Candidate]:
+        """
+        Depth-first post-order from the roots, so every package comes after
+        its dependencies. Iterative, so deep chains do not hit the recursion
+        limit.
+        """
+        order: List[Candidate] = []
+        state: Dict[str, int] = {}  # 1 = on the current path, 2 = done
+        for root in dict.fromkeys(roots):
+            if state.get(root) == 2:
+                continue
+            stack = [(root, iter(chosen[root].dependencies))]
+            state[root] = 1
+            while stack:
+                name, pending = stack[-1]
+                dependency = next(pending, None)
+                if dependency is None:
+                    stack.pop()
+                    state[name] = 2
+                    order.append(chosen[name])
+                    continue
+                mark = state.get(dependency.name)
+                if mark == 1:
+                    cycle = [n for n, _ in stack] + [dependency.name]
+                    cycle = cycle[cycle.index(dependency.name):]
+                    raise ResolutionException(f"Dependency cycle: {' -> '.join(cycle)}.")
+                if mark is None:
+                    state[dependency.name] = 1
+                    stack.append((dependency.name, iter(chosen[dependency.name].dependencies)))
+        return order
+
+
+dependency_index = DependencyIndex()
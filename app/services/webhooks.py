@@ -0,0 +1,54 @@
+# app/services/webhooks.py
+"""
+Pure helpers for GitHub webhook deliveries: signature verification and tag
+event parsing. They take the raw body / decoded payload only, so recorded
+deliveries can be replayed offline.
+"""
+import hashlib
+import hmac
+from typing import NamedTuple, Optional
+
+SIGNATURE_HEADER = "X-Hub-Signature-256"
+EVENT_HEADER = "X-GitHub-Event"
+DELIVERY_HEADER = "X-GitHub-Delivery"
+
+TAG_REF_PREFIX = "refs/tags/"
+
+
+class TagEvent(NamedTuple):
+    """A tag pushed to a repository, as announced by a webhook."""
+    repo_url: str
+    tag: str
+
+
+def verify_signature(secret: str, body: bytes, signature: Optional[str]) -> bool:
+    """Checks an `X-Hub-Signature-256: sha256=<hex>` header against the raw body."""
+    if not signature or not signature.startswith("sha256="):
+        return False
+    expected = hmac.new(secret.encode(), body, hashlib.sha256).hexdigest()
+    return hmac.compare_digest(expected, signature[len("sha256="):])
+
+
+def parse_tag_event(event: Optional[str], payload: dict) -> Optional[TagEvent]:
+    """
+    Returns the tag announced by a `create` or `push` delivery, or None for
+    anything else (branches, tag deletions, other event types).
+    """
+    repo_url = (payload.get("repository") or {}).get("html_url")
+    if not repo_url:
+        return None
+
+    if event == "create":
+        if payload.get("ref_type") != "tag" or not payload.get("ref"):
+            return None
+        return TagEvent(repo_url=repo_url, tag=payload["ref"])
+
+    if event == "push":
+        ref = payload.get("ref") or ""
+        if not ref.startswith(TAG_REF_PREFIX) or payload.get("deleted"):
+            return None
+        # For annotated tags 'after' is the tag object, not a commit, so
+        # the tag name is what dur.json gets fetched at
+        return TagEvent(repo_url=repo_url, tag=ref[len(TAG_REF_PREFIX):])
+
+    return None
@@ -0,0 +1,277 @@
+# app/workers/imports.py
+"""
+Background workers that run package imports (GitHub discovery followed by
+`create_with_versions`) and incremental refreshes outside of the request
+cycle, plus the scheduler that periodically queues those refreshes.
+
+Workers normally run inside the API process (see the lifespan handler in
+app/main.py). Set IMPORT_WORKERS_IN_PROCESS=false to run them in a separate
+process instead:
+
+    python -m app.workers.imports
+"""
+import asyncio
+import logging
+import os
+import socket
+from typing import List
+
+import httpx
+from fastapi import HTTPException
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.crud import jobs as crud_jobs
+from app.crud.packages import add_versions, create_with_versions, get_version_keys
+from app.database.database import AsyncSessionLocal
+from app.database.models.jobs import ImportJob, JOB_KIND_REFRESH, JOB_KIND_TAG
+from app.database.models.packages import Package
+from app.schemas.packages import PackageBase
+from app.services.factory import get_vcs_provider
+from app.services.http import create_http_client
+from app.services.index_export import index_snapshot
+from app.services.providers import InvalidRepoException
+
+# Minimum delay between two progress writes for the same job
+PROGRESS_FLUSH_INTERVAL_SECONDS = 1.0
+
+logger = logging.getLogger(__name__)
+
+
+async def _flush_progress(job_id: int, counts: List[int]) -> None:
+    """Periodically persists a running job's progress on its own session."""
+    while True:
+        await asyncio.sleep(PROGRESS_FLUSH_INTERVAL_SECONDS)
+        async with AsyncSessionLocal() as progress_db:
+            await crud_jobs.update_job_progress(progress_db, job_id, counts[0], counts[1])
+
+
+async def _update_snapshot() -> None:
+    """Appends freshly imported packages to the compressed index snapshot."""
+    if index_snapshot is None:
+        return
+    try:
+        await index_snapshot.update()
+    except Exception:
+        logger.exception("Could not update the index snapshot")
+
+
+async def run_import_job(db: AsyncSession, job: ImportJob, client: httpx.AsyncClient) -> ImportJob:
+    """
+    Runs a claimed job: discovers the versions of its repository and either
+    creates the package (import) or appends the versions behind new tags
+    (refresh) or behind a single webhook-announced tag (tag) to the
+    existing one.
+    """
+    # A rollback expires `job`; reading its attributes afterwards would need
+    # a lazy load, which fails under asyncio, so the error paths use these
+    job_id, kind, package_id = job.id, job.kind, job.package_id
+    counts = [0, 0]
+
+    def on_progress(tags_discovered: int, versions_found: int) -> None:
+        counts[0], counts[1] = tags_discovered, versions_found
+
+    async def finish(**kwargs) -> ImportJob:
+        return await crud_jobs.finish_job(
+            db, job, tags_discovered=counts[0], versions_found=counts[1], **kwargs
+        )
+
+    flusher = asyncio.create_task(_flush_progress(job_id, counts))
+    try:
+        if job.kind in (JOB_KIND_REFRESH, JOB_KIND_TAG):
+            package = await db.get(Package, job.package_id)
+            if package is None:
+                return await finish(error="Package no longer exists.")
+
+        if job.kind == JOB_KIND_TAG:
+            # A single tag announced by a webhook: one dur.json fetch
+            tag = job.payload["tag"]
+            provider = get_vcs_provider(repo_url=package.repo_url, client=client)
+            parsed = await provider.get_version_at_tag(tag)
+            counts[0] = 1
+            counts[1] = await add_versions(db, package=package, versions_data=[parsed])
+            logger.info("Imported tag %s of %s: %d new version(s).", tag, package.name, counts[1])
+            job = await finish(package_id=package.id)
+            if counts[1]:
+                await _update_snapshot()
+            return job
+
+        if job.kind == JOB_KIND_REFRESH:
+            # Only tags that are not stored yet are probed for dur.json
+            known_tags, _ = await get_version_keys(db, package.id)
+            provider = get_vcs_provider(repo_url=package.repo_url, client=client)
+            logger.info("Refreshing %s (%d known tags)...", package.repo_url, len(known_tags))
+            new_versions = await provider.discover_and_parse_versions(
+                on_progress=on_progress, skip_tags=known_tags
+            )
+            flusher.cancel()
+
+            counts[1] = await add_versions(db, package=package, versions_data=new_versions)
+            logger.info("Added %d new versions to %s.", counts[1], package.name)
+            job = await finish(package_id=package.id)
+            if counts[1]:
+                await _update_snapshot()
+            return job
+
+        package_in = PackageBase(**job.payload)
+        provider = get_vcs_provider(repo_url=package_in.repo_url, client=client)
+        logger.info("Discovering versions for %s...", package_in.repo_url)
+        valid_versions = await provider.discover_and_parse_versions(on_progress=on_progress)
+        flusher.cancel()
+        counts[1] = len(valid_versions)
+
+        if not valid_versions:
+            return await finish(
+                error="No valid versions with a 'dur.json' file were found in the repository."
+            )
+
+        logger.info("Found %d valid versions to import.", len(valid_versions))
+        new_package = await create_with_versions(
+            db=db,
+            package_in=package_in,
+            versions_data=valid_versions,
+            user_id=job.created_by,
+        )
+        job = await finish(package_id=new_package.id)
+        await _update_snapshot()
+        return job
+
+    except InvalidRepoException as e:
+        await db.rollback()
+        return await finish(error=str(e))
+    except HTTPException as e:
+        await db.rollback()
+        return await finish(error=str(e.detail))
+    except IntegrityError:
+        await db.rollback()
+        if kind == JOB_KIND_TAG:
+            # The version was stored concurrently (e.g. a redelivered webhook)
+            return await finish(package_id=package_id)
+        if kind == JOB_KIND_REFRESH:
+            return await finish(error="A discovered version conflicts with a stored one.")
+        return await finish(error="Package with this name or repo_url already exists.")
+    except Exception:
+        await db.rollback()
+        logger.exception("An unexpected error occurred while importing job %s", job_id)
+        return await finish(error="An unexpected server error occurred.")
+    finally:
+        flusher.cancel()
+
+
+class ImportWorkerPool:
+    """A fixed-size pool of asyncio workers draining the import job table."""
+
+    def __init__(self, client: httpx.AsyncClient, size: int = settings.IMPORT_WORKERS):
+        self.client = client
+        self.size = max(1, size)
+        # Owner of the leases taken by this pool; several pools (API processes
+        # or standalone workers) may drain the same table
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{id(self):x}"
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+
+    async def start(self) -> None:
+        # Jobs whose lease lapsed were interrupted by a crash or restart
+        await self._requeue_expired_jobs()
+
+        self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.size)]
+        self._tasks.append(asyncio.create_task(self._reap_expired_jobs()))
+        if settings.PACKAGE_REFRESH_INTERVAL_SECONDS > 0:
+            self._tasks.append(asyncio.create_task(self._schedule_refreshes()))
+
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+
+    def notify(self) -> None:
+        """Wakes idle workers after a new job was enqueued."""
+        self._wakeup.set()
+
+    async def _worker(self) -> None:
+        while True:
+            self._wakeup.clear()
+            try:
+                async with AsyncSessionLocal() as db:
+                    job = await crud_jobs.claim_next_job(db, self.worker_id)
+                    if job is not None:
+                        renewer = asyncio.create_task(self._renew_lease(job.id))
+                        try:
+                            await run_import_job(db, job, self.client)
+                        finally:
+                            renewer.cancel()
+                        continue
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Import worker error")
+
+            # Idle: wait for a new job, polling for ones enqueued by other processes
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=settings.IMPORT_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _renew_lease(self, job_id: int) -> None:
+        """Keeps the lease of a running job alive until the job finishes."""
+        while True:
+            await asyncio.sleep(settings.IMPORT_JOB_LEASE_SECONDS / 3)
+            try:
+                async with AsyncSessionLocal() as db:
+                    await crud_jobs.renew_job_lease(db, job_id, self.worker_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Could not renew the lease of import job %s", job_id)
+
+    async def _requeue_expired_jobs(self) -> None:
+        async with AsyncSessionLocal() as db:
+            requeued = await crud_jobs.requeue_expired_jobs(db, settings.IMPORT_JOB_LEASE_SECONDS)
+        if requeued:
+            logger.info("Re-queued %d interrupted import job(s).", requeued)
+            self.notify()
+
+    async def _reap_expired_jobs(self) -> None:
+        """Periodically re-queues jobs of workers that died while running them."""
+        while True:
+            await asyncio.sleep(settings.IMPORT_JOB_LEASE_SECONDS)
+            try:
+                await self._requeue_expired_jobs()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Could not re-queue interrupted import jobs")
+
+    async def _schedule_refreshes(self) -> None:
+        """Periodically queues an incremental refresh of every package."""
+        while True:
+            await asyncio.sleep(settings.PACKAGE_REFRESH_INTERVAL_SECONDS)
+            try:
+                async with AsyncSessionLocal() as db:
+                    queued = await crud_jobs.enqueue_refresh_jobs(db)
+                if queued:
+                    logger.info("Queued %d package refresh job(s).", queued)
+                    self.notify()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Refresh scheduler error")
+
+
+async def main() -> None:
+    async with create_http_client() as client:
+        pool = ImportWorkerPool(client)
+        await pool.start()
+        logger.info("Running %d import worker(s).", pool.size)
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await pool.stop()
+
+
+if __name__ == "__main__":
+    # Standalone, nothing else sets up logging; without this the progress lines are dropped
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main())
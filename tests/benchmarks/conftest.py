@@ -0,0 +1,208 @@
+"""
+Opt-in benchmarks, skipped unless RUN_BENCHMARKS=1:
+
+    RUN_BENCHMARKS=1 python -m pytest -q -s tests/benchmarks
+
+Each benchmark prints what it measured, comparing the previous approach
+with the current one. The assertions only check the direction of the
+improvement, with margins wide enough for a noisy machine.
+
+BENCHMARK_SCALE (default 1) multiplies the dataset sizes, e.g. 0.1 for a
+quick run.
+"""
+import asyncio
+import json
+import os
+import sqlite3
+import statistics
+import time
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Callable, Iterable, Optional
+
+import httpx
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from starlette.requests import Request
+
+from app.core.versions import version_key_for
+from tests.conftest import migrate
+
+BENCHMARKS_DIR = Path(__file__).resolve().parent
+BENCHMARK_SCALE = float(os.environ.get("BENCHMARK_SCALE", "1"))
+
+
+def pytest_collection_modifyitems(config, items):
+    if os.environ.get("RUN_BENCHMARKS") == "1":
+        return
+    skip = pytest.mark.skip(reason="benchmark; set RUN_BENCHMARKS=1 to run")
+    for item in items:
+        if BENCHMARKS_DIR in Path(item.fspath).parents:
+            item.add_marker(skip)
+
+
+def scaled(size: int) -> int:
+    return max(1, int(size * BENCHMARK_SCALE))
+
+
+class Timer:
+    elapsed = 0.0
+
+
+@contextmanager
+def timed():
+    """Measures the wall-clock time of the block into the yielded Timer."""
+    timer = Timer()
+    started = time.perf_counter()
+    try:
+        yield timer
+    finally:
+        timer.elapsed = time.perf_counter() - started
+
+
+def report(title: str, rows: list) -> None:
+    """Prints a measurement table: `rows` are (label, value) pairs."""
+    width = max(len(label) for label, _ in rows)
+    print(f"\n{title}")
+    for label, value in rows:
+        print(f"  {label:<{width}}  {value}")
+
+
+class BenchmarkDatabase:
+    """A migrated SQLite database of its own, so bulk data stays out of the shared one."""
+
+    def __init__(self, path: Path):
+        self.path = path
+        migrate(f"sqlite:///{path}")
+        self.engine = create_async_engine(f"sqlite+aiosqlite:///{path}")
+        self.sessionmaker = async_sessionmaker(self.engine, class_=AsyncSession, expire_on_commit=False)
+
+    def connect(self) -> sqlite3.Connection:
+        """A plain sqlite3 connection, the fastest way to seed millions of rows."""
+        connection = sqlite3.connect(self.path)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        return connection
+
+
+WORDS = (
+    "json", "yaml", "http", "async", "crypto", "image", "audio", "parser", "server", "client",
+    "logging", "config", "testing", "compress", "stream", "markdown", "template", "database",
+)
+SEED_BATCH = 50_000
+SEED_EPOCH = datetime(2020, 1, 1)
+
+
+def package_name(index: int) -> str:
+    return f"pkg{index}"
+
+
+def seed_catalogue(
+    database: BenchmarkDatabase,
+    packages: int,
+    versions: int = 1,
+    dependencies: Optional[Callable[[int], dict]] = None,
+) -> None:
+    """
+    Inserts `packages` synthetic packages (named by `package_name`, one
+    second apart, ids from 1) with `versions` versions each (possibly none),
+    pointing `latest_version_id` at the last one. `dependencies(i)` gives the
+    dur.json dependencies of every version of package i.
+    """
+    connection = database.connect()
+    with connection:
+        connection.execute(
+            "INSERT INTO users (id, username, hashed_password, created_at) VALUES (1, 'bench', '!', ?)",
+            (SEED_EPOCH.isoformat(" "),),
+        )
+
+    def package_rows(start: int, stop: int) -> Iterable[tuple]:
+        for i in range(start, stop):
+            description = f"{WORDS[i % len(WORDS)]} {WORDS[i * 7 % len(WORDS)]} toolkit number {i}"
+            created_at = (SEED_EPOCH + timedelta(seconds=i)).isoformat(" ")
+            yield (
+                i + 1, package_name(i), description, f"https://github.com/bench/{package_name(i)}",
+                "MIT", 1, created_at, i + 1, (i + 1) * versions or None,
+            )
+
+    def version_rows(start: int, stop: int) -> Iterable[tuple]:
+        for i in range(start, stop):
+            name = package_name(i)
+            deps = dependencies(i) if dependencies else {}
+            for v in range(versions):
+                version = f"{v // 100}.{v % 100}.0"
+                metadata = {
+                    "name": name, "version": version, "release": 1,
+                    "source": f"https://example.com/{name}-{version}.tar.gz", "dependencies": deps,
+                }
+                yield (
+                    i * versions + v + 1, version, 1, metadata["source"], json.dumps(metadata),
+                    f"v{version}", version_key_for(f"v{version}", version),
+                    (SEED_EPOCH + timedelta(seconds=v)).isoformat(" "), i + 1,
+                )
+
+    with connection:
+        for start in range(0, packages, SEED_BATCH):
+            stop = min(packages, start + SEED_BATCH)
+            connection.executemany(
+                "INSERT INTO packages (id, name, description, repo_url, license, created_by, created_at,"
+                " revision, latest_version_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                package_rows(start, stop),
+            )
+            connection.executemany(
+                "INSERT INTO package_versions (id, version, release, source_url, package_metadata, git_tag,"
+                " version_key, published_at, package_id) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                version_rows(start, stop),
+            )
+    connection.execute("ANALYZE")
+    connection.close()
+
+
+class LoadResult:
+    def __init__(self, latencies: list, elapsed: float):
+        self.latencies = sorted(latencies)
+        self.elapsed = elapsed
+
+    @property
+    def throughput(self) -> float:
+        return len(self.latencies) / self.elapsed
+
+    def percentile(self, fraction: float) -> float:
+        return self.latencies[min(len(self.latencies) - 1, int(len(self.latencies) * fraction))]
+
+    def summary(self) -> str:
+        return (
+            f"{self.throughput:7.0f} req/s  p50 {statistics.median(self.latencies) * 1000:6.2f} ms"
+            f"  p99 {self.percentile(0.99) * 1000:7.2f} ms"
+        )
+
+
+async def run_load(client: httpx.AsyncClient, paths: list, concurrency: int, headers: Optional[dict] = None) -> LoadResult:
+    """Requests every path with `concurrency` clients in parallel, checking each answers 200."""
+    queue = list(reversed(paths))
+    latencies = []
+
+    async def worker() -> None:
+        while queue:
+            path = queue.pop()
+            started = time.perf_counter()
+            response = await client.get(path, headers=headers)
+            latencies.append(time.perf_counter() - started)
+            assert response.status_code == 200, response.text
+
+    with timed() as timer:
+        await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return LoadResult(latencies, timer.elapsed)
+
+
+def get_request(path: str) -> Request:
+    """A bare GET request, for calling a route function directly."""
+    return Request({"type": "http", "method": "GET", "path": path, "query_string": b"", "headers": []})
+
+
+@pytest.fixture
+async def bench_db(tmp_path):
+    database = BenchmarkDatabase(tmp_path / "bench.db")
+    yield database
+    await database.engine.dispose()
@@ -0,0 +1,156 @@
+"""
+user-007: concurrent throughput of the package list and detail handlers on
+an AsyncSession, against the synchronous Session they used before, which
+blocks the event loop for every query. Both apps run the same ORM queries
+with no middleware, so only the database layer differs.
+"""
+import asyncio
+import random
+import time
+from typing import List
+
+import httpx
+import pytest
+from fastapi import Depends, FastAPI, HTTPException, Query
+from sqlalchemy import create_engine, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from app.database.models.packages import Package, PackageVersion
+from app.schemas.package_version import PackageDetailOut
+from app.schemas.packages import PackageOut
+from tests.benchmarks.conftest import package_name, report, run_load, scaled, seed_catalogue
+
+pytestmark = pytest.mark.anyio
+
+PACKAGES = scaled(20_000)
+VERSIONS = 5
+REQUESTS = 2000
+# Past pool_size + max_overflow (15) concurrent requests the synchronous
+# version deadlocks: the loop thread blocks checking out a connection that
+# only a request waiting on that same loop can give back.
+CONCURRENCY = 8
+HIGH_CONCURRENCY = 32
+TICK_SECONDS = 0.001
+
+
+def _list_query(skip: int, limit: int):
+    return select(Package).order_by(Package.created_at.desc()).offset(skip).limit(limit)
+
+
+def _package_query(name: str):
+    return select(Package).where(Package.name == name)
+
+
+def _latest_query(package_id: int):
+    return (
+        select(PackageVersion)
+        .where(PackageVersion.package_id == package_id)
+        .order_by(PackageVersion.published_at.desc())
+        .limit(1)
+    )
+
+
+def _detail(package: Package, latest: PackageVersion) -> dict:
+    return {**PackageOut.model_validate(package).model_dump(), "latest_version": latest}
+
+
+def _sync_app(database_path) -> FastAPI:
+    engine = create_engine(f"sqlite:///{database_path}", connect_args={"check_same_thread": False})
+    session_local = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def get_db():
+        db = session_local()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    sync_app = FastAPI()
+
+    @sync_app.get("/packages/", response_model=List[PackageOut])
+    async def list_packages(db: Session = Depends(get_db), skip: int = Query(0), limit: int = Query(25)):
+        return db.scalars(_list_query(skip, limit)).all()
+
+    @sync_app.get("/packages/{name}", response_model=PackageDetailOut)
+    async def get_package(name: str, db: Session = Depends(get_db)):
+        package = db.scalars(_package_query(name)).first()
+        if not package:
+            raise HTTPException(status_code=404)
+        return _detail(package, db.scalars(_latest_query(package.id)).first())
+
+    sync_app.state.engine = engine
+    return sync_app
+
+
+def _async_app(sessionmaker) -> FastAPI:
+    async def get_db():
+        async with sessionmaker() as db:
+            yield db
+
+    async_app = FastAPI()
+
+    @async_app.get("/packages/", response_model=List[PackageOut])
+    async def list_packages(db=Depends(get_db), skip: int = Query(0), limit: int = Query(25)):
+        return (await db.scalars(_list_query(skip, limit))).all()
+
+    @async_app.get("/packages/{name}", response_model=PackageDetailOut)
+    async def get_package(name: str, db=Depends(get_db)):
+        package = (await db.scalars(_package_query(name))).first()
+        if not package:
+            raise HTTPException(status_code=404)
+        return _detail(package, (await db.scalars(_latest_query(package.id))).first())
+
+    return async_app
+
+
+def _paths() -> list:
+    # Mostly detail lookups, with every fourth request a deep listing page:
+    # a long index walk in SQLite for only a few rows of Python work
+    rng = random.Random(7)
+    return [
+        f"/packages/?skip={PACKAGES - 100}&limit=10" if i % 4 == 0 else f"/packages/{package_name(rng.randrange(PACKAGES))}"
+        for i in range(REQUESTS)
+    ]
+
+
+async def _load(asgi_app: FastAPI, paths: list, concurrency: int = CONCURRENCY) -> tuple:
+    """Runs the load, measuring how late a 1 ms timer fires meanwhile: time the loop was blocked."""
+    lag = 0.0
+    running = True
+
+    async def ticker() -> None:
+        nonlocal lag
+        while running:
+            started = time.perf_counter()
+            await asyncio.sleep(TICK_SECONDS)
+            lag = max(lag, time.perf_counter() - started - TICK_SECONDS)
+
+    transport = httpx.ASGITransport(app=asgi_app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as client:
+        ticking = asyncio.create_task(ticker())
+        try:
+            result = await run_load(client, paths, concurrency)
+        finally:
+            running = False
+            await ticking
+    return result, lag
+
+
+async def test_async_session_against_the_sync_session(bench_db):
+    seed_catalogue(bench_db, PACKAGES, VERSIONS)
+    paths = _paths()
+
+    sync_app = _sync_app(bench_db.path)
+    before, before_lag = await _load(sync_app, paths)
+    sync_app.state.engine.dispose()
+    async_app = _async_app(bench_db.sessionmaker)
+    after, after_lag = await _load(async_app, paths)
+    wide, wide_lag = await _load(async_app, paths, HIGH_CONCURRENCY)
+
+    report(f"List/detail load, {PACKAGES} packages, {REQUESTS} requests", [
+        (f"sync Session, {CONCURRENCY} concurrent", f"{before.summary()}  max loop lag {before_lag * 1000:6.2f} ms"),
+        (f"AsyncSession, {CONCURRENCY} concurrent", f"{after.summary()}  max loop lag {after_lag * 1000:6.2f} ms"),
+        (f"AsyncSession, {HIGH_CONCURRENCY} concurrent", f"{wide.summary()}  max loop lag {wide_lag * 1000:6.2f} ms"),
+    ])
+    # Queries no longer run on the loop thread, so it never stalls for a whole query
+    assert after_lag < before_lag
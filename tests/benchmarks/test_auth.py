@@ -0,0 +1,53 @@
+"""
+user-015: per-request cost of authentication with the token and identity
+caches, against verifying the JWT and loading the user on every call.
+"""
+import statistics
+
+import pytest
+
+from app import dependencies as deps
+from app.auth import identity_cache
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.database.database import AsyncSessionLocal
+from tests.benchmarks.conftest import report, run_load, timed
+
+pytestmark = pytest.mark.anyio
+
+CALLS = 2000
+REQUESTS = 2000
+CONCURRENCY = 16
+
+
+def _set_caches(monkeypatch, enabled: bool) -> None:
+    for name in ("verified_tokens", "user_identities"):
+        cache = TTLCache(settings.AUTH_CACHE_MAX_ENTRIES, settings.AUTH_CACHE_TTL_SECONDS) if enabled else None
+        monkeypatch.setattr(identity_cache, name, cache)
+
+
+async def _dependency_us(token: str) -> float:
+    """Median cost of get_current_user alone, each call on a fresh session as per request."""
+    timings = []
+    for _ in range(CALLS):
+        with timed() as timer:
+            async with AsyncSessionLocal() as db:
+                await deps.get_current_user(token, db)
+        timings.append(timer.elapsed)
+    return statistics.median(timings) * 1_000_000
+
+
+async def test_auth_overhead_with_and_without_the_caches(client, auth_headers, monkeypatch):
+    token = auth_headers["Authorization"].removeprefix("Bearer ")
+    results = {}
+    for label, enabled in (("no cache", False), ("cached", True)):
+        _set_caches(monkeypatch, enabled)
+        dependency_us = await _dependency_us(token)
+        load = await run_load(client, ["/auth/me"] * REQUESTS, CONCURRENCY, headers=auth_headers)
+        results[label] = (dependency_us, load)
+
+    report(f"Authentication, {CALLS} dependency calls, {REQUESTS} GET /auth/me at {CONCURRENCY} concurrent", [
+        (label, f"get_current_user {dependency_us:7.1f} us   /auth/me {load.summary()}")
+        for label, (dependency_us, load) in results.items()
+    ])
+    assert results["cached"][0] < results["no cache"][0] / 2
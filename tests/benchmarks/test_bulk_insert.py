@@ -0,0 +1,69 @@
+"""
+user-017: storing a package with 10k versions through create_with_versions'
+batched INSERT, against one ORM object per version flushed by the unit of
+work as it was before.
+"""
+import pytest
+
+from app.crud.packages import create_with_versions
+from app.database.models.packages import Package, PackageVersion
+from app.schemas.packages import PackageBase
+from app.services.github import PackageMetadata, ParsedVersion
+from tests.benchmarks.conftest import report, scaled, seed_catalogue, timed
+from tests.conftest import dur_json
+
+pytestmark = pytest.mark.anyio
+
+VERSIONS = scaled(10_000)
+USER_ID = 1
+
+
+def _versions(name: str) -> list:
+    return [
+        ParsedVersion(git_tag=f"v{i // 100}.{i % 100}.0", metadata=PackageMetadata(**dur_json(name, f"{i // 100}.{i % 100}.0")))
+        for i in range(VERSIONS)
+    ]
+
+
+def _package_in(name: str) -> PackageBase:
+    return PackageBase(name=name, repo_url=f"https://github.com/bench/{name}")
+
+
+async def _orm_per_version(db, package_in: PackageBase, versions_data: list) -> Package:
+    package_data = package_in.model_dump()
+    package_data["repo_url"] = str(package_data["repo_url"])
+    if package_data.get("homepage"):
+        package_data["homepage"] = str(package_data["homepage"])
+    db_package = Package(**package_data, created_by=USER_ID)
+    db.add(db_package)
+    for version_info in versions_data:
+        db.add(PackageVersion(
+            package=db_package,
+            version=version_info.metadata.version,
+            release=version_info.metadata.release,
+            source_url=str(version_info.metadata.source),
+            git_tag=version_info.git_tag,
+            package_metadata=version_info.metadata.model_dump(mode="json"),
+        ))
+    await db.commit()
+    return db_package
+
+
+async def test_bulk_insert_against_orm_objects(bench_db):
+    seed_catalogue(bench_db, 0)
+    before_versions, after_versions = _versions("ormpath"), _versions("bulkpath")
+
+    async with bench_db.sessionmaker() as db:
+        with timed() as before:
+            await _orm_per_version(db, _package_in("ormpath"), before_versions)
+    async with bench_db.sessionmaker() as db:
+        with timed() as after:
+            await create_with_versions(
+                db, package_in=_package_in("bulkpath"), versions_data=after_versions, user_id=USER_ID
+            )
+
+    report(f"Storing one package with {VERSIONS} versions", [
+        ("ORM object per version", f"{before.elapsed * 1000:8.1f} ms"),
+        ("batched INSERT", f"{after.elapsed * 1000:8.1f} ms"),
+    ])
+    assert after.elapsed < before.elapsed / 2
@@ -0,0 +1,74 @@
+"""
+user-011: the package detail endpoint for packages with 10k versions each,
+against the two queries it used to run (the package, then its versions
+sorted by the unindexed published_at).
+"""
+import random
+import statistics
+
+import orjson
+import pytest
+from sqlalchemy import select
+
+from app.database.models.packages import Package, PackageVersion
+from app.routes.packages import list_packages as list_packages_module
+from app.schemas.package_version import PackageDetailOut
+from tests.benchmarks.conftest import get_request, package_name, report, scaled, seed_catalogue, timed
+
+pytestmark = pytest.mark.anyio
+
+PACKAGES = scaled(20)
+VERSIONS = 10_000
+REQUESTS = 200
+
+
+async def _two_queries(db, name: str) -> bytes:
+    package = (await db.scalars(select(Package).where(Package.name == name))).first()
+    latest_version = (await db.scalars(
+        select(PackageVersion)
+        .where(PackageVersion.package_id == package.id)
+        .order_by(PackageVersion.published_at.desc())
+        .limit(1)
+    )).first()
+    # What the response_model did with the returned entity
+    detail = PackageDetailOut.model_validate({
+        **{field: getattr(package, field) for field in PackageDetailOut.model_fields if field != "latest_version"},
+        "latest_version": latest_version,
+    })
+    return orjson.dumps(detail.model_dump(mode="json"))
+
+
+async def _joined_route(db, name: str) -> bytes:
+    response = await list_packages_module.get_package(name, get_request(f"/api/v1/packages/{name}"), db)
+    return response.body
+
+
+async def _median_ms(db, fetch, names: list) -> float:
+    timings = []
+    for name in names:
+        with timed() as timer:
+            assert await fetch(db, name)
+        timings.append(timer.elapsed)
+    return statistics.median(timings) * 1000
+
+
+async def test_detail_with_many_versions(bench_db, monkeypatch):
+    seed_catalogue(bench_db, PACKAGES, VERSIONS)
+    monkeypatch.setattr(list_packages_module, "response_cache", None)
+    rng = random.Random(11)
+    names = [package_name(rng.randrange(PACKAGES)) for _ in range(REQUESTS)]
+
+    async with bench_db.sessionmaker() as db:
+        # Same answer either way
+        before_body = orjson.loads(await _two_queries(db, names[0]))
+        after_body = orjson.loads(await _joined_route(db, names[0]))
+        assert before_body["latest_version"]["version"] == after_body["latest_version"]["version"]
+
+        before = await _median_ms(db, _two_queries, names)
+        after = await _median_ms(db, _joined_route, names)
+
+    report(f"Package detail, {VERSIONS} versions per package, median of {REQUESTS}", [
+        ("package + ORDER BY published_at", f"{before:7.3f} ms"),
+        ("latest_version_id join", f"{after:7.3f} ms"),
+    ])
+    assert after < before / 2
@@ -0,0 +1,51 @@
+"""
+user-009: time to fetch one listing page at increasing depths, with the
+`after` cursor against the `skip` offset it replaced.
+"""
+import pytest
+
+from app.routes.packages.list_packages import _page_keys
+from tests.benchmarks.conftest import report, scaled, seed_catalogue, timed
+
+pytestmark = pytest.mark.anyio
+
+PACKAGES = scaled(1_000_000)
+PAGE_SIZE = 25
+REPEATS = 20
+
+
+async def _fetch_ms(db, skip: int, cursor) -> float:
+    # Best of a few runs, so one scheduling hiccup does not skew a depth
+    best = float("inf")
+    for _ in range(REPEATS):
+        with timed() as timer:
+            rows = await _page_keys(db, PAGE_SIZE, skip, cursor)
+        assert len(rows) == PAGE_SIZE
+        best = min(best, timer.elapsed)
+    return best * 1000
+
+
+async def test_cursor_pages_cost_the_same_at_any_depth(bench_db):
+    seed_catalogue(bench_db, PACKAGES, versions=0)
+    depths = [depth for depth in (0, 1_000, 10_000, 100_000, 500_000, 990_000) if depth + PAGE_SIZE <= PACKAGES]
+
+    rows = []
+    timings = {}
+    async with bench_db.sessionmaker() as db:
+        for depth in depths:
+            # The cursor of the page ending just before `depth`, as a client walking the listing holds it
+            cursor = None
+            if depth:
+                last = (await _page_keys(db, 1, depth - 1, None))[0]
+                cursor = (last.created_at_raw, last.id)
+            offset_ms = await _fetch_ms(db, depth, None)
+            cursor_ms = await _fetch_ms(db, 0, cursor)
+            timings[depth] = (offset_ms, cursor_ms)
+            rows.append((f"depth {depth:>7}", f"skip {offset_ms:8.3f} ms   after {cursor_ms:6.3f} ms"))
+
+    report(f"Listing page of {PAGE_SIZE}, {PACKAGES} packages", rows)
+    deepest = depths[-1]
+    assert timings[deepest][1] < timings[0][1] * 5
+    # OFFSET cost grows with depth; a reduced BENCHMARK_SCALE does not reach far enough to show it
+    if deepest >= 500_000:
+        assert timings[deepest][0] > timings[deepest][1] * 10
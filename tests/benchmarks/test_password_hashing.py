@@ -0,0 +1,76 @@
+"""
+user-016: sustained password verifications per second, and the latency of
+package reads served meanwhile, with bcrypt on the password hashing process
+pool against the default threadpool it ran on before.
+"""
+import asyncio
+import os
+
+import bcrypt
+import pytest
+
+from app.auth.hashing import PasswordHasher
+from app.core.config import settings
+from app.routes.packages import list_packages as list_packages_module
+from tests.benchmarks.conftest import report, run_load, timed
+
+pytestmark = pytest.mark.anyio
+
+PASSWORD = "correct horse"
+# The production default cost factor, not the tests' cheap one
+BCRYPT_ROUNDS = 12
+LOGIN_CONCURRENCY = 8
+READS = 500
+READ_CONCURRENCY = 8
+
+
+async def _reads_during_logins(client, hasher, hashed: str) -> tuple:
+    """Runs the read load while logins verify passwords in a loop; returns (logins/s, reads)."""
+    logins = 0
+    running = True
+
+    async def login() -> None:
+        nonlocal logins
+        while running:
+            assert await hasher.verify(PASSWORD, hashed)
+            logins += 1
+
+    tasks = [asyncio.create_task(login()) for _ in range(LOGIN_CONCURRENCY)]
+    try:
+        with timed() as timer:
+            reads = await run_load(client, ["/api/v1/packages/"] * READS, READ_CONCURRENCY)
+    finally:
+        running = False
+        await asyncio.gather(*tasks)
+    return logins / timer.elapsed, reads
+
+
+async def test_logins_against_concurrent_reads(client, monkeypatch):
+    monkeypatch.setattr(list_packages_module, "response_cache", None)
+    hashed = bcrypt.hashpw(PASSWORD.encode(), bcrypt.gensalt(BCRYPT_ROUNDS)).decode()
+
+    idle = await run_load(client, ["/api/v1/packages/"] * READS, READ_CONCURRENCY)
+
+    # Never started: every call goes to the default threadpool
+    threadpool = PasswordHasher(workers=settings.PASSWORD_HASH_WORKERS, max_pending=LOGIN_CONCURRENCY)
+    threadpool_logins, threadpool_reads = await _reads_during_logins(client, threadpool, hashed)
+
+    process_pool = PasswordHasher(workers=settings.PASSWORD_HASH_WORKERS, max_pending=LOGIN_CONCURRENCY)
+    process_pool.start()
+    try:
+        # Warm the workers up so spawning them is not measured
+        await asyncio.gather(*(process_pool.verify(PASSWORD, hashed) for _ in range(process_pool.workers)))
+        pool_logins, pool_reads = await _reads_during_logins(client, process_pool, hashed)
+    finally:
+        process_pool.stop()
+
+    report(
+        f"Logins (bcrypt cost {BCRYPT_ROUNDS}, {LOGIN_CONCURRENCY} concurrent) against {READS} package list reads,"
+        f" {os.cpu_count()} CPU(s)",
+        [
+            ("no logins", f"                  reads {idle.summary()}"),
+            ("threadpool", f"{threadpool_logins:5.1f} logins/s   reads {threadpool_reads.summary()}"),
+            (f"process pool ({process_pool.workers})", f"{pool_logins:5.1f} logins/s   reads {pool_reads.summary()}"),
+        ],
+    )
+    assert pool_reads.percentile(0.99) < threadpool_reads.percentile(0.99)
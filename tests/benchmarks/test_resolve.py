@@ -0,0 +1,80 @@
+"""
+user-022: resolving install plans over 100k packages with deep dependency
+chains, server-side from the in-memory DependencyIndex, against what
+clients did before: fetching each package's versions as it is discovered
+and following its dependencies one round trip at a time (measured here as
+one query per package, without any HTTP overhead).
+"""
+import statistics
+
+import pytest
+from sqlalchemy import select
+
+from app.database.models.packages import Package, PackageVersion
+from app.services.resolver import DependencyIndex, parse_requirement_constraint
+from tests.benchmarks.conftest import package_name, report, scaled, seed_catalogue, timed
+
+pytestmark = pytest.mark.anyio
+
+PACKAGES = scaled(100_000)
+# Every package depends on the next one of its chain
+CHAIN_LENGTH = 1_000
+VERSIONS = 2
+ROOTS = 10
+
+
+def _dependencies(i: int) -> dict:
+    if i % CHAIN_LENGTH == CHAIN_LENGTH - 1 or i + 1 >= PACKAGES:
+        return {}
+    return {package_name(i + 1): ">=0.1"}
+
+
+async def _fetch_one_by_one(db, root: str) -> list:
+    """Highest version of each package, fetched as its dependents name it."""
+    plan, queue, seen = [], [root], {root}
+    while queue:
+        name = queue.pop()
+        versions = (await db.scalars(
+            select(PackageVersion)
+            .join(Package, PackageVersion.package_id == Package.id)
+            .where(Package.name == name)
+        )).all()
+        best = max(versions, key=lambda v: v.version_key)
+        plan.append((name, best.version))
+        for dependency in (best.package_metadata or {}).get("dependencies", {}):
+            if dependency not in seen:
+                seen.add(dependency)
+                queue.append(dependency)
+    return plan[::-1]
+
+
+async def test_resolve_deep_chains(bench_db):
+    seed_catalogue(bench_db, PACKAGES, VERSIONS, dependencies=_dependencies)
+    roots = [package_name(i * CHAIN_LENGTH) for i in range(min(ROOTS, max(1, PACKAGES // CHAIN_LENGTH)))]
+    index = DependencyIndex()
+
+    async with bench_db.sessionmaker() as db:
+        with timed() as first_sync:
+            await index.sync(db)
+        with timed() as idle_sync:
+            await index.sync(db)
+
+        before, after = [], []
+        for root in roots:
+            with timed() as timer:
+                expected = await _fetch_one_by_one(db, root)
+            before.append(timer.elapsed)
+            with timed() as timer:
+                await index.sync(db)
+                plan = index.resolve([(root, parse_requirement_constraint(None))])
+            after.append(timer.elapsed)
+            assert [(c.name, c.version) for c in plan] == expected
+
+    depth = len(expected)
+    report(f"Install plan of {depth} chained packages out of {PACKAGES}, median of {len(roots)}", [
+        ("first index sync (once per process)", f"{first_sync.elapsed * 1000:9.1f} ms"),
+        ("sync with nothing changed", f"{idle_sync.elapsed * 1000:9.3f} ms"),
+        ("one fetch per package", f"{statistics.median(before) * 1000:9.1f} ms"),
+        ("sync + in-memory resolve", f"{statistics.median(after) * 1000:9.1f} ms"),
+    ])
+    assert statistics.median(after) < statistics.median(before) / 2
@@ -0,0 +1,58 @@
+"""
+user-010: full-text search latency over a large catalogue, against the
+LIKE scan that is the only alternative without the FTS5 index.
+"""
+import statistics
+
+import pytest
+from sqlalchemy import text
+
+from app.routes.packages.search import SEARCH_QUERY, build_match_expression
+from tests.benchmarks.conftest import report, scaled, seed_catalogue, timed
+
+pytestmark = pytest.mark.anyio
+
+PACKAGES = scaled(500_000)
+PAGE_SIZE = 25
+REPEATS = 20
+QUERIES = (
+    # (label, query): a unique name, short and long prefixes, a two-term match
+    ("exact name", f"pkg{PACKAGES // 3}"),
+    ("name prefix", f"pkg{PACKAGES // 30}"),
+    ("2-char prefix", "js"),
+    ("word", "parser"),
+    ("two words", "json pars"),
+)
+
+# Name matches first, like the bm25 weights; ranking makes LIKE scan every row
+LIKE_QUERY = text(
+    "SELECT id FROM packages WHERE name LIKE :pattern OR description LIKE :pattern"
+    " ORDER BY name LIKE :pattern DESC, id LIMIT :limit"
+)
+
+
+async def _median_ms(db, statement, params) -> float:
+    timings = []
+    for _ in range(REPEATS):
+        with timed() as timer:
+            (await db.execute(statement, params)).all()
+        timings.append(timer.elapsed)
+    return statistics.median(timings) * 1000
+
+
+async def test_fts_search_latency(bench_db):
+    seed_catalogue(bench_db, PACKAGES)
+
+    rows = []
+    fts_timings = []
+    async with bench_db.sessionmaker() as db:
+        for label, q in QUERIES:
+            fts_ms = await _median_ms(db, SEARCH_QUERY, {"match": build_match_expression(q), "limit": PAGE_SIZE, "skip": 0})
+            # The first term only: LIKE cannot combine terms cheaply
+            like_ms = await _median_ms(db, LIKE_QUERY, {"pattern": f"%{q.split()[0]}%", "limit": PAGE_SIZE})
+            fts_timings.append(fts_ms)
+            rows.append((f"{label} ({q!r})", f"FTS5 {fts_ms:7.2f} ms   LIKE scan {like_ms:8.2f} ms"))
+
+    report(f"Search, page of {PAGE_SIZE}, {PACKAGES} packages, median of {REPEATS}", rows)
+    # Selective queries answer in single-digit milliseconds
+    assert fts_timings[0] < 10 and fts_timings[1] < 10
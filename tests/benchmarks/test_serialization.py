@@ -0,0 +1,81 @@
+"""
+user-024: building a package list body per page size, from the query to
+the response bytes. Before: ORM entities validated through
+`List[PackageOut]` and encoded with the stdlib JSON encoder, as FastAPI
+does for a `response_model`. After: the schema's columns as plain rows,
+encoded with orjson.
+"""
+import json
+import random
+import statistics
+from typing import List
+
+import pytest
+from pydantic import TypeAdapter
+from sqlalchemy import select
+
+from app.core.serialization import PACKAGE_FIELDS, dumps, row_dict, schema_columns
+from app.database.models.packages import Package
+from app.schemas.packages import PackageOut
+from tests.benchmarks.conftest import report, scaled, seed_catalogue, timed
+
+pytestmark = pytest.mark.anyio
+
+PACKAGES = scaled(10_000)
+PAGE_SIZES = (10, 25, 100)
+ROUNDS = 300
+
+package_list = TypeAdapter(List[PackageOut])
+
+
+async def _entities_validated(db, ids: list) -> bytes:
+    packages = (await db.scalars(select(Package).where(Package.id.in_(ids)))).all()
+    # What FastAPI's serialize_response and JSONResponse do with the returned list
+    validated = package_list.validate_python(packages, from_attributes=True)
+    content = package_list.dump_python(validated, mode="json")
+    return json.dumps(content, ensure_ascii=False, allow_nan=False, indent=None, separators=(",", ":")).encode()
+
+
+async def _rows_orjson(db, ids: list) -> bytes:
+    result = await db.execute(select(*schema_columns(PackageOut, Package)).where(Package.id.in_(ids)))
+    return dumps([row_dict(row, PACKAGE_FIELDS) for row in result])
+
+
+async def _median_ms(db, builds: tuple, pages: list) -> list:
+    """Median time of each build, alternating them page by page."""
+    timings = [[] for _ in builds]
+    for ids in pages:
+        for build, build_timings in zip(builds, timings):
+            with timed() as timer:
+                assert await build(db, ids)
+            build_timings.append(timer.elapsed)
+    return [statistics.median(t) * 1000 for t in timings]
+
+
+async def test_serialization_per_page_size(bench_db):
+    seed_catalogue(bench_db, PACKAGES)
+    rng = random.Random(24)
+    rows, results = [], []
+
+    async with bench_db.sessionmaker() as db:
+        for size in PAGE_SIZES:
+            # Pages of consecutive ids at random offsets
+            pages = [
+                list(range(first + 1, first + size + 1))
+                for first in (rng.randrange(max(1, PACKAGES - size)) for _ in range(ROUNDS))
+            ]
+            # Same JSON either way
+            by_id = lambda packages: sorted(json.loads(packages), key=lambda p: p["id"])
+            assert by_id(await _entities_validated(db, pages[0])) == by_id(await _rows_orjson(db, pages[0]))
+
+            before, after = await _median_ms(db, (_entities_validated, _rows_orjson), pages)
+            results.append((before, after))
+            rows += [
+                (f"{size:3d} items: ORM + List[PackageOut] + json", f"{before:7.3f} ms"),
+                (f"{size:3d} items: rows + orjson", f"{after:7.3f} ms"),
+            ]
+
+    report(f"Package list body from the query to bytes, median of {ROUNDS}", rows)
+    # Validation grows with the page; at 10 items the query dominates both
+    before, after = results[-1]
+    assert after < before / 1.5
@@ -0,0 +1,106 @@
+"""
+user-004: probing each tag for dur.json with one raw-file request, against
+the recursive Git Trees listing it replaced. Both run one tag at a time.
+"""
+import asyncio
+import hashlib
+import json
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.factory import get_vcs_provider
+from app.services.github import GITHUB_API_BASE_URL, GITHUB_RAW_BASE_URL, PackageMetadata
+from tests.benchmarks.conftest import report, scaled, timed
+from tests.conftest import FakeGitHub, dur_json
+
+pytestmark = pytest.mark.anyio
+
+TAGS = scaled(50)
+# Paths per tag of a large recipe repository
+FILES_PER_TREE = 5000
+LATENCY_SECONDS = 0.005
+
+
+class MeasuredGitHub(FakeGitHub):
+    """FakeGitHub that also serves recursive trees, adds latency and counts body bytes."""
+
+    def __init__(self):
+        super().__init__()
+        self.bytes_received = 0
+        self.requests = 0
+        self._trees = {}
+
+    def tree(self, repo: str) -> bytes:
+        # Encoded once, so building it is not counted as transfer time
+        if repo not in self._trees:
+            self._trees[repo] = json.dumps(self._tree(repo)).encode()
+        return self._trees[repo]
+
+    @staticmethod
+    def _tree(repo: str) -> dict:
+        return {"sha": "0" * 40, "truncated": False, "tree": [
+            {
+                "path": path,
+                "mode": "100644",
+                "type": "blob",
+                "sha": hashlib.sha1(path.encode()).hexdigest(),
+                "size": 1024,
+                "url": f"{GITHUB_API_BASE_URL}/repos/{repo}/git/blobs/{hashlib.sha1(path.encode()).hexdigest()}",
+            }
+            for path in ["dur.json"] + [f"recipes/part{i // 100}/file{i}.patch" for i in range(FILES_PER_TREE - 1)]
+        ]}
+
+    async def async_handler(self, request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(LATENCY_SECONDS)
+        parts = request.url.path.strip("/").split("/")
+        if parts[3:5] == ["git", "trees"]:
+            response = httpx.Response(200, content=self.tree(f"{parts[1]}/{parts[2]}"))
+        else:
+            response = self.handler(request)
+        self.requests += 1
+        self.bytes_received += len(response.content)
+        return response
+
+
+async def _tree_listing(client: httpx.AsyncClient, owner: str, repo: str, tags: list) -> list:
+    """The replaced discovery: a recursive tree per tag, then the raw dur.json."""
+    versions = []
+    for tag in tags:
+        response = await client.get(f"{GITHUB_API_BASE_URL}/repos/{owner}/{repo}/git/trees/{tag}?recursive=1")
+        file_tree = [item["path"] for item in response.json().get("tree", [])]
+        if "dur.json" not in file_tree:
+            continue
+        response = await client.get(f"{GITHUB_RAW_BASE_URL}/{owner}/{repo}/{tag}/dur.json")
+        versions.append(PackageMetadata(**json.loads(response.text)))
+    return versions
+
+
+async def test_raw_probe_against_recursive_tree_listing(monkeypatch):
+    monkeypatch.setattr(settings, "GITHUB_MAX_CONCURRENCY", 1)
+    github = MeasuredGitHub()
+    tags = [f"v{i}.0.0" for i in range(TAGS)]
+    repo_url = github.add_repo("owner/big", {tag: dur_json("big", tag[1:]) for tag in tags})
+
+    github.tree("owner/big")
+    async with httpx.AsyncClient(transport=httpx.MockTransport(github.async_handler)) as client:
+        with timed() as before:
+            assert len(await _tree_listing(client, "owner", "big", tags)) == TAGS
+        before_bytes, before_requests = github.bytes_received, github.requests
+
+        github.bytes_received = github.requests = 0
+        provider = get_vcs_provider(repo_url=repo_url, client=client)
+        with timed() as after:
+            assert len(await provider.discover_and_parse_versions()) == TAGS
+        # Minus the tag listing, which the replaced code fetched as well
+        after_bytes, after_requests = github.bytes_received, github.requests - 1
+
+    report(f"Tag discovery, {TAGS} tags, {FILES_PER_TREE} files per tree, {LATENCY_SECONDS * 1000:.0f} ms latency", [
+        ("recursive tree", f"{before_bytes / TAGS / 1024:8.1f} KiB/tag  {before_requests / TAGS:.0f} req/tag"
+                           f"  {before.elapsed / TAGS * 1000:6.2f} ms/tag"),
+        ("raw probe", f"{after_bytes / TAGS / 1024:8.1f} KiB/tag  {after_requests / TAGS:.0f} req/tag"
+                      f"  {after.elapsed / TAGS * 1000:6.2f} ms/tag"),
+    ])
+    assert after_bytes * 100 < before_bytes
+    assert after.elapsed < before.elapsed / 2
@@ -0,0 +1,179 @@
+"""
+Shared fixtures.
+
+The app runs with its real lifespan (import workers, password hasher)
+against a throwaway SQLite database migrated with Alembic. GitHub is
+replaced by `FakeGitHub`, served through httpx.MockTransport, so imports
+exercise the real discovery code without any network access.
+
+All tests share one database and one app instance, so they create packages
+under unique names instead of relying on an empty catalogue.
+"""
+import asyncio
+import hashlib
+import itertools
+import json
+import os
+import tempfile
+from pathlib import Path
+
+_TMP_DIR = Path(tempfile.mkdtemp(prefix="dur-tests-"))
+
+# Settings are read when the app is imported, so they are set up front
+os.environ.update({
+    "DATABASE_URL": f"sqlite:///{_TMP_DIR / 'dur.db'}",
+    "SECRET_KEY": "test-secret",
+    "GITHUB_ACCESS_TOKEN": "test-token",
+    "GITHUB_CACHE_ENABLED": "false",
+    "INDEX_SNAPSHOT_PATH": str(_TMP_DIR / "index.ndjson.gz"),
+    "CATALOGUE_INDEX_PATH": str(_TMP_DIR / "catalogue.idx"),
+    "BCRYPT_ROUNDS": "4",
+    "IMPORT_POLL_INTERVAL_SECONDS": "0.05",
+    "PACKAGE_REFRESH_INTERVAL_SECONDS": "0",
+})
+
+import httpx
+import pytest
+from alembic import command
+from alembic.config import Config
+
+ROOT_DIR = Path(__file__).resolve().parent.parent
+
+JOB_DONE_STATUSES = ("succeeded", "failed")
+
+
+def migrate(database_url: str) -> None:
+    # No ini file, so Alembic leaves the logging configuration alone
+    config = Config()
+    config.set_main_option("script_location", str(ROOT_DIR / "alembic"))
+    config.set_main_option("sqlalchemy.url", database_url)
+    command.upgrade(config, "head")
+
+
+migrate(os.environ["DATABASE_URL"])
+
+import app.main  # noqa: E402  (after the environment is configured)
+from app.database.database import async_engine  # noqa: E402
+
+
+def _sha(repo: str, tag: str) -> str:
+    return hashlib.sha1(f"{repo}@{tag}".encode()).hexdigest()
+
+
+class FakeGitHub:
+    """
+    Repositories served by the mock transport, keyed by 'owner/name'.
+
+    Each repository maps tag names to the dur.json served at that tag, or to
+    None when the tag has no dur.json. A repository listed in `broken_tags`
+    answers its tag listing with a non-JSON page.
+    """
+
+    def __init__(self):
+        self.repos: dict = {}
+        self.broken_tags: set = set()
+
+    def add_repo(self, repo: str, tags: dict) -> str:
+        self.repos[repo] = dict(tags)
+        return f"https://github.com/{repo}"
+
+    def handler(self, request: httpx.Request) -> httpx.Response:
+        parts = request.url.path.strip("/").split("/")
+        if request.url.host == "api.github.com" and parts[0] == "repos" and parts[3:] == ["tags"]:
+            repo = f"{parts[1]}/{parts[2]}"
+            if repo in self.broken_tags:
+                return httpx.Response(200, text="<html>Unicorn!</html>", headers={"Content-Type": "text/html"})
+            if repo not in self.repos:
+                return httpx.Response(404, json={"message": "Not Found"})
+            return httpx.Response(200, json=[
+                {"name": tag, "commit": {"sha": _sha(repo, tag)}} for tag in self.repos[repo]
+            ])
+
+        if request.url.host == "raw.githubusercontent.com" and len(parts) == 4:
+            repo, ref, file_path = f"{parts[0]}/{parts[1]}", parts[2], parts[3]
+            for tag, dur_json in self.repos.get(repo, {}).items():
+                if ref in (tag, _sha(repo, tag)) and dur_json is not None and file_path == "dur.json":
+                    return httpx.Response(200, text=json.dumps(dur_json))
+            return httpx.Response(404, text="404: Not Found")
+
+        return httpx.Response(404)
+
+
+def dur_json(name: str, version: str, release: int = 1, dependencies: dict | None = None) -> dict:
+    return {
+        "name": name,
+        "version": version,
+        "release": release,
+        "source": f"https://example.com/{name}-{version}.tar.gz",
+        "dependencies": dependencies or {},
+    }
+
+
+_names = itertools.count()
+
+
+@pytest.fixture
+def unique_name():
+    """A package name no other test uses."""
+    return f"pkg{os.getpid()}x{next(_names)}"
+
+
+@pytest.fixture(scope="session")
+def anyio_backend():
+    return "asyncio"
+
+
+@pytest.fixture(scope="session")
+def github():
+    return FakeGitHub()
+
+
+@pytest.fixture(scope="session")
+async def client(github):
+    original = app.main.create_http_client
+    app.main.create_http_client = lambda: httpx.AsyncClient(transport=httpx.MockTransport(github.handler))
+    try:
+        async with app.main.app.router.lifespan_context(app.main.app):
+            transport = httpx.ASGITransport(app=app.main.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://testserver") as c:
+                yield c
+    finally:
+        app.main.create_http_client = original
+        # Pooled aiosqlite connections run on threads that would keep the interpreter alive
+        await async_engine.dispose()
+
+
+@pytest.fixture(scope="session")
+async def auth_headers(client):
+    credentials = {"username": "tester", "password": "correct horse"}
+    await client.post("/auth/register", json=credentials)
+    response = await client.post("/auth/login", json=credentials)
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+async def wait_for_job(client: httpx.AsyncClient, job_id: int, timeout: float = 10.0) -> dict:
+    """Polls an import job until it succeeds or fails."""
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    while True:
+        job = (await client.get(f"/api/v1/packages/jobs/{job_id}")).json()
+        if job["status"] in JOB_DONE_STATUSES:
+            return job
+        if loop.time() > deadline:
+            raise AssertionError(f"Job {job_id} did not finish: {job}")
+        await asyncio.sleep(0.02)
+
+
+@pytest.fixture
+def import_package(client, auth_headers, github):
+    """Serves `tags` from a fake repository, submits it and waits for the import job."""
+    async def _import(name: str, tags: dict, repo: str | None = None) -> dict:
+        repo_url = github.add_repo(repo or f"owner/{name}", tags)
+        response = await client.post(
+            "/api/v1/packages/", json={"name": name, "repo_url": repo_url}, headers=auth_headers
+        )
+        assert response.status_code == 202, response.text
+        return await wait_for_job(client, response.json()["id"])
+
+    return _import
@@ -0,0 +1,20 @@
+import pytest
+
+from app.crud import user as crud_user
+from app.database.database import AsyncSessionLocal
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_deleted_user_stops_authenticating_despite_the_identity_cache(client, unique_name):
+    credentials = {"username": unique_name, "password": "correct horse"}
+    await client.post("/auth/register", json=credentials)
+    token = (await client.post("/auth/login", json=credentials)).json()["access_token"]
+    headers = {"Authorization": f"Bearer {token}"}
+    assert (await client.get("/auth/me", headers=headers)).status_code == 200
+
+    async with AsyncSessionLocal() as db:
+        user = await crud_user.get_user_by_username(db, unique_name)
+        await crud_user.delete_user(db, user)
+
+    assert (await client.get("/auth/me", headers=headers)).status_code == 401
@@ -0,0 +1,28 @@
+import pytest
+
+from app.core.config import settings
+from app.database.database import AsyncSessionLocal
+from app.services.catalogue_index import CatalogueIndex
+from tests.conftest import dur_json
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_snapshot_round_trips_without_the_database_url(client, import_package, monkeypatch, unique_name, tmp_path):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+    path = tmp_path / "catalogue.idx"
+    index = CatalogueIndex(str(path))
+    async with AsyncSessionLocal() as db:
+        await index.sync(db)
+    index.save()
+
+    assert settings.DATABASE_URL.encode() not in path.read_bytes()
+    loaded = CatalogueIndex(str(path))
+    assert loaded.load()
+    assert loaded.synced_revision == index.synced_revision
+    slot = loaded.lookup(unique_name)
+    assert loaded.package(slot) == index.package(index.lookup(unique_name))
+
+    # A snapshot of another database is ignored
+    monkeypatch.setattr(settings, "DATABASE_URL", "sqlite:///elsewhere.db")
+    assert not CatalogueIndex(str(path)).load()
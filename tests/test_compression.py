@@ -0,0 +1,75 @@
+import pytest
+
+from app.core.compression import ENCODERS, negotiate_encoding
+from tests.conftest import dur_json
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.mark.parametrize("header, expected", [
+    (None, None),
+    ("", None),
+    ("identity", None),
+    ("gzip", "gzip"),
+    ("gzip;q=0", None),
+    ("*", next(iter(ENCODERS))),
+    ("*, gzip;q=0", next(iter(ENCODERS)) if len(ENCODERS) > 1 else None),
+    ("deflate, gzip;q=0.5", "gzip"),
+])
+def test_negotiate_encoding(header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+@pytest.fixture
+async def versions_path(import_package, unique_name):
+    """A listing comfortably above COMPRESSION_MIN_SIZE."""
+    tags = {f"v1.{minor}.0": dur_json(unique_name, f"1.{minor}.0") for minor in range(20)}
+    await import_package(unique_name, tags)
+    return f"/api/v1/packages/{unique_name}/versions"
+
+
+async def test_json_is_gzipped_when_accepted(client, versions_path):
+    plain = await client.get(versions_path, headers={"Accept-Encoding": "identity"})
+    gzipped = await client.get(versions_path, headers={"Accept-Encoding": "gzip"})
+
+    assert "Content-Encoding" not in plain.headers
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert int(gzipped.headers["Content-Length"]) < len(plain.content)
+    # httpx decodes the body transparently
+    assert gzipped.json() == plain.json()
+    assert "accept-encoding" in gzipped.headers["Vary"].lower()
+
+
+async def test_refused_coding_is_not_used(client, versions_path):
+    response = await client.get(versions_path, headers={"Accept-Encoding": "gzip;q=0"})
+
+    assert "Content-Encoding" not in response.headers
+
+
+async def test_small_responses_are_sent_as_is(client, import_package, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+
+    response = await client.get(f"/api/v1/packages/{unique_name}", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 200
+    assert "Content-Encoding" not in response.headers
+
+
+async def test_compressed_etag_is_weak_and_still_revalidates(client, import_package, unique_name):
+    for i in range(8):
+        name = f"{unique_name}c{i}"
+        await import_package(name, {"v1.0.0": dur_json(name, "1.0.0")})
+    params = {"limit": 8}
+
+    gzipped = await client.get("/api/v1/packages/", params=params, headers={"Accept-Encoding": "gzip"})
+    etag = gzipped.headers["ETag"]
+    revalidated = await client.get(
+        "/api/v1/packages/", params=params, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert etag.startswith('W/"')
+    assert revalidated.status_code == 304
+    # The route's own validator, not a weakened copy
+    assert revalidated.headers["ETag"] == etag[2:]
+    assert "accept-encoding" in revalidated.headers["Vary"].lower()
@@ -0,0 +1,72 @@
+"""
+Stress test for the "production" SQLite profile: concurrent writers, each on
+its own connection, interleaved with readers, must never fail with
+"database is locked".
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database.database import SQLITE_PROFILES, _apply_sqlite_pragmas
+
+pytestmark = pytest.mark.anyio
+
+WRITERS = 8
+READERS = 4
+TRANSACTIONS_PER_WRITER = 50
+ROWS_PER_TRANSACTION = 5
+
+
+@pytest.fixture
+async def production_engine(tmp_path):
+    engine = create_async_engine(
+        f"sqlite+aiosqlite:///{tmp_path / 'stress.db'}",
+        # No driver-level busy timeout: any waiting comes from the profile's busy_timeout
+        connect_args={"check_same_thread": False, "timeout": 0},
+        pool_size=WRITERS + READERS,
+    )
+    _apply_sqlite_pragmas(engine.sync_engine, SQLITE_PROFILES["production"])
+    async with engine.begin() as conn:
+        await conn.execute(text("CREATE TABLE events (id INTEGER PRIMARY KEY, writer INTEGER, seq INTEGER)"))
+    yield engine
+    await engine.dispose()
+
+
+async def test_concurrent_writers_never_hit_database_is_locked(production_engine):
+    writing = True
+
+    async def writer(writer_id: int) -> None:
+        for seq in range(TRANSACTIONS_PER_WRITER):
+            async with production_engine.begin() as conn:
+                for _ in range(ROWS_PER_TRANSACTION):
+                    await conn.execute(
+                        text("INSERT INTO events (writer, seq) VALUES (:writer, :seq)"),
+                        {"writer": writer_id, "seq": seq},
+                    )
+
+    async def reader() -> int:
+        reads = 0
+        while writing:
+            async with production_engine.connect() as conn:
+                await conn.scalar(text("SELECT COUNT(*) FROM events"))
+            reads += 1
+            await asyncio.sleep(0)
+        return reads
+
+    readers = [asyncio.create_task(reader()) for _ in range(READERS)]
+    try:
+        # An OperationalError ("database is locked") in any writer fails the test here
+        await asyncio.gather(*(writer(i) for i in range(WRITERS)))
+    finally:
+        writing = False
+        reads = await asyncio.gather(*readers)
+
+    async with production_engine.connect() as conn:
+        total = await conn.scalar(text("SELECT COUNT(*) FROM events"))
+        journal_mode = await conn.scalar(text("PRAGMA journal_mode"))
+
+    assert total == WRITERS * TRANSACTIONS_PER_WRITER * ROWS_PER_TRANSACTION
+    assert journal_mode == "wal"
+    assert all(reads)
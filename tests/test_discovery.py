@@ -0,0 +1,67 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services.factory import get_vcs_provider
+from tests.conftest import FakeGitHub, dur_json
+
+pytestmark = pytest.mark.anyio
+
+TAG_COUNT = 32
+LATENCY_SECONDS = 0.02
+CONCURRENCY_LIMITS = (1, 4, 16)
+
+
+class SlowGitHub(FakeGitHub):
+    """FakeGitHub answering every request after a fixed delay, tracking the requests in flight."""
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    async def async_handler(self, request: httpx.Request) -> httpx.Response:
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.latency)
+            return self.handler(request)
+        finally:
+            self.in_flight -= 1
+
+
+async def _discover(limit: int, monkeypatch) -> tuple:
+    monkeypatch.setattr(settings, "GITHUB_MAX_CONCURRENCY", limit)
+    github = SlowGitHub(LATENCY_SECONDS)
+    repo_url = github.add_repo("owner/slow", {
+        f"v{i}.0.0": dur_json("slow", f"{i}.0.0") for i in range(TAG_COUNT)
+    })
+    async with httpx.AsyncClient(transport=httpx.MockTransport(github.async_handler)) as client:
+        provider = get_vcs_provider(repo_url=repo_url, client=client)
+        started = time.perf_counter()
+        versions = await provider.discover_and_parse_versions()
+        elapsed = time.perf_counter() - started
+    assert [v.git_tag for v in versions] == [f"v{i}.0.0" for i in range(TAG_COUNT)]
+    return elapsed, github.peak_in_flight
+
+
+async def test_discovery_time_drops_as_the_concurrency_limit_rises(monkeypatch):
+    # The scheduler's global cap must not be what limits the run
+    monkeypatch.setattr(settings, "GITHUB_MAX_IN_FLIGHT", max(CONCURRENCY_LIMITS))
+
+    timings = {}
+    for limit in CONCURRENCY_LIMITS:
+        elapsed, peak = await _discover(limit, monkeypatch)
+        timings[limit] = elapsed
+        assert peak == limit
+    print(f"{TAG_COUNT} tags at {LATENCY_SECONDS * 1000:.0f} ms per request: "
+          + ", ".join(f"limit {limit}: {elapsed * 1000:.0f} ms" for limit, elapsed in timings.items()))
+
+    # One probe at a time pays the latency once per tag
+    assert timings[1] >= TAG_COUNT * LATENCY_SECONDS
+    for lower, higher in zip(CONCURRENCY_LIMITS, CONCURRENCY_LIMITS[1:]):
+        assert timings[higher] < timings[lower] * 0.75
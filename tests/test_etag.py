@@ -0,0 +1,41 @@
+import pytest
+
+from tests.conftest import dur_json
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_package_detail_answers_304_for_a_matching_etag(client, import_package, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+
+    first = await client.get(f"/api/v1/packages/{unique_name}")
+    etag = first.headers["ETag"]
+    second = await client.get(f"/api/v1/packages/{unique_name}", headers={"If-None-Match": etag})
+
+    assert first.status_code == 200
+    assert second.status_code == 304
+    assert second.content == b""
+    # Sent uncompressed, so the 304 keeps the strong validator
+    assert second.headers["ETag"] == etag
+
+
+async def test_stale_etag_gets_the_full_response(client, import_package, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+
+    response = await client.get(f"/api/v1/packages/{unique_name}", headers={"If-None-Match": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.json()["name"] == unique_name
+
+
+async def test_package_list_answers_304_until_the_page_changes(client, import_package, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+    etag = (await client.get("/api/v1/packages/", params={"limit": 5})).headers["ETag"]
+
+    unchanged = await client.get("/api/v1/packages/", params={"limit": 5}, headers={"If-None-Match": etag})
+    await import_package(unique_name + "b", {"v1.0.0": dur_json(unique_name + "b", "1.0.0")})
+    changed = await client.get("/api/v1/packages/", params={"limit": 5}, headers={"If-None-Match": etag})
+
+    assert unchanged.status_code == 304
+    assert changed.status_code == 200
+    assert changed.json()[0]["name"] == unique_name + "b"
@@ -0,0 +1,51 @@
+import httpx
+import pytest
+
+from app.services import github_cache as github_cache_module
+from app.services.github_cache import GithubResponseCache
+
+pytestmark = pytest.mark.anyio
+
+
+def _response(status_code: int = 200, **headers) -> httpx.Response:
+    return httpx.Response(status_code, content=b"{}", headers=headers)
+
+
+async def test_counters_follow_what_the_cache_served(tmp_path):
+    cache = GithubResponseCache(str(tmp_path / "github.sqlite3"))
+
+    await cache.store("https://raw/sha/dur.json", _response(), immutable=True)
+    await cache.store("https://api/tags", _response(ETag='"v1"'), immutable=False)
+    await cache.store("https://api/uncacheable", _response(), immutable=False)
+    assert (await cache.get("https://raw/sha/dur.json")).immutable
+    assert not (await cache.get("https://api/tags")).immutable
+    assert await cache.get("https://api/uncacheable") is None
+    await cache.revalidated("https://api/tags")
+
+    stats = cache.stats()
+    assert (stats["hits"], stats["revalidated"], stats["misses"]) == (1, 1, 3)
+
+
+async def test_writes_prune_the_oldest_entries_past_the_cap(tmp_path, monkeypatch):
+    monkeypatch.setattr(github_cache_module, "PRUNE_INTERVAL_WRITES", 1)
+    cache = GithubResponseCache(str(tmp_path / "github.sqlite3"), max_entries=3)
+
+    for i in range(5):
+        await cache.store(f"https://raw/{i}", _response(), immutable=True)
+        if i == 2:
+            # A revalidated entry counts as recently stored
+            await cache.revalidated("https://raw/0")
+
+    kept = [i for i in range(5) if await cache.get(f"https://raw/{i}") is not None]
+    assert kept == [0, 3, 4]
+    assert cache.stats()["pruned"] == 2
+
+
+async def test_entries_past_the_max_age_are_dropped_on_open(tmp_path):
+    path = str(tmp_path / "github.sqlite3")
+    await GithubResponseCache(path).store("https://raw/old", _response(), immutable=True)
+
+    cache = GithubResponseCache(path, max_age_seconds=-1)
+
+    assert await cache.get("https://raw/old") is None
+    assert cache.stats()["pruned"] == 1
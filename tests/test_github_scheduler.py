@@ -0,0 +1,76 @@
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.services import github_scheduler as scheduler_module
+from app.services.github_scheduler import GithubRequestScheduler
+
+pytestmark = pytest.mark.anyio
+
+
+@pytest.fixture
+def no_backoff(monkeypatch):
+    """Records backoff delays instead of sleeping through them."""
+    delays = []
+
+    async def sleep(delay):
+        delays.append(delay)
+    monkeypatch.setattr(scheduler_module.asyncio, "sleep", sleep)
+    monkeypatch.setattr(settings, "GITHUB_MAX_RETRIES", 3)
+    return delays
+
+
+def _exhausted(request: httpx.Request, tokens: list, headers: dict | None = None) -> httpx.Response:
+    # A primary rate limit, by default without X-RateLimit-Reset as some proxies strip it
+    tokens.append(request.headers["Authorization"])
+    return httpx.Response(
+        403,
+        headers={"X-RateLimit-Remaining": "0", **(headers or {})},
+        json={"message": "API rate limit exceeded"},
+    )
+
+
+async def _send(scheduler: GithubRequestScheduler, handler) -> httpx.Response:
+    async with httpx.AsyncClient(transport=httpx.MockTransport(handler)) as client:
+        return await scheduler.send(client, client.build_request("GET", "https://api.github.com/repos/o/n/tags"))
+
+
+async def test_exhausted_token_without_reset_backs_off_instead_of_spinning(no_backoff):
+    scheduler = GithubRequestScheduler(["only"])
+    tokens = []
+
+    response = await _send(scheduler, lambda request: _exhausted(request, tokens))
+
+    assert response.status_code == 403
+    assert len(tokens) == settings.GITHUB_MAX_RETRIES + 1
+    assert len(no_backoff) == settings.GITHUB_MAX_RETRIES
+
+
+async def test_exhausted_token_rotates_to_another_one(no_backoff):
+    scheduler = GithubRequestScheduler(["spent", "fresh"])
+    tokens = []
+
+    def handler(request):
+        if request.headers["Authorization"] == "token spent":
+            return _exhausted(request, tokens, {"X-RateLimit-Reset": str(2 ** 40)})
+        tokens.append(request.headers["Authorization"])
+        return httpx.Response(200, json=[])
+
+    # Make "spent" the first pick
+    scheduler.budgets[1].remaining = 1
+    scheduler.budgets[1].reset_at = 2 ** 40
+    response = await _send(scheduler, handler)
+
+    assert response.status_code == 200
+    assert tokens == ["token spent", "token fresh"]
+    assert no_backoff == []
+
+
+async def test_rotations_count_towards_the_retry_limit(no_backoff):
+    scheduler = GithubRequestScheduler([f"token{i}" for i in range(10)])
+    tokens = []
+
+    response = await _send(scheduler, lambda request: _exhausted(request, tokens))
+
+    assert response.status_code == 403
+    assert len(tokens) == settings.GITHUB_MAX_RETRIES + 1
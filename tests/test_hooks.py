@@ -0,0 +1,87 @@
+import hashlib
+import hmac
+import json
+
+import pytest
+from sqlalchemy import select
+
+import app.main
+from app.core.config import settings
+from app.crud import jobs as crud_jobs
+from app.database.database import AsyncSessionLocal
+from app.database.models.packages import Package
+from tests.conftest import dur_json, wait_for_job
+
+pytestmark = pytest.mark.anyio
+
+WEBHOOK_SECRET = "webhook-secret"
+
+
+@pytest.fixture
+def webhook_secret(monkeypatch):
+    monkeypatch.setattr(settings, "GITHUB_WEBHOOK_SECRET", WEBHOOK_SECRET)
+
+
+async def _deliver(client, event: str, payload) -> "httpx.Response":
+    body = json.dumps(payload).encode()
+    signature = "sha256=" + hmac.new(WEBHOOK_SECRET.encode(), body, hashlib.sha256).hexdigest()
+    return await client.post(
+        "/api/v1/hooks/github",
+        content=body,
+        headers={"X-GitHub-Event": event, "X-Hub-Signature-256": signature, "Content-Type": "application/json"},
+    )
+
+
+def _tag_created(repo_url: str, tag: str) -> dict:
+    return {"ref": tag, "ref_type": "tag", "repository": {"html_url": repo_url}}
+
+
+async def test_new_tag_is_imported(client, github, import_package, webhook_secret, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+    github.repos[f"owner/{unique_name}"]["v1.1.0"] = dur_json(unique_name, "1.1.0")
+
+    response = await _deliver(client, "create", _tag_created(f"https://github.com/owner/{unique_name}", "v1.1.0"))
+    job = await wait_for_job(client, response.json()["id"])
+
+    assert response.status_code == 202
+    assert job["kind"] == "tag"
+    assert job["status"] == "succeeded"
+    assert job["versions_found"] == 1
+
+
+async def test_delivery_racing_another_returns_its_job(client, import_package, monkeypatch, webhook_secret, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+
+    async def claim_nothing(db, worker_id):
+        return None
+    # Keep the workers away so the racing job stays pending
+    monkeypatch.setattr(crud_jobs, "claim_next_job", claim_nothing)
+    async with AsyncSessionLocal() as db:
+        package = await db.scalar(select(Package).where(Package.name == unique_name))
+        racing = await crud_jobs.enqueue_tag_job(db, package, "v1.1.0")
+
+    get_active_job_for_repo = crud_jobs.get_active_job_for_repo
+    calls = []
+
+    async def not_seen_yet(db, repo_url):
+        # The first lookup misses the racing job, so the INSERT hits the unique index
+        calls.append(repo_url)
+        return None if len(calls) == 1 else await get_active_job_for_repo(db, repo_url)
+    monkeypatch.setattr(crud_jobs, "get_active_job_for_repo", not_seen_yet)
+
+    response = await _deliver(client, "create", _tag_created(f"https://github.com/owner/{unique_name}", "v1.1.0"))
+
+    assert response.status_code == 202, response.text
+    assert response.json()["id"] == racing.id
+
+    monkeypatch.undo()
+    app.main.app.state.import_workers.notify()
+    await wait_for_job(client, racing.id)
+
+
+@pytest.mark.parametrize("payload", [[1], "tag", 1, None])
+async def test_payload_that_is_not_an_object_is_rejected(client, webhook_secret, payload):
+    response = await _deliver(client, "create", payload)
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid JSON payload."
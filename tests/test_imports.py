@@ -0,0 +1,200 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.exc import IntegrityError
+
+import app.main
+from app.core.config import settings
+from app.crud import jobs as crud_jobs
+from app.database.database import AsyncSessionLocal
+from app.database.models.jobs import ImportJob
+from app.database.models.packages import Package
+from app.schemas.packages import PackageBase
+from app.workers import imports as imports_worker
+from tests.conftest import dur_json, wait_for_job
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_import_stores_the_versions_behind_dur_json(client, import_package, unique_name):
+    job = await import_package(unique_name, {
+        "v1.0.0": dur_json(unique_name, "1.0.0"),
+        "v1.1.0": dur_json(unique_name, "1.1.0"),
+        "docs": None,
+    })
+
+    assert job["status"] == "succeeded", job
+    assert job["tags_discovered"] == 3
+    assert job["versions_found"] == 2
+    assert job["package_id"] is not None
+
+    detail = (await client.get(f"/api/v1/packages/{unique_name}")).json()
+    assert detail["id"] == job["package_id"]
+    assert detail["latest_version"]["version"] == "1.1.0"
+
+
+async def test_import_fails_for_a_missing_repository(client, auth_headers, unique_name):
+    response = await client.post(
+        "/api/v1/packages/",
+        json={"name": unique_name, "repo_url": f"https://github.com/nobody/{unique_name}"},
+        headers=auth_headers,
+    )
+    job = await wait_for_job(client, response.json()["id"])
+
+    assert job["status"] == "failed"
+    assert job["error"] == "Repository not found or access denied."
+
+
+async def test_import_fails_without_any_dur_json(import_package, unique_name):
+    job = await import_package(unique_name, {"v1.0.0": None, "v2.0.0": None})
+
+    assert job["status"] == "failed"
+    assert job["error"].startswith("No valid versions")
+
+
+async def test_unexpected_error_marks_the_job_failed(client, auth_headers, github, unique_name):
+    # A non-JSON tag listing raises outside the handled exception types
+    repo_url = github.add_repo(f"owner/{unique_name}", {})
+    github.broken_tags.add(f"owner/{unique_name}")
+    response = await client.post(
+        "/api/v1/packages/", json={"name": unique_name, "repo_url": repo_url}, headers=auth_headers
+    )
+    job = await wait_for_job(client, response.json()["id"])
+
+    assert job["status"] == "failed"
+    assert job["error"] == "An unexpected server error occurred."
+    assert job["finished_at"] is not None
+
+
+async def test_submitting_an_existing_name_is_rejected(client, auth_headers, import_package, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+
+    response = await client.post(
+        "/api/v1/packages/",
+        json={"name": unique_name, "repo_url": f"https://github.com/other/{unique_name}"},
+        headers=auth_headers,
+    )
+
+    assert response.status_code == 409
+
+
+async def test_name_conflict_found_by_the_worker_fails_the_job(client, auth_headers, github, import_package, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+
+    # Queued behind the route's check, as when two submissions race
+    repo_url = github.add_repo(f"other/{unique_name}", {"v1.0.0": dur_json(unique_name, "1.0.0")})
+    user_id = (await client.get("/auth/me", headers=auth_headers)).json()["id"]
+    async with AsyncSessionLocal() as db:
+        job = await crud_jobs.create_import_job(
+            db, PackageBase(name=unique_name, repo_url=repo_url), user_id=user_id
+        )
+    app.main.app.state.import_workers.notify()
+    job = await wait_for_job(client, job.id)
+
+    assert job["status"] == "failed"
+    assert job["error"] == "Package with this name or repo_url already exists."
+
+
+async def _package(name: str) -> Package:
+    async with AsyncSessionLocal() as db:
+        return await db.scalar(select(Package).where(Package.name == name))
+
+
+def _conflicting_add_versions(monkeypatch):
+    """Makes storing versions fail as it does when another job stored them first."""
+    async def add_versions(*args, **kwargs):
+        raise IntegrityError("INSERT INTO package_versions", {}, Exception("UNIQUE constraint failed"))
+    monkeypatch.setattr(imports_worker, "add_versions", add_versions)
+
+
+async def test_refresh_conflict_marks_the_job_failed(client, github, import_package, monkeypatch, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+    github.repos[f"owner/{unique_name}"]["v1.1.0"] = dur_json(unique_name, "1.1.0")
+    _conflicting_add_versions(monkeypatch)
+
+    package = await _package(unique_name)
+    async with AsyncSessionLocal() as db:
+        job = await crud_jobs.create_refresh_job(db, package, package.created_by)
+    app.main.app.state.import_workers.notify()
+    job = await wait_for_job(client, job.id)
+
+    assert job["status"] == "failed"
+    assert job["error"] == "A discovered version conflicts with a stored one."
+
+
+async def test_refresh_scheduling_skips_a_repository_queued_concurrently(client, import_package, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+    package = await _package(unique_name)
+
+    async with AsyncSessionLocal() as db:
+        execute = db.execute
+
+        async def execute_racing_a_submission(statement, *args, **kwargs):
+            # Between the SELECT of idle packages and the INSERT of their jobs
+            if args:
+                async with AsyncSessionLocal() as other:
+                    await crud_jobs.create_refresh_job(other, package, package.created_by)
+            return await execute(statement, *args, **kwargs)
+
+        db.execute = execute_racing_a_submission
+        queued = await crud_jobs.enqueue_refresh_jobs(db)
+        db.execute = execute
+        jobs = (await db.scalars(
+            select(ImportJob).where(ImportJob.kind == "refresh", ImportJob.status.in_(("pending", "running")))
+        )).all()
+
+    assert queued == len(jobs) - 1
+    assert [job.package_id for job in jobs].count(package.id) == 1
+    # Let the queued refreshes finish so they cannot touch other tests' data
+    app.main.app.state.import_workers.notify()
+    for job in jobs:
+        await wait_for_job(client, job.id)
+
+
+async def test_tag_already_stored_concurrently_counts_as_done(client, github, import_package, monkeypatch, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+    github.repos[f"owner/{unique_name}"]["v1.1.0"] = dur_json(unique_name, "1.1.0")
+    _conflicting_add_versions(monkeypatch)
+
+    package = await _package(unique_name)
+    async with AsyncSessionLocal() as db:
+        job = await crud_jobs.enqueue_tag_job(db, package, "v1.1.0")
+    app.main.app.state.import_workers.notify()
+    job = await wait_for_job(client, job.id)
+
+    assert job["kind"] == "tag"
+    assert job["status"] == "succeeded"
+    assert job["package_id"] == package.id
+
+
+async def test_only_jobs_with_an_expired_lease_are_requeued(client, import_package, monkeypatch, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+    package = await _package(unique_name)
+
+    claim_next_job = crud_jobs.claim_next_job
+
+    async def claim_nothing(db, worker_id):
+        return None
+    # Keep this process's workers away; the job is leased to a worker elsewhere
+    monkeypatch.setattr(crud_jobs, "claim_next_job", claim_nothing)
+    async with AsyncSessionLocal() as db:
+        job = await crud_jobs.create_refresh_job(db, package, package.created_by)
+        assert (await claim_next_job(db, "elsewhere")).id == job.id
+
+        # A sibling process starting up leaves a live lease alone
+        assert await crud_jobs.requeue_expired_jobs(db, settings.IMPORT_JOB_LEASE_SECONDS) == 0
+        assert await crud_jobs.renew_job_lease(db, job.id, "elsewhere")
+        assert not await crud_jobs.renew_job_lease(db, job.id, "someone-else")
+
+        stale = datetime.now(timezone.utc) - timedelta(seconds=2 * settings.IMPORT_JOB_LEASE_SECONDS)
+        await db.execute(update(ImportJob).where(ImportJob.id == job.id).values(heartbeat_at=stale))
+        await db.commit()
+        assert await crud_jobs.requeue_expired_jobs(db, settings.IMPORT_JOB_LEASE_SECONDS) == 1
+        assert not await crud_jobs.renew_job_lease(db, job.id, "elsewhere")
+
+    monkeypatch.undo()
+    app.main.app.state.import_workers.notify()
+    assert (await wait_for_job(client, job.id))["status"] == "succeeded"
+    async with AsyncSessionLocal() as db:
+        assert (await crud_jobs.get_job(db, job.id)).attempts == 2
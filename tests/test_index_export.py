@@ -0,0 +1,67 @@
+import asyncio
+import gzip
+import json
+
+import pytest
+
+from app.services.index_export import IndexSnapshot
+from tests.conftest import dur_json
+
+pytestmark = pytest.mark.anyio
+
+
+def _records(path) -> list:
+    with gzip.open(path) as f:
+        return [json.loads(line) for line in f]
+
+
+async def test_snapshot_updates_from_separate_instances_do_not_interleave(client, import_package, unique_name, tmp_path):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+    path = tmp_path / "index.ndjson.gz"
+    # Separate instances have separate asyncio locks, like separate processes
+    snapshots = [IndexSnapshot(str(path)) for _ in range(4)]
+
+    states = await asyncio.gather(*(snapshot.update() for snapshot in snapshots))
+
+    records = _records(path)
+    ids = [record["id"] for record in records]
+    assert len(ids) == len(set(ids))
+    assert unique_name in {record["name"] for record in records}
+    # One instance built the snapshot; the others found it up to date
+    assert sorted(state["appends"] for state in states) == [0, 0, 0, 0]
+    assert len({state["revision"] for state in states}) == 1
+
+    await import_package(unique_name + "b", {"v1.0.0": dur_json(unique_name + "b", "1.0.0")})
+    states = await asyncio.gather(*(snapshot.update() for snapshot in snapshots))
+
+    records = _records(path)
+    assert [record["name"] for record in records].count(unique_name + "b") == 1
+    assert sorted(state["appends"] for state in states) == [1, 1, 1, 1]
+
+
+async def test_an_open_snapshot_stays_complete_while_updates_replace_it(client, import_package, unique_name, tmp_path):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+    snapshot = IndexSnapshot(str(tmp_path / "index.ndjson.gz"))
+    await snapshot.update()
+    f, size = snapshot.open()
+
+    await import_package(unique_name + "b", {"v1.0.0": dur_json(unique_name + "b", "1.0.0")})
+    assert (await snapshot.update())["appends"] == 1
+
+    with f:
+        served = f.read()
+    assert len(served) == size
+    names = {json.loads(line)["name"] for line in gzip.decompress(served).splitlines()}
+    assert unique_name in names and unique_name + "b" not in names
+    assert unique_name + "b" in {record["name"] for record in _records(snapshot.path)}
+
+
+async def test_snapshot_download_matches_its_content_length(client, import_package, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+
+    response = await client.get("/api/v1/index/snapshot")
+
+    assert response.status_code == 200
+    assert int(response.headers["Content-Length"]) == len(response.content)
+    assert int(response.headers["X-Catalogue-Revision"]) > 0
+    assert gzip.decompress(response.content)
@@ -0,0 +1,15 @@
+import pytest
+
+from app.core.config import settings
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_metrics_are_hidden_unless_enabled(client, monkeypatch):
+    assert (await client.get("/api/v1/metrics/")).status_code == 404
+
+    monkeypatch.setattr(settings, "METRICS_ENABLED", True)
+    response = await client.get("/api/v1/metrics/")
+
+    assert response.status_code == 200
+    assert "github_scheduler" in response.json()
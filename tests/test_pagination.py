@@ -0,0 +1,65 @@
+import pytest
+
+from app.core.pagination import InvalidCursorException, decode_cursor, encode_cursor
+from tests.conftest import dur_json
+
+pytestmark = pytest.mark.anyio
+
+
+async def _walk(client, path: str, limit: int) -> list:
+    """Follows X-Next-Cursor from the first page to the last."""
+    items, params = [], {"limit": limit}
+    while True:
+        response = await client.get(path, params=params)
+        assert response.status_code == 200, response.text
+        items.extend(response.json())
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            return items
+        params = {"limit": limit, "after": cursor}
+
+
+async def test_cursor_pages_cover_the_listing_once(client, import_package, unique_name):
+    names = [f"{unique_name}p{i}" for i in range(5)]
+    for name in names:
+        await import_package(name, {"v1.0.0": dur_json(name, "1.0.0")})
+
+    walked = await _walk(client, "/api/v1/packages/", limit=2)
+    listed = (await client.get("/api/v1/packages/", params={"limit": 100})).json()
+
+    assert [p["id"] for p in walked] == [p["id"] for p in listed]
+    # Newest first
+    assert [p["name"] for p in walked if p["name"] in names] == names[::-1]
+
+
+async def test_version_cursor_pages_are_in_semver_order(client, import_package, unique_name):
+    tags = {f"v1.{minor}.0": dur_json(unique_name, f"1.{minor}.0") for minor in (2, 10, 1, 9, 0)}
+    await import_package(unique_name, tags)
+
+    walked = await _walk(client, f"/api/v1/packages/{unique_name}/versions", limit=2)
+
+    assert [v["version"] for v in walked] == ["1.10.0", "1.9.0", "1.2.0", "1.1.0", "1.0.0"]
+
+
+@pytest.mark.parametrize("cursor", [
+    "not-a-cursor!",
+    encode_cursor("2024-01-01 00:00:00"),
+    encode_cursor(1, 2),
+    encode_cursor("2024-01-01 00:00:00", "7"),
+    encode_cursor("2024-01-01 00:00:00", True),
+])
+async def test_malformed_cursor_is_a_400(client, cursor):
+    response = await client.get("/api/v1/packages/", params={"after": cursor})
+
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Malformed pagination cursor."
+
+
+def test_decode_cursor_round_trips_and_checks_types():
+    token = encode_cursor("2024-01-01 00:00:00", 42)
+
+    assert decode_cursor(token, str, int) == ("2024-01-01 00:00:00", 42)
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(token, int, int)
+    with pytest.raises(InvalidCursorException):
+        decode_cursor(token, str, int, int)
@@ -0,0 +1,41 @@
+import pytest
+from sqlalchemy import select
+
+from app.crud import jobs as crud_jobs
+from app.database.database import AsyncSessionLocal
+from app.database.models.packages import Package
+import app.main
+from tests.conftest import dur_json, wait_for_job
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_refresh_returns_the_job_queued_concurrently(client, auth_headers, import_package, monkeypatch, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+
+    async def claim_nothing(db, worker_id):
+        return None
+    # Keep the workers away so the racing job stays pending
+    monkeypatch.setattr(crud_jobs, "claim_next_job", claim_nothing)
+    async with AsyncSessionLocal() as db:
+        package = await db.scalar(select(Package).where(Package.name == unique_name))
+        racing = await crud_jobs.create_refresh_job(db, package, package.created_by)
+
+    get_active_job_for_repo = crud_jobs.get_active_job_for_repo
+    calls = []
+
+    async def not_seen_yet(db, repo_url):
+        # The first lookup misses the racing job, so the INSERT hits the unique index
+        calls.append(repo_url)
+        return None if len(calls) == 1 else await get_active_job_for_repo(db, repo_url)
+    monkeypatch.setattr(crud_jobs, "get_active_job_for_repo", not_seen_yet)
+
+    response = await client.post(f"/api/v1/packages/{unique_name}/refresh", headers=auth_headers)
+
+    assert response.status_code == 202, response.text
+    assert response.json()["id"] == racing.id
+    assert len(calls) == 2
+
+    monkeypatch.undo()
+    app.main.app.state.import_workers.notify()
+    await wait_for_job(client, racing.id)
@@ -0,0 +1,49 @@
+import pytest
+
+from app.services import resolver
+from tests.conftest import dur_json
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_plan_lists_dependencies_first_at_their_highest_allowed_version(client, import_package, unique_name):
+    lib, mid, top = f"{unique_name}lib", f"{unique_name}mid", f"{unique_name}top"
+    await import_package(lib, {
+        "v1.0.0": dur_json(lib, "1.0.0"),
+        "v1.5.0": dur_json(lib, "1.5.0"),
+        "v2.0.0": dur_json(lib, "2.0.0"),
+    })
+    await import_package(mid, {"v1.0.0": dur_json(mid, "1.0.0", dependencies={lib: ">=1.0,<2"})})
+    await import_package(top, {"v0.1.0": dur_json(top, "0.1.0", dependencies={mid: "", lib: ">=1.2"})})
+
+    response = await client.post("/api/v1/resolve/", json={"requirements": [{"name": top}]})
+
+    assert response.status_code == 200, response.text
+    plan = [(p["name"], p["version"]) for p in response.json()["install"]]
+    assert plan == [(lib, "1.5.0"), (mid, "1.0.0"), (top, "0.1.0")]
+
+
+async def test_conflicting_requirements_are_a_409(client, import_package, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+
+    response = await client.post(
+        "/api/v1/resolve/", json={"requirements": [{"name": unique_name, "constraint": ">=2"}]}
+    )
+
+    assert response.status_code == 409
+
+
+async def test_unknown_package_is_a_404(client, unique_name):
+    response = await client.post("/api/v1/resolve/", json={"requirements": [{"name": unique_name}]})
+
+    assert response.status_code == 404
+
+
+async def test_resolution_over_its_time_budget_is_a_409(client, import_package, monkeypatch, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+    monkeypatch.setattr(resolver, "RESOLVE_TIME_BUDGET_SECONDS", -1)
+
+    response = await client.post("/api/v1/resolve/", json={"requirements": [{"name": unique_name}]})
+
+    assert response.status_code == 409
+    assert "gave up" in response.json()["detail"]
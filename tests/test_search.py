@@ -0,0 +1,20 @@
+import pytest
+
+from tests.conftest import dur_json
+
+pytestmark = pytest.mark.anyio
+
+
+async def test_search_is_not_shadowed_by_the_package_detail_route(client, import_package, unique_name):
+    await import_package(unique_name, {"v1.0.0": dur_json(unique_name, "1.0.0")})
+
+    response = await client.get("/api/v1/packages/search", params={"q": unique_name})
+
+    assert response.status_code == 200, response.text
+    assert [p["name"] for p in response.json()] == [unique_name]
+
+
+async def test_search_without_terms_is_a_400(client):
+    response = await client.get("/api/v1/packages/search", params={"q": "  "})
+
+    assert response.status_code == 400
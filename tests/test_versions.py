@@ -0,0 +1,44 @@
+import pytest
+
+from app.core.versions import parse_constraint, satisfies, version_key, version_key_for
+from tests.conftest import dur_json
+
+
+def test_keys_order_numerically_and_releases_after_prereleases():
+    tags = ["v1.10.0", "1.2", "v1.2.0-rc1", "1.9.3", "v2.0.0", "v2.0.0-rc1"]
+
+    assert sorted(tags, key=version_key) == ["v1.2.0-rc1", "1.2", "1.9.3", "v1.10.0", "v2.0.0-rc1", "v2.0.0"]
+
+
+def test_constraints_compare_keys():
+    clauses = parse_constraint(">=1.2,<2")
+
+    assert satisfies(version_key("1.2.0"), clauses)
+    assert satisfies(version_key("2.0.0-rc1"), clauses)
+    assert not satisfies(version_key("2.0.0"), clauses)
+    assert not satisfies(version_key("1.1.9"), clauses)
+
+
+@pytest.mark.parametrize("spec", ["<2.0", "<=1.0", "!=1.0", ">=0.0"])
+def test_unparseable_versions_never_meet_a_range(spec):
+    key = version_key_for("nightly", "latest")
+
+    assert key == ""
+    assert not satisfies(key, parse_constraint(spec))
+    assert satisfies(key, [])
+
+
+@pytest.mark.anyio
+async def test_constraint_filter_leaves_out_unparseable_versions(client, import_package, unique_name):
+    await import_package(unique_name, {
+        "v1.0.0": dur_json(unique_name, "1.0.0"),
+        "nightly": dur_json(unique_name, "nightly"),
+    })
+    path = f"/api/v1/packages/{unique_name}/versions"
+
+    everything = (await client.get(path)).json()
+    below_two = (await client.get(path, params={"constraint": "<2.0"})).json()
+
+    # Unparseable versions still sort last in the full listing
+    assert [v["version"] for v in everything] == ["1.0.0", "nightly"]
+    assert [v["version"] for v in below_two] == ["1.0.0"]